@@ -90,6 +90,7 @@ resource "aws_iam_role_policy" "actions_runner_policy" {
           "dynamodb:PutItem",
           "dynamodb:UpdateItem",
           "dynamodb:Query",
+          "dynamodb:BatchWriteItem",
         ]
         Resource = var.incidents_table_arn
       },
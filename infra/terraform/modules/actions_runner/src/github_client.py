@@ -4,17 +4,76 @@ Supports two auth modes (auto-selected by available config):
   A) GitHub App  – GITHUB_APP_ID + GITHUB_APP_INSTALLATION_ID + PEM key
   B) PAT         – GITHUB_TOKEN
 """
+import asyncio
 import base64
 import json
 import time
 import hashlib
 import hmac
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Any, Optional
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError, URLError
+from urllib.parse import quote as _q
+
+import urllib3
+from urllib3.util.retry import Retry
+
+try:
+    from pybase64 import b64encode as _b64encode  # SIMD-accelerated if bundled
+except ImportError:
+    from base64 import b64encode as _b64encode
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
 
 API = "https://api.github.com"
 
+# One keep-alive pool per container: every call to api.github.com reuses the
+# TLS session instead of paying a fresh handshake per request.
+_POOL = urllib3.PoolManager(maxsize=4, retries=Retry(total=3, backoff_factor=0.2))
+
+# Files larger than this go through the Git Data API (blob/tree/commit/ref)
+# instead of a single contents PUT.
+LARGE_FILE_THRESHOLD = 1_000_000
+
+# Installation tokens are valid for ~1 hour; refresh slightly before expiry.
+INSTALLATION_TOKEN_TTL = 3600
+TOKEN_REFRESH_MARGIN = 60
+
+# App JWTs are valid for 9 minutes (exp = now + 540); reuse for ~7.
+JWT_TTL = 540
+JWT_REFRESH_MARGIN = 120
+
+# base64url('{"alg":"RS256","typ":"JWT"}') – constant for every App JWT
+_JWT_HEADER_B64 = "eyJhbGciOiJSUzI1NiIsInR5cCI6IkpXVCJ9"
+
+# (app_id, _pem_id(pem)) -> (jwt, exp epoch seconds)
+_JWT_CACHE: dict[tuple[str, bytes], tuple[str, int]] = {}
+_JWT_LOCK = threading.Lock()
+
+# _pem_id(pem) -> parsed cryptography private key
+_PEM_KEY_CACHE: dict[bytes, Any] = {}
+_PEM_KEY_LOCK = threading.Lock()
+
+# (app_id, installation_id, _pem_id(pem)) -> (token, expires_at epoch seconds)
+_TOKEN_CACHE: dict[tuple[str, str, bytes], tuple[str, float]] = {}
+_TOKEN_LOCK = threading.Lock()
+
+# (owner, repo) -> (default_branch, etag); survives warm invocations and is
+# revalidated with If-None-Match the first time each client asks
+_BRANCH_ETAG_CACHE: dict[tuple[str, str], tuple[str, str]] = {}
+_BRANCH_ETAG_LOCK = threading.Lock()
+
 
 # ── Auth helpers ─────────────────────────────────────────────────
 
@@ -23,12 +82,30 @@ def _base64url(data: bytes) -> str:
 
 
 def _build_jwt(app_id: str, pem: str) -> str:
-    """Build a JWT for GitHub App authentication (RS256)."""
+    """Build a JWT for GitHub App authentication (RS256).
+
+    The signed assertion is cached per (app_id, key) and reused until shortly
+    before it expires, so warm paths skip the RSA signature; a rotated
+    private key gets a freshly signed JWT.
+    """
+    now = int(time.time())
+    key = (app_id, _pem_id(pem))
+    with _JWT_LOCK:
+        cached = _JWT_CACHE.get(key)
+        if cached and now < cached[1] - JWT_REFRESH_MARGIN:
+            return cached[0]
+
+    exp = now + JWT_TTL
+    token = _sign_jwt({"iat": now - 60, "exp": exp, "iss": app_id}, pem)
+    with _JWT_LOCK:
+        _JWT_CACHE[key] = (token, exp)
+    return token
+
+
+def _sign_jwt(claims: dict, pem: str) -> str:
     try:
         import jwt as pyjwt  # PyJWT if bundled
-        now = int(time.time())
-        payload = {"iat": now - 60, "exp": now + 540, "iss": app_id}
-        return pyjwt.encode(payload, pem, algorithm="RS256")
+        return pyjwt.encode(claims, pem, algorithm="RS256")
     except ImportError:
         pass
 
@@ -39,23 +116,73 @@ def _build_jwt(app_id: str, pem: str) -> str:
     except ImportError:
         raise RuntimeError("Cannot build GitHub App JWT: neither PyJWT nor cryptography available")
 
-    now = int(time.time())
-    header = _base64url(json.dumps({"alg": "RS256", "typ": "JWT"}).encode())
-    claims = _base64url(json.dumps({"iat": now - 60, "exp": now + 540, "iss": app_id}).encode())
-    signing_input = f"{header}.{claims}".encode()
+    payload = _base64url(_dumps(claims))
+    signing_input = f"{_JWT_HEADER_B64}.{payload}".encode()
 
-    private_key = serialization.load_pem_private_key(pem.encode(), password=None)
+    private_key = _load_private_key(pem, serialization)
     sig = private_key.sign(signing_input, padding.PKCS1v15(), hashes.SHA256())
-    return f"{header}.{claims}.{_base64url(sig)}"
+    return f"{_JWT_HEADER_B64}.{payload}.{_base64url(sig)}"
+
+
+def _pem_id(pem: str) -> bytes:
+    """Short fingerprint of an App private key, used as a cache key component."""
+    return hashlib.blake2b(pem.encode(), digest_size=8).digest()
 
 
-def _get_installation_token(jwt_token: str, installation_id: str) -> str:
+def _load_private_key(pem: str, serialization: Any) -> Any:
+    """Parse the PEM once per process; RSA key construction dominates signing cost."""
+    key_id = _pem_id(pem)
+    with _PEM_KEY_LOCK:
+        key = _PEM_KEY_CACHE.get(key_id)
+    if key is None:
+        key = serialization.load_pem_private_key(pem.encode(), password=None)
+        with _PEM_KEY_LOCK:
+            _PEM_KEY_CACHE[key_id] = key
+    return key
+
+
+def _parse_expires_at(value: str | None) -> float:
+    """Convert GitHub's ISO `expires_at` to epoch seconds (defaults to TTL from now)."""
+    if value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            pass
+    return time.time() + INSTALLATION_TOKEN_TTL
+
+
+def _get_installation_token(jwt_token: str, installation_id: str) -> tuple[str, float]:
+    """Exchange an App JWT for an installation token. Returns (token, expires_at)."""
     url = f"{API}/app/installations/{installation_id}/access_tokens"
-    req = Request(url, data=b"", method="POST")
-    req.add_header("Authorization", f"Bearer {jwt_token}")
-    req.add_header("Accept", "application/vnd.github+json")
-    with urlopen(req, timeout=10) as resp:
-        return json.loads(resp.read())["token"]
+    resp = _POOL.request("POST", url, body=b"", timeout=10, headers={
+        "Authorization": f"Bearer {jwt_token}",
+        "Accept": "application/vnd.github+json",
+        "Accept-Encoding": "gzip",
+    })
+    if resp.status >= 400:
+        raise _error_from_response(resp, "GitHub App token exchange")
+    data = _loads(resp.data)
+    return data["token"], _parse_expires_at(data.get("expires_at"))
+
+
+def _cached_installation_token(app_id: str, installation_id: str, pem: str) -> str:
+    """Return an installation token, reusing the in-process one until near expiry.
+
+    The key includes a hash of the PEM so a rotated App key never reuses a
+    token minted with the old one.
+    """
+    key = (app_id, installation_id, _pem_id(pem))
+    now = time.time()
+    with _TOKEN_LOCK:
+        cached = _TOKEN_CACHE.get(key)
+        if cached and now < cached[1] - TOKEN_REFRESH_MARGIN:
+            return cached[0]
+        _TOKEN_CACHE.pop(key, None)
+
+    token, expires_at = _get_installation_token(_build_jwt(app_id, pem), installation_id)
+    with _TOKEN_LOCK:
+        _TOKEN_CACHE[key] = (token, expires_at)
+    return token
 
 
 def _make_token(
@@ -67,8 +194,7 @@ def _make_token(
 ) -> str:
     """Return a usable token, preferring App auth when all params are set."""
     if app_id and installation_id and pem:
-        jwt_tok = _build_jwt(app_id, pem)
-        return _get_installation_token(jwt_tok, installation_id)
+        return _cached_installation_token(app_id, installation_id, pem)
     if pat:
         return pat
     raise RuntimeError("No GitHub credentials: set GITHUB_TOKEN or App credentials")
@@ -76,25 +202,77 @@ def _make_token(
 
 # ── HTTP helper ──────────────────────────────────────────────────
 
-def _gh(method: str, path: str, token: str, body: dict | None = None) -> dict:
+class GitHubAPIError(RuntimeError):
+    """GitHub answered with an error status; carries the status and parsed body."""
+
+    def __init__(self, message: str, status: int, body: dict | None = None):
+        super().__init__(message)
+        self.status = status
+        self.body = body or {}
+
+
+def _error_from_response(resp: Any, what: str) -> GitHubAPIError:
+    try:
+        parsed = _loads(resp.data) if resp.data else {}
+    except ValueError:
+        parsed = {}
+    err_body = resp.data.decode(errors="replace")[:800]
+    return GitHubAPIError(
+        f"{what} => {resp.status}: {err_body}",
+        status=resp.status,
+        body=parsed if isinstance(parsed, dict) else {},
+    )
+
+
+def _json_str(value: str) -> str:
+    """JSON-escape a string for splicing into a preformatted body (no quotes)."""
+    return json.dumps(value)[1:-1]
+
+
+# Fixed-shape request bodies, filled with _json_str-escaped values
+_REF_BODY = '{"ref":"refs/heads/%s","sha":"%s"}'
+_PR_BODY = '{"title":"%s","body":"%s","head":"%s","base":"%s"}'
+
+
+def _gh_raw(
+    method: str, path: str, token: str, body: dict | bytes | None = None, headers: dict | None = None,
+) -> tuple[int, Any, Any]:
+    """Issue a GitHub API call and return (status, response headers, parsed body).
+
+    body may be a dict (serialized here) or pre-encoded JSON bytes.
+    Statuses below 400 (including 304 Not Modified) are returned, not raised.
+    """
     url = f"{API}{path}" if path.startswith("/") else path
-    data = json.dumps(body).encode() if body else None
-    req = Request(url, data=data, method=method)
-    req.add_header("Authorization", f"Bearer {token}")
-    req.add_header("Accept", "application/vnd.github+json")
+    data = body if isinstance(body, bytes) else (_dumps(body) if body else None)
+    req_headers = {
+        "Authorization": f"Bearer {token}",
+        "Accept": "application/vnd.github+json",
+        # urllib3 transparently gunzips (decode_content=True)
+        "Accept-Encoding": "gzip",
+    }
     if data:
-        req.add_header("Content-Type", "application/json")
-    try:
-        with urlopen(req, timeout=15) as resp:
-            raw = resp.read().decode()
-            return json.loads(raw) if raw else {}
-    except HTTPError as e:
-        err_body = ""
-        try:
-            err_body = e.read().decode()[:800]
-        except Exception:
-            pass
-        raise RuntimeError(f"GitHub API {method} {path} => {e.code}: {err_body}") from e
+        req_headers["Content-Type"] = "application/json"
+    if headers:
+        req_headers.update(headers)
+    resp = _POOL.request(method, url, body=data, headers=req_headers, timeout=15)
+    if resp.status >= 400:
+        raise _error_from_response(resp, f"GitHub API {method} {path}")
+    return resp.status, resp.headers, _loads(resp.data) if resp.data else {}
+
+
+def _gh(method: str, path: str, token: str, body: dict | bytes | None = None) -> dict:
+    return _gh_raw(method, path, token, body)[2]
+
+
+def _pr_already_exists(err: GitHubAPIError) -> bool:
+    """True for the 422 GitHub returns when an open PR already uses the head branch."""
+    if err.status != 422:
+        return False
+    return any(
+        "pull request already exists" in str(item.get("message", "")).lower()
+        for item in err.body.get("errors", [])
+        if isinstance(item, dict)
+    )
 
 
 # ── Main client ──────────────────────────────────────────────────
@@ -111,36 +289,84 @@ class GitHubClient:
         default_branch_fallback: str = "main",
     ):
         self._owner = owner
-        self._token = _make_token(pat=pat, app_id=app_id, installation_id=installation_id, pem=pem)
+        self._repo_prefix = f"/repos/{owner}"
+        self._credentials = {"pat": pat, "app_id": app_id, "installation_id": installation_id, "pem": pem}
+        _make_token(**self._credentials)  # fail fast when no credentials are configured
         self._default_branch_fallback = default_branch_fallback
+        # repo -> default_branch, answered without a request for the client's lifetime
+        self._default_branch_cache: dict[str, str] = {}
+        # "owner/repo" -> ".../contents/" prefix; only the quoted path is appended per call
+        self._contents_url: dict[str, str] = {}
+
+    def _contents_prefix(self, repo: str, owner: str | None = None) -> str:
+        owner = owner or self._owner
+        key = f"{owner}/{repo}"
+        url = self._contents_url.get(key)
+        if url is None:
+            prefix = self._repo_prefix if owner == self._owner else f"/repos/{owner}"
+            url = self._contents_url[key] = f"{prefix}/{repo}/contents/"
+        return url
+
+    @property
+    def _token(self) -> str:
+        """Current token; App tokens come from the process cache, so a long-lived client keeps working."""
+        return _make_token(**self._credentials)
 
     def get_default_branch(self, repo: str) -> str:
+        branch = self._default_branch_cache.get(repo)
+        if branch is not None:
+            return branch
+
+        key = (self._owner, repo)
+        with _BRANCH_ETAG_LOCK:
+            cached = _BRANCH_ETAG_CACHE.get(key)
+        headers = {"If-None-Match": cached[1]} if cached else None
         try:
-            data = _gh("GET", f"/repos/{self._owner}/{repo}", self._token)
-            return data.get("default_branch", self._default_branch_fallback)
-        except Exception:
+            status, resp_headers, data = _gh_raw("GET", f"{self._repo_prefix}/{repo}", self._token, headers=headers)
+        except (RuntimeError, urllib3.exceptions.HTTPError):
             return self._default_branch_fallback
+        if status == 304 and cached:
+            branch = cached[0]
+        else:
+            branch = data.get("default_branch", self._default_branch_fallback)
+            etag = resp_headers.get("ETag")
+            if etag:
+                with _BRANCH_ETAG_LOCK:
+                    _BRANCH_ETAG_CACHE[key] = (branch, etag)
+        self._default_branch_cache[repo] = branch
+        return branch
 
     def _get_ref_sha(self, repo: str, branch: str) -> str:
-        data = _gh("GET", f"/repos/{self._owner}/{repo}/git/ref/heads/{branch}", self._token)
+        data = _gh("GET", f"{self._repo_prefix}/{repo}/git/ref/heads/{_q(branch)}", self._token)
         return data["object"]["sha"]
 
     def _create_branch(self, repo: str, branch: str, sha: str) -> dict:
-        return _gh("POST", f"/repos/{self._owner}/{repo}/git/refs", self._token, {
-            "ref": f"refs/heads/{branch}",
-            "sha": sha,
-        })
-
-    def _create_or_update_file(self, repo: str, branch: str, path: str, content: str, message: str) -> dict:
-        encoded = base64.b64encode(content.encode()).decode()
+        body = _REF_BODY % (_json_str(branch), _json_str(sha))
+        return _gh("POST", f"{self._repo_prefix}/{repo}/git/refs", self._token, body.encode())
 
-        # Check if file already exists to get its sha for update
-        file_sha = None
+    def _get_file_sha(self, repo: str, branch: str, path: str) -> str | None:
+        """Return the blob sha of path on branch, or None if it does not exist."""
         try:
-            existing = _gh("GET", f"/repos/{self._owner}/{repo}/contents/{path}?ref={branch}", self._token)
-            file_sha = existing.get("sha")
+            existing = _gh("GET", f"{self._contents_prefix(repo)}{_q(path)}?ref={_q(branch, safe='')}", self._token)
+            return existing.get("sha")
         except RuntimeError:
-            pass
+            return None
+
+    def _create_or_update_file(self, repo: str, branch: str, path: str, content: str, message: str,
+                               probe_existing: bool = True) -> dict:
+        """PUT file contents.
+
+        probe_existing=False skips the sha lookup (a branch we just created
+        from the default branch almost never has the file). If GitHub rejects
+        the blind PUT with 422 because the file is there after all, we fall
+        back to probe + update.
+        """
+        encoded = _b64encode(content.encode("utf-8")).decode("ascii")
+        if len(content) > LARGE_FILE_THRESHOLD:
+            return self._commit_file_via_git_data(repo, branch, path, encoded, message)
+
+        # Check if file already exists to get its sha for update
+        file_sha = self._get_file_sha(repo, branch, path) if probe_existing else None
 
         body: dict[str, Any] = {
             "message": message,
@@ -150,35 +376,113 @@ class GitHubClient:
         if file_sha:
             body["sha"] = file_sha
 
-        return _gh("PUT", f"/repos/{self._owner}/{repo}/contents/{path}", self._token, body)
+        try:
+            return _gh("PUT", f"{self._contents_prefix(repo)}{_q(path)}", self._token, body)
+        except GitHubAPIError as e:
+            if probe_existing or e.status != 422:
+                raise
+        return self._create_or_update_file(repo, branch, path, content, message, probe_existing=True)
+
+    # ── Git Data API (large files) ───────────────────────────────
 
-    def _create_pr(self, repo: str, title: str, body: str, head: str, base: str) -> dict:
-        return _gh("POST", f"/repos/{self._owner}/{repo}/pulls", self._token, {
-            "title": title,
-            "body": body,
-            "head": head,
-            "base": base,
+    def _create_blob(self, repo: str, encoded: str) -> str:
+        data = _gh("POST", f"{self._repo_prefix}/{repo}/git/blobs", self._token, {
+            "content": encoded,
+            "encoding": "base64",
+        })
+        return data["sha"]
+
+    def _create_tree(self, repo: str, base_tree: str, path: str, blob_sha: str) -> str:
+        data = _gh("POST", f"{self._repo_prefix}/{repo}/git/trees", self._token, {
+            "base_tree": base_tree,
+            "tree": [{"path": path, "mode": "100644", "type": "blob", "sha": blob_sha}],
+        })
+        return data["sha"]
+
+    def _create_commit(self, repo: str, message: str, tree_sha: str, parent_sha: str) -> dict:
+        return _gh("POST", f"{self._repo_prefix}/{repo}/git/commits", self._token, {
+            "message": message,
+            "tree": tree_sha,
+            "parents": [parent_sha],
+        })
+
+    def _update_ref(self, repo: str, branch: str, sha: str) -> dict:
+        return _gh("PATCH", f"{self._repo_prefix}/{repo}/git/refs/heads/{_q(branch)}", self._token, {
+            "sha": sha,
         })
 
+    def _commit_file_via_git_data(self, repo: str, branch: str, path: str, encoded: str, message: str) -> dict:
+        """Commit one file as blob → tree → commit → ref update.
+
+        The blob upload (the large request) overlaps with reading the branch
+        head. Returns a contents-API-shaped {"commit": {...}} dict.
+        """
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            blob_future = pool.submit(self._create_blob, repo, encoded)
+            parent_sha = self._get_ref_sha(repo, branch)
+            parent = _gh("GET", f"{self._repo_prefix}/{repo}/git/commits/{parent_sha}", self._token)
+            blob_sha = blob_future.result()
+        tree_sha = self._create_tree(repo, parent["tree"]["sha"], path, blob_sha)
+        commit = self._create_commit(repo, message, tree_sha, parent_sha)
+        self._update_ref(repo, branch, commit["sha"])
+        return {"commit": commit}
+
+    def _create_pr(self, repo: str, title: str, body: str, head: str, base: str) -> dict:
+        payload = _PR_BODY % (_json_str(title), _json_str(body), _json_str(head), _json_str(base))
+        return _gh("POST", f"{self._repo_prefix}/{repo}/pulls", self._token, payload.encode())
+
+    def _split_repo(self, repo_full_name: str) -> tuple[str, str]:
+        owner, sep, repo_name = repo_full_name.partition("/")
+        if not sep:
+            return self._owner, repo_full_name
+        return owner, repo_name
+
     def file_exists(self, repo_full_name: str, path: str) -> bool:
         """Check if a file exists in the repo's default branch."""
-        parts = repo_full_name.split("/", 1)
-        if len(parts) == 2:
-            owner, repo_name = parts
-        else:
-            owner, repo_name = self._owner, repo_full_name
+        owner, repo_name = self._split_repo(repo_full_name)
 
         default_branch = self.get_default_branch(repo_name)
+        url = f"{self._contents_prefix(repo_name, owner)}{_q(path)}?ref={_q(default_branch, safe='')}"
         try:
-            _gh("GET", f"/repos/{owner}/{repo_name}/contents/{path}?ref={default_branch}", self._token)
+            _gh("GET", url, self._token)
             return True
         except RuntimeError:
             return False
 
+    async def file_exists_async(self, repo_full_name: str, path: str) -> bool:
+        """file_exists for callers inside an event loop; runs on a worker thread."""
+        return await asyncio.to_thread(self.file_exists, repo_full_name, path)
+
+    def files_exist(self, pairs: list[tuple[str, str]]) -> dict[tuple[str, str], bool]:
+        """Batch file_exists for (repo_full_name, path) pairs in one GraphQL call.
+
+        Each pair becomes an aliased `repository { object(expression: "HEAD:path") }`
+        lookup; a missing repo or path resolves to False. Falls back to
+        per-item file_exists if the GraphQL request itself fails.
+        """
+        if not pairs:
+            return {}
+        fields = []
+        for i, (repo_full_name, path) in enumerate(pairs):
+            owner, repo_name = self._split_repo(repo_full_name)
+            fields.append(
+                f"r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo_name)}) "
+                f"{{ object(expression: {json.dumps('HEAD:' + path)}) {{ __typename }} }}"
+            )
+        try:
+            resp = _gh("POST", "/graphql", self._token, {"query": "query { " + " ".join(fields) + " }"})
+        except RuntimeError:
+            resp = {}
+        data = resp.get("data")
+        if not isinstance(data, dict):
+            return {pair: self.file_exists(*pair) for pair in pairs}
+        return {pair: bool((data.get(f"r{i}") or {}).get("object")) for i, pair in enumerate(pairs)}
+
     def find_open_pr(self, repo: str, head_branch: str) -> dict | None:
         """Find an existing open PR for a given head branch."""
         try:
-            prs = _gh("GET", f"/repos/{self._owner}/{repo}/pulls?head={self._owner}:{head_branch}&state=open", self._token)
+            head = _q(f"{self._owner}:{head_branch}", safe="")
+            prs = _gh("GET", f"{self._repo_prefix}/{repo}/pulls?head={head}&state=open", self._token)
             if isinstance(prs, list) and prs:
                 return prs[0]
         except RuntimeError:
@@ -209,31 +513,35 @@ class GitHubClient:
         branch_existed = False
         try:
             self._create_branch(repo, actual_branch, base_sha)
-        except RuntimeError as e:
-            if "422" in str(e) or "Reference already exists" in str(e):
+        except GitHubAPIError as e:
+            if e.status == 422:
                 branch_existed = True
             else:
                 raise
 
-        commit_resp = self._create_or_update_file(repo, actual_branch, file_path, file_content, commit_message)
+        # Only a branch that already existed can hold the file, so only then
+        # is the contents sha looked up before the PUT.
+        commit_resp = self._create_or_update_file(repo, actual_branch, file_path, file_content,
+                                                  commit_message, probe_existing=branch_existed)
         commit_sha = commit_resp.get("commit", {}).get("sha", "")
 
-        # Idempotency: reuse existing PR if branch already existed
-        if branch_existed:
-            existing_pr = self.find_open_pr(repo, actual_branch)
-            if existing_pr:
-                return {
-                    "github_owner": self._owner,
-                    "github_repo": repo,
-                    "branch": actual_branch,
-                    "default_branch": default_branch,
-                    "pr_url": existing_pr.get("html_url", ""),
-                    "pr_number": existing_pr.get("number", 0),
-                    "commit_sha": commit_sha,
-                    "reused_pr": True,
-                }
-
-        pr_resp = self._create_pr(repo, pr_title, pr_body, actual_branch, default_branch)
+        try:
+            pr_resp = self._create_pr(repo, pr_title, pr_body, actual_branch, default_branch)
+        except GitHubAPIError as e:
+            # Idempotency: an open PR for this head branch already exists – reuse it
+            existing_pr = self.find_open_pr(repo, actual_branch) if _pr_already_exists(e) else None
+            if not existing_pr:
+                raise
+            return {
+                "github_owner": self._owner,
+                "github_repo": repo,
+                "branch": actual_branch,
+                "default_branch": default_branch,
+                "pr_url": existing_pr.get("html_url", ""),
+                "pr_number": existing_pr.get("number", 0),
+                "commit_sha": commit_sha,
+                "reused_pr": True,
+            }
 
         return {
             "github_owner": self._owner,
@@ -251,7 +559,7 @@ class DryRunGitHubClient:
 
     def __init__(self, owner: str = "dry-run-owner"):
         self._owner = owner
-        self._counter = 0
+        self._counter = itertools.count(1)
 
     def get_default_branch(self, repo: str) -> str:
         return "main"
@@ -259,19 +567,25 @@ class DryRunGitHubClient:
     def file_exists(self, repo_full_name: str, path: str) -> bool:
         return True
 
+    async def file_exists_async(self, repo_full_name: str, path: str) -> bool:
+        return True
+
+    def files_exist(self, pairs: list[tuple[str, str]]) -> dict[tuple[str, str], bool]:
+        return {pair: True for pair in pairs}
+
     def find_open_pr(self, repo: str, head_branch: str) -> dict | None:
         return None
 
     def create_pr_with_notes(self, *, repo: str, branch_name: str, pr_title: str,
                              pr_body: str, file_path: str, file_content: str,
                              commit_message: str, collector_run_id: str = "") -> dict[str, Any]:
-        self._counter += 1
+        n = next(self._counter)
         return {
             "github_owner": self._owner,
             "github_repo": repo,
             "branch": branch_name,
             "default_branch": "main",
-            "pr_url": f"https://github.com/{self._owner}/{repo}/pull/{self._counter}",
-            "pr_number": self._counter,
-            "commit_sha": f"dryrun-sha-{self._counter}",
+            "pr_url": f"https://github.com/{self._owner}/{repo}/pull/{n}",
+            "pr_number": n,
+            "commit_sha": f"dryrun-sha-{n}",
         }
@@ -12,30 +12,77 @@ v1 hardening:
  - Kill switch: AUTOMATION_ENABLED=false → collect/analyze only, no execution
  - Structured logging: every log includes incident_id + correlation_id
 """
+import base64
+import functools
+import gzip
 import hashlib
 import json
+import math
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
 import boto3
+from boto3.dynamodb.types import TypeSerializer
+from botocore.config import Config
+from botocore.exceptions import ClientError
 
 from plan_generator import (
     generate_action_plan, build_teams_body, build_pr_body,
     generate_action_content_llm,
 )
-from jira_client import JiraClient, DryRunJiraClient
-from teams_notifier import TeamsNotifier, DryRunTeamsNotifier
-from github_client import GitHubClient, DryRunGitHubClient
-from repo_resolver import resolve_repo, load_mapping_rules, RepoResolution
 
-s3 = boto3.client("s3")
-dynamodb = boto3.resource("dynamodb")
-ssm = boto3.client("ssm")
-events_client = boto3.client("events")
+# Integration clients are imported where they are first used, so a cold start
+# only loads the modules (and urllib3) that the invocation actually needs.
+if TYPE_CHECKING:
+    from jira_client import JiraClient
+    from teams_notifier import TeamsNotifier
+    from github_client import GitHubClient
+    from repo_resolver import RepoResolution
+
+# orjson when bundled (2-5x faster); DynamoDB String attributes, log lines and
+# EventBridge Detail all need str, hence the decode.
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps_str(obj: Any) -> str:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def _load_body(body) -> Any:
+        return orjson.loads(body.read())
+except ImportError:
+    _loads = json.loads
+
+    def _dumps_str(obj: Any) -> str:
+        return json.dumps(obj, default=str)
+
+    def _load_body(body) -> Any:
+        return json.load(body)
+
+# Keep-alive pooled connections so warm invocations skip the TCP/TLS handshake
+_BOTO_CFG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    retries={"max_attempts": 3, "mode": "standard"},
+)
+
+s3 = boto3.client("s3", config=_BOTO_CFG)
+dynamodb = boto3.resource("dynamodb", config=_BOTO_CFG)
+# Writes go through the low-level client with one shared serializer instead
+# of the resource layer's per-call wrapping.
+_DDB = boto3.client("dynamodb", config=_BOTO_CFG)
+_SER = TypeSerializer()
+ssm = boto3.client("ssm", config=_BOTO_CFG)
+events_client = boto3.client("events", config=_BOTO_CFG)
 
 INCIDENTS_TABLE = os.environ["INCIDENTS_TABLE"]
+_TABLE = dynamodb.Table(INCIDENTS_TABLE)
 EVENT_BUS_NAME = os.environ.get("EVENT_BUS_NAME", "")
 DRY_RUN = os.environ.get("ACTIONS_DRY_RUN", "true").lower() in ("true", "1", "yes")
 AUTOMATION_ENABLED = os.environ.get("AUTOMATION_ENABLED", "true").lower() in ("true", "1", "yes")
@@ -59,43 +106,117 @@ SSM_GITHUB_APP_ID = os.environ.get("SSM_GITHUB_APP_ID", "/opsrunbook/dev/github/
 SSM_GITHUB_APP_INSTALL_ID = os.environ.get("SSM_GITHUB_APP_INSTALL_ID", "/opsrunbook/dev/github/app_installation_id")
 SSM_GITHUB_APP_PEM = os.environ.get("SSM_GITHUB_APP_PEM", "/opsrunbook/dev/github/app_private_key_pem")
 
+# Parameter name -> (monotonic expiry, value); survives warm invocations
+_SSM_TTL = int(os.environ.get("SSM_CACHE_TTL", "300"))
+_SSM_CACHE: dict[str, tuple[float, str | None]] = {}
+_SSM_BATCH_LIMIT = 10  # get_parameters accepts at most 10 names
+
+# Every parameter the client builders read: name -> WithDecryption
+_SSM_PARAMS: dict[str, bool] = {
+    SSM_JIRA_BASE_URL: False,
+    SSM_JIRA_EMAIL: False,
+    SSM_JIRA_API_TOKEN: True,
+    SSM_JIRA_PROJECT_KEY: False,
+    SSM_JIRA_ISSUE_TYPE: False,
+    SSM_TEAMS_WEBHOOK: True,
+}
+if ENABLE_GITHUB_PR and GITHUB_OWNER:
+    _SSM_PARAMS.update({
+        SSM_GITHUB_TOKEN: True,
+        SSM_GITHUB_APP_ID: False,
+        SSM_GITHUB_APP_INSTALL_ID: False,
+        SSM_GITHUB_APP_PEM: True,
+    })
+
 
 def _now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
 
 
 def _log(msg: str, incident_id: str = "", correlation_id: str = "", **extra):
     entry = {"msg": msg, "incident_id": incident_id, "correlation_id": correlation_id}
     entry.update(extra)
-    print(json.dumps(entry, default=str))
+    print(_dumps_str(entry))
 
 
 def _idempotency_key(incident_id: str, action_type: str, discriminator: str = "") -> str:
     raw = f"{incident_id}|{action_type}|{discriminator}"
-    return hashlib.sha256(raw.encode()).hexdigest()[:24]
+    return hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()
 
 
 def _load_json(bucket: str, key: str) -> dict:
     resp = s3.get_object(Bucket=bucket, Key=key)
-    return json.loads(resp["Body"].read().decode("utf-8"))
+    # The analyzer stores packets gzipped; boto3 does not undo Content-Encoding
+    if resp.get("ContentEncoding") == "gzip":
+        return _loads(gzip.decompress(resp["Body"].read()))
+    return _load_body(resp["Body"])
+
+
+def _unwrap_ssm_value(val: str) -> str:
+    if not val:
+        return val
+    try:
+        parsed = _loads(val)
+        return parsed if isinstance(parsed, str) else val
+    except (json.JSONDecodeError, TypeError):
+        return val
+
+
+def _prefetch_ssm_params() -> None:
+    """Load every known parameter with batched get_parameters calls.
+
+    One call for the SecureString names and one for the plain ones replaces
+    up to ten sequential get_parameter round-trips. Names SSM reports as
+    invalid are cached as None; failed calls leave the cache untouched.
+    """
+    for decrypt in (True, False):
+        names = [name for name, d in _SSM_PARAMS.items() if d is decrypt]
+        for start in range(0, len(names), _SSM_BATCH_LIMIT):
+            try:
+                resp = ssm.get_parameters(Names=names[start:start + _SSM_BATCH_LIMIT], WithDecryption=decrypt)
+            except Exception:
+                continue
+            expiry = time.monotonic() + _SSM_TTL
+            for param in resp.get("Parameters", []):
+                _SSM_CACHE[param["Name"]] = (expiry, _unwrap_ssm_value(param["Value"]))
+            for name in resp.get("InvalidParameters", []):
+                _SSM_CACHE[name] = (expiry, None)
 
 
 def _get_ssm_param(name: str, decrypt: bool = False) -> str | None:
+    """Read an SSM parameter, reusing the value for _SSM_TTL seconds.
+
+    Known parameters are refreshed together through _prefetch_ssm_params;
+    anything else falls back to a single get_parameter. Failed lookups are
+    not cached so a transient SSM error does not pin a missing value for the
+    whole TTL.
+    """
+    now = time.monotonic()
+    cached = _SSM_CACHE.get(name)
+    if cached and now < cached[0]:
+        return cached[1]
+    if name in _SSM_PARAMS:
+        _prefetch_ssm_params()
+        cached = _SSM_CACHE.get(name)
+        if cached and now < cached[0]:
+            return cached[1]
     try:
         resp = ssm.get_parameter(Name=name, WithDecryption=decrypt)
-        val = resp["Parameter"]["Value"]
-        if not val:
-            return val
-        try:
-            parsed = json.loads(val)
-            return parsed if isinstance(parsed, str) else val
-        except (json.JSONDecodeError, TypeError):
-            return val
+        val = _unwrap_ssm_value(resp["Parameter"]["Value"])
     except Exception:
         return None
+    _SSM_CACHE[name] = (now + _SSM_TTL, val)
+    return val
+
+
+# Cold start pays the SSM round-trips once; dry-run stacks and a disabled
+# kill switch never read them.
+if AUTOMATION_ENABLED and not DRY_RUN:
+    _prefetch_ssm_params()
 
 
-def _build_jira_client() -> JiraClient | None:
+def _build_jira_client() -> "JiraClient | None":
+    from jira_client import JiraClient
     base_url = _get_ssm_param(SSM_JIRA_BASE_URL)
     email = _get_ssm_param(SSM_JIRA_EMAIL)
     token = _get_ssm_param(SSM_JIRA_API_TOKEN, decrypt=True)
@@ -106,7 +227,8 @@ def _build_jira_client() -> JiraClient | None:
     return JiraClient(base_url, email, token, project, issue_type)
 
 
-def _build_teams_notifier() -> TeamsNotifier | None:
+def _build_teams_notifier() -> "TeamsNotifier | None":
+    from teams_notifier import TeamsNotifier
     webhook = _get_ssm_param(SSM_TEAMS_WEBHOOK, decrypt=True)
     if not webhook:
         return None
@@ -122,8 +244,8 @@ def _real_or_none(val: str | None) -> str | None:
     return val
 
 
+@functools.lru_cache(maxsize=4)
 def _normalize_pem(raw: str | None) -> str | None:
-    import base64 as b64
     if not raw:
         return raw
     raw = raw.strip()
@@ -131,7 +253,7 @@ def _normalize_pem(raw: str | None) -> str | None:
         raw = raw[1:-1]
     if not raw.startswith("-----BEGIN"):
         try:
-            decoded = b64.b64decode(raw).decode("utf-8")
+            decoded = base64.b64decode(raw).decode("utf-8")
             if "-----BEGIN" in decoded:
                 raw = decoded
         except Exception:
@@ -141,9 +263,10 @@ def _normalize_pem(raw: str | None) -> str | None:
     return raw
 
 
-def _build_github_client() -> GitHubClient | None:
+def _build_github_client() -> "GitHubClient | None":
     if not GITHUB_OWNER:
         return None
+    from github_client import GitHubClient
     pat = _real_or_none(_get_ssm_param(SSM_GITHUB_TOKEN, decrypt=True))
     app_id = _real_or_none(_get_ssm_param(SSM_GITHUB_APP_ID))
     install_id = _real_or_none(_get_ssm_param(SSM_GITHUB_APP_INSTALL_ID))
@@ -160,53 +283,122 @@ def _build_github_client() -> GitHubClient | None:
     )
 
 
-# ── Idempotency helpers ──────────────────────────────────────────
+# Clients built on first use and reused by warm invocations. A None result
+# (integration not configured) is not kept, so fixing SSM takes effect
+# without a cold start.
+_CLIENTS: dict[str, Any] = {}
+
+
+def _cached_client(name: str, build) -> Any:
+    client = _CLIENTS.get(name)
+    if client is None:
+        client = build()
+        if client is not None:
+            _CLIENTS[name] = client
+    return client
 
-def _find_existing_action(table, incident_id: str, action_type: str) -> dict | None:
-    """Check if an action of this type already succeeded for this incident."""
+
+# ── Idempotency: per-action claims ───────────────────────────────
+# Before an action runs, a conditional put claims ACTIONCLAIM#<action_type>
+# for the incident, so a duplicate delivery cannot run it a second time.
+# The claim is a lease that ends shortly after the claiming invocation's
+# deadline, so a crashed attempt does not block its retry. The final write
+# turns the claim into a copy of the action's result: a success stays
+# claimed for good, any other outcome can be claimed again.
+
+ACTION_LEASE_MARGIN_SECONDS = 10
+# Deadline assumed when no Lambda context is available (the function timeout)
+ACTION_LEASE_DEFAULT_SECONDS = 180
+
+# Skip reason while another invocation holds a live claim
+_CLAIMED_ELSEWHERE = "claimed_by_concurrent_invocation"
+
+_CLAIM_RESULT_FIELDS = (
+    "action_type", "status", "action_id", "incident_id", "created_at", "request_summary", "response_summary",
+    "external_refs", "evidence_refs",
+)
+
+
+def _claim_sk(action_type: str) -> str:
+    return f"ACTIONCLAIM#{action_type}"
+
+
+def _lease_seconds(context: Any) -> int:
+    """Seconds a claim must last: this invocation's remaining time plus a margin."""
+    if context is None:
+        return ACTION_LEASE_DEFAULT_SECONDS + ACTION_LEASE_MARGIN_SECONDS
+    return context.get_remaining_time_in_millis() // 1000 + 1 + ACTION_LEASE_MARGIN_SECONDS
+
+
+def _claim_action(table, incident_id: str, action_type: str, lease_seconds: int) -> dict | None:
+    """Claim action_type for this incident before running it.
+
+    Returns None when this invocation now holds the claim and should run the
+    action. Otherwise returns the result to use instead: the stored result of
+    an earlier success, or a skipped result while another invocation holds a
+    live claim. The claim costs one conditional write; the read only happens
+    when the condition fails.
+    """
+    now = int(time.time())
+    key = {"pk": f"INCIDENT#{incident_id}", "sk": _claim_sk(action_type)}
     try:
-        resp = table.query(
-            KeyConditionExpression="pk = :pk AND begins_with(sk, :prefix)",
-            ExpressionAttributeValues={
-                ":pk": f"INCIDENT#{incident_id}",
-                ":prefix": "ACTION#",
-            },
+        table.put_item(
+            Item={**key, "incident_id": incident_id, "action_type": action_type, "status": "claimed",
+                  "lease_expires_at": now + lease_seconds},
+            ConditionExpression="attribute_not_exists(sk) OR (#s <> :ok AND lease_expires_at < :now)",
+            ExpressionAttributeNames={"#s": "status"},
+            ExpressionAttributeValues={":ok": "success", ":now": now},
         )
-        for item in resp.get("Items", []):
-            if item.get("action_type") == action_type and item.get("status") == "success":
-                result = dict(item)
-                for field in ("external_refs", "evidence_refs"):
-                    if isinstance(result.get(field), str):
-                        try:
-                            result[field] = json.loads(result[field])
-                        except (json.JSONDecodeError, TypeError):
-                            pass
-                return result
-    except Exception:
-        pass
-    return None
+        return None
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+            raise
+    existing = table.get_item(Key=key, ConsistentRead=True).get("Item") or {}
+    if existing.get("status") == "success":
+        return {field: existing[field] for field in _CLAIM_RESULT_FIELDS if field in existing}
+    return _skipped_result(action_type, _CLAIMED_ELSEWHERE, incident_id=incident_id)
+
+
+# ── Persistence ──────────────────────────────────────────────────
+# Items are built during the invocation and written together by _write_items.
+
+_BATCH_WRITE_LIMIT = 25
+_BATCH_WRITE_ATTEMPTS = 4
+
 
+def _ddb_value(value: Any) -> Any:
+    """Make a JSON-like value storable as a native DynamoDB map/list (floats become Decimal).
 
-def _persist_action_plan(table, incident_id: str, plan: dict) -> str:
-    created_at = plan.get("created_at", _now_iso())
-    sk = f"ACTIONPLAN#{created_at}"
-    table.put_item(Item={
+    DynamoDB rejects NaN and Infinity numbers, so non-finite floats are stored as strings.
+    """
+    if isinstance(value, (str, bool, int, Decimal)) or value is None:
+        return value
+    if isinstance(value, float):
+        return Decimal(str(value)) if math.isfinite(value) else str(value)
+    if isinstance(value, dict):
+        return {str(k): _ddb_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_ddb_value(v) for v in value]
+    return str(value)
+
+
+def _action_plan_item(incident_id: str, plan: dict, now_iso: str | None = None) -> dict:
+    created_at = plan.get("created_at") or now_iso or _now_iso()
+    return {
         "pk": f"INCIDENT#{incident_id}",
-        "sk": sk,
+        "sk": f"ACTIONPLAN#{created_at}",
         "incident_id": incident_id,
         "created_at": created_at,
-        "plan": json.dumps(plan, default=str),
-    })
-    return sk
+        "plan": _dumps_str(plan),
+    }
 
 
-def _persist_action_result(table, incident_id: str, result: dict) -> str:
-    created_at = result.get("created_at", _now_iso())
+def _action_result_item(incident_id: str, result: dict, now_iso: str | None = None) -> dict:
+    created_at = result.get("created_at") or now_iso or _now_iso()
     action_id = result.get("action_id", uuid4().hex[:12])
-    sk = f"ACTION#{created_at}#{action_id}"
-    table.put_item(Item={
+    return {
         "pk": f"INCIDENT#{incident_id}",
-        "sk": sk,
+        "sk": f"ACTION#{created_at}#{action_id}",
         "incident_id": incident_id,
         "action_id": action_id,
         "action_type": result.get("action_type", ""),
@@ -214,47 +406,93 @@ def _persist_action_result(table, incident_id: str, result: dict) -> str:
         "created_at": created_at,
         "request_summary": result.get("request_summary", "")[:1000],
         "response_summary": result.get("response_summary", "")[:1000],
-        "external_refs": json.dumps(result.get("external_refs", {}), default=str),
+        "external_refs": _ddb_value(result.get("external_refs", {})),
         "error": result.get("error"),
         "cause": result.get("cause"),
-        "evidence_refs": json.dumps(result.get("evidence_refs", []), default=str),
+        "evidence_refs": _ddb_value(result.get("evidence_refs", [])),
+    }
+
+
+def _claim_item(incident_id: str, action_item: dict) -> dict:
+    """Final state of an action's claim: a copy of its result, with the lease released.
+
+    Only a success keeps the claim; a failed or skipped action can be
+    claimed and run again by a later delivery.
+    """
+    item = {field: action_item[field] for field in _CLAIM_RESULT_FIELDS if field in action_item}
+    item.update({
+        "pk": f"INCIDENT#{incident_id}",
+        "sk": _claim_sk(action_item["action_type"]),
+        "action_sk": action_item["sk"],
+        "lease_expires_at": 0,
     })
-    return sk
+    return item
+
+
+def _released_claim_item(incident_id: str, action_type: str) -> dict:
+    """Release a claim whose action never produced a result (its executor raised)."""
+    return {
+        "pk": f"INCIDENT#{incident_id}",
+        "sk": _claim_sk(action_type),
+        "incident_id": incident_id,
+        "action_type": action_type,
+        "status": "interrupted",
+        "lease_expires_at": 0,
+    }
 
 
-def _update_latest_pointer(table, incident_id: str, plan_sk: str, action_sks: list[str]):
-    table.put_item(Item={
+def _latest_pointer_item(incident_id: str, plan_sk: str, action_sks: list[str], now_iso: str | None = None) -> dict:
+    return {
         "pk": f"INCIDENT#{incident_id}",
         "sk": "ACTIONS#LATEST",
         "incident_id": incident_id,
         "latest_actionplan_sk": plan_sk,
-        "latest_action_sks": json.dumps(action_sks),
-        "updated_at": _now_iso(),
-    })
+        "latest_action_sks": _dumps_str(action_sks),
+        "updated_at": now_iso or _now_iso(),
+    }
 
 
-def _emit_event(action_type: str, status: str, incident_id: str, external_refs: dict, correlation_id: str = ""):
+def _write_items(items: list[dict]) -> None:
+    """Put items with BatchWriteItem, retrying UnprocessedItems a bounded number of times."""
+    for start in range(0, len(items), _BATCH_WRITE_LIMIT):
+        chunk = items[start:start + _BATCH_WRITE_LIMIT]
+        request = {INCIDENTS_TABLE: [
+            {"PutRequest": {"Item": {k: _SER.serialize(v) for k, v in item.items()}}} for item in chunk
+        ]}
+        for attempt in range(_BATCH_WRITE_ATTEMPTS):
+            request = _DDB.batch_write_item(RequestItems=request).get("UnprocessedItems") or {}
+            if not request:
+                break
+            time.sleep(0.05 * 2 ** attempt)
+        if request:
+            unprocessed = sum(len(reqs) for reqs in request.values())
+            raise RuntimeError(f"batch_write_item left {unprocessed} unprocessed item(s)")
+
+
+def _emit_event(action_type: str, status: str, incident_id: str, external_refs: dict, correlation_id: str = "",
+                now_iso: str | None = None):
     if not EVENT_BUS_NAME:
         return
     try:
         events_client.put_events(Entries=[{
             "Source": EVENT_SOURCE,
             "DetailType": "action.completed",
-            "Detail": json.dumps({
+            "Detail": _dumps_str({
                 "incident_id": incident_id,
                 "action_type": action_type,
                 "status": status,
                 "external_refs": external_refs,
                 "correlation_id": correlation_id,
-                "emitted_at": _now_iso(),
-            }, default=str),
+                "emitted_at": now_iso or _now_iso(),
+            }),
             "EventBusName": EVENT_BUS_NAME,
         }])
     except Exception as e:
         _log("event_emit_failed", incident_id, correlation_id, error=str(e)[:300])
 
 
-def _emit_summary_event(incident_id: str, correlation_id: str, statuses: dict, packet_ref: dict):
+def _emit_summary_event(incident_id: str, correlation_id: str, statuses: dict, packet_ref: dict,
+                        now_iso: str | None = None):
     """Emit actions_runner.completed so downstream consumers (e.g. coding agent) can trigger."""
     if not EVENT_BUS_NAME:
         return
@@ -262,13 +500,13 @@ def _emit_summary_event(incident_id: str, correlation_id: str, statuses: dict, p
         events_client.put_events(Entries=[{
             "Source": EVENT_SOURCE,
             "DetailType": "actions_runner.completed",
-            "Detail": json.dumps({
+            "Detail": _dumps_str({
                 "incident_id": incident_id,
                 "correlation_id": correlation_id,
                 "statuses": statuses,
                 "packet_ref": packet_ref,
-                "emitted_at": _now_iso(),
-            }, default=str),
+                "emitted_at": now_iso or _now_iso(),
+            }),
             "EventBusName": EVENT_BUS_NAME,
         }])
     except Exception as e:
@@ -282,6 +520,8 @@ def lambda_handler(event: dict, context: Any) -> dict:
     incident_id = detail.get("incident_id", "")
     collector_run_id = detail.get("collector_run_id", "")
     correlation_id = detail.get("correlation_id", collector_run_id or uuid4().hex[:12])
+    # One timestamp for every record and event this invocation produces
+    now_iso = _now_iso()
 
     _log("actions_runner_start", incident_id, correlation_id, dry_run=DRY_RUN, automation_enabled=AUTOMATION_ENABLED)
 
@@ -305,6 +545,7 @@ def lambda_handler(event: dict, context: Any) -> dict:
         return {"ok": False, "error": f"packet load failed: {e}"}
 
     plan = generate_action_plan(packet, dry_run=DRY_RUN)
+    actions_by_type = _actions_by_type(plan)
 
     # Single LLM call for both Jira description and PR body
     llm_content: dict | None = None
@@ -313,78 +554,131 @@ def lambda_handler(event: dict, context: Any) -> dict:
         if llm_content:
             _log("llm_content_ok", incident_id, correlation_id)
 
-    table = dynamodb.Table(INCIDENTS_TABLE)
-    plan_sk = _persist_action_plan(table, incident_id, plan)
+    plan_item = _action_plan_item(incident_id, plan, now_iso)
+    plan_sk = plan_item["sk"]
+    pending_items: list[dict] = [plan_item]
+    pending_events: list[tuple[str, str, dict]] = []  # action.completed args, sent after the write
     action_sks: list[str] = []
     results: list[dict] = []
-
-    # ── Execute: Jira (idempotent) ────────────────────────────────
-    existing_jira = _find_existing_action(table, incident_id, "create_jira_ticket")
-    if existing_jira:
-        _log("jira_idempotent_skip", incident_id, correlation_id)
-        jira_result = existing_jira
-    else:
-        jira_result = _execute_jira(plan, packet, incident_id, correlation_id, llm_content)
-        sk = _persist_action_result(table, incident_id, jira_result)
-        action_sks.append(sk)
-        _emit_event("create_jira_ticket", jira_result["status"], incident_id,
-                     jira_result.get("external_refs", {}), correlation_id)
-    results.append(jira_result)
-
-    # ── Execute: Teams (idempotent) ───────────────────────────────
-    existing_teams = _find_existing_action(table, incident_id, "notify_teams")
-    if existing_teams:
-        _log("teams_idempotent_skip", incident_id, correlation_id)
-        teams_result = existing_teams
-    else:
-        teams_result = _execute_teams(plan, packet, jira_result.get("external_refs", {}),
-                                      incident_id, correlation_id)
-        sk = _persist_action_result(table, incident_id, teams_result)
-        action_sks.append(sk)
-        _emit_event("notify_teams", teams_result["status"], incident_id,
-                     teams_result.get("external_refs", {}), correlation_id)
-    results.append(teams_result)
-
-    # ── Execute: GitHub PR (idempotent + confidence gate) ─────────
-    if ENABLE_GITHUB_PR:
-        existing_pr = _find_existing_action(table, incident_id, "create_github_pr")
-        if existing_pr:
-            _log("github_pr_idempotent_skip", incident_id, correlation_id)
-            gh_result = existing_pr
+    lease = _lease_seconds(context)
+    claimed: set[str] = set()  # action types claimed here whose result is not recorded yet
+
+    def claim(action_type: str) -> dict | None:
+        existing = _claim_action(_TABLE, incident_id, action_type, lease)
+        if existing is None:
+            claimed.add(action_type)
+        return existing
+
+    def record(result: dict) -> None:
+        item = _action_result_item(incident_id, result, now_iso)
+        pending_items.append(item)
+        pending_items.append(_claim_item(incident_id, item))
+        action_sks.append(item["sk"])
+        claimed.discard(item["action_type"])
+        pending_events.append((item["action_type"], item["status"], result.get("external_refs", {})))
+
+    def flush() -> None:
+        # Claims whose executor raised are released so a retry can run them
+        pending_items.extend(_released_claim_item(incident_id, action_type) for action_type in sorted(claimed))
+        _write_items(pending_items)
+        # action.completed only goes out for results that are stored
+        for action_type, status, external_refs in pending_events:
+            _emit_event(action_type, status, incident_id, external_refs, correlation_id, now_iso)
+
+    # Every item is written in one request at the end, and completed action
+    # results are still recorded if a later step raises.
+    # Each action is claimed before it runs, so a duplicate delivery reuses
+    # the stored success instead of repeating the external side effect.
+    try:
+        # ── Execute: Jira (idempotent) ────────────────────────────
+        existing_jira = claim("create_jira_ticket")
+        if existing_jira:
+            _log("jira_idempotent_skip", incident_id, correlation_id, status=existing_jira["status"])
+            jira_result = existing_jira
         else:
-            gh_result = _execute_github_pr(plan, packet, jira_result.get("external_refs", {}),
-                                           incident_id, correlation_id, llm_content)
-            sk = _persist_action_result(table, incident_id, gh_result)
-            action_sks.append(sk)
-            _emit_event("create_github_pr", gh_result["status"], incident_id,
-                         gh_result.get("external_refs", {}), correlation_id)
-        results.append(gh_result)
+            jira_result = _execute_jira(actions_by_type, packet, incident_id, correlation_id, llm_content, now_iso)
+            record(jira_result)
+        results.append(jira_result)
+
+        # ── Execute: Teams + GitHub PR concurrently ───────────────
+        # Both only need the Jira refs, so when both run the PR goes to a
+        # worker thread while Teams runs here; a lone action runs inline.
+        # Results are recorded on this thread in the original order.
+        jira_refs = jira_result.get("external_refs", {})
+        if jira_result.get("error") == _CLAIMED_ELSEWHERE:
+            # Another delivery is running this incident's actions; leave the rest to it
+            existing_teams = _skipped_result("notify_teams", _CLAIMED_ELSEWHERE, incident_id=incident_id)
+            existing_pr = (_skipped_result("create_github_pr", _CLAIMED_ELSEWHERE, incident_id=incident_id)
+                           if ENABLE_GITHUB_PR else None)
+        else:
+            existing_teams = claim("notify_teams")
+            existing_pr = claim("create_github_pr") if ENABLE_GITHUB_PR else None
+        run_pr = ENABLE_GITHUB_PR and not existing_pr
+        teams_args = (actions_by_type, packet, jira_refs, incident_id, correlation_id, now_iso)
+        pr_args = (actions_by_type, packet, jira_refs, incident_id, correlation_id, llm_content, now_iso)
+        if run_pr and not existing_teams:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                gh_future = pool.submit(_execute_github_pr, *pr_args)
+                teams_result = _execute_teams(*teams_args)
+                gh_result = gh_future.result()
+        else:
+            teams_result = existing_teams or _execute_teams(*teams_args)
+            gh_result = _execute_github_pr(*pr_args) if run_pr else existing_pr
 
-    _update_latest_pointer(table, incident_id, plan_sk, action_sks)
+        if existing_teams:
+            _log("teams_idempotent_skip", incident_id, correlation_id, status=existing_teams["status"])
+        else:
+            record(teams_result)
+        results.append(teams_result)
+
+        # ── GitHub PR (idempotent + confidence gate) ──────────────
+        if ENABLE_GITHUB_PR:
+            if existing_pr:
+                _log("github_pr_idempotent_skip", incident_id, correlation_id, status=existing_pr["status"])
+            else:
+                record(gh_result)
+            results.append(gh_result)
+
+        pending_items.append(_latest_pointer_item(incident_id, plan_sk, action_sks, now_iso))
+    except Exception:
+        # A failed write must not replace the error that got us here
+        try:
+            flush()
+        except Exception as e:
+            _log("action_records_write_failed", incident_id, correlation_id, error=str(e)[:300])
+        raise
+    flush()
 
     statuses = {r["action_type"]: r["status"] for r in results}
     _log("actions_runner_done", incident_id, correlation_id, statuses=statuses)
 
-    _emit_summary_event(incident_id, correlation_id, statuses, packet_ref)
+    _emit_summary_event(incident_id, correlation_id, statuses, packet_ref, now_iso)
 
     return {"ok": True, "incident_id": incident_id, "results": [r["status"] for r in results]}
 
 
 # ── Action executors ─────────────────────────────────────────────
 
-def _execute_jira(plan: dict, packet: dict, incident_id: str, correlation_id: str,
-                  llm_content: dict | None = None) -> dict:
-    jira_action = next((a for a in plan.get("actions", []) if a["action_type"] == "create_jira_ticket"), None)
+def _actions_by_type(plan: dict) -> dict[str, dict]:
+    """Index the plan's actions by action_type; executors look theirs up directly."""
+    return {a["action_type"]: a for a in plan.get("actions", [])}
+
+
+def _execute_jira(actions_by_type: dict[str, dict], packet: dict, incident_id: str, correlation_id: str,
+                  llm_content: dict | None = None, now_iso: str | None = None) -> dict:
+    created_at = now_iso or _now_iso()
+    jira_action = actions_by_type.get("create_jira_ticket")
     if not jira_action:
-        return _skipped_result("create_jira_ticket", "no jira action in plan", incident_id=incident_id)
+        return _skipped_result("create_jira_ticket", "no jira action in plan", created_at=created_at,
+                               incident_id=incident_id)
 
     action_id = uuid4().hex[:12]
-    created_at = _now_iso()
 
     if DRY_RUN:
-        client = DryRunJiraClient()
+        from jira_client import DryRunJiraClient
+        client = _cached_client("jira_dry_run", DryRunJiraClient)
     else:
-        client = _build_jira_client()
+        client = _cached_client("jira", _build_jira_client)
         if client is None:
             return _skipped_result("create_jira_ticket", "jira_not_configured", action_id, created_at, incident_id)
 
@@ -432,18 +726,21 @@ def _execute_jira(plan: dict, packet: dict, incident_id: str, correlation_id: st
         }
 
 
-def _execute_teams(plan: dict, packet: dict, jira_refs: dict, incident_id: str, correlation_id: str) -> dict:
-    teams_action = next((a for a in plan.get("actions", []) if a["action_type"] == "notify_teams"), None)
+def _execute_teams(actions_by_type: dict[str, dict], packet: dict, jira_refs: dict,
+                   incident_id: str, correlation_id: str, now_iso: str | None = None) -> dict:
+    created_at = now_iso or _now_iso()
+    teams_action = actions_by_type.get("notify_teams")
     if not teams_action:
-        return _skipped_result("notify_teams", "no teams action in plan", incident_id=incident_id)
+        return _skipped_result("notify_teams", "no teams action in plan", created_at=created_at,
+                               incident_id=incident_id)
 
     action_id = uuid4().hex[:12]
-    created_at = _now_iso()
 
     if DRY_RUN:
-        notifier = DryRunTeamsNotifier()
+        from teams_notifier import DryRunTeamsNotifier
+        notifier = _cached_client("teams_dry_run", DryRunTeamsNotifier)
     else:
-        notifier = _build_teams_notifier()
+        notifier = _cached_client("teams", _build_teams_notifier)
         if notifier is None:
             return _skipped_result("notify_teams", "teams_not_configured", action_id, created_at, incident_id)
 
@@ -490,15 +787,16 @@ def _execute_teams(plan: dict, packet: dict, jira_refs: dict, incident_id: str,
         }
 
 
-def _execute_github_pr(plan: dict, packet: dict, jira_refs: dict,
+def _execute_github_pr(actions_by_type: dict[str, dict], packet: dict, jira_refs: dict,
                        incident_id: str, correlation_id: str,
-                       llm_content: dict | None = None) -> dict:
-    gh_action = next((a for a in plan.get("actions", []) if a["action_type"] == "create_github_pr"), None)
+                       llm_content: dict | None = None, now_iso: str | None = None) -> dict:
+    created_at = now_iso or _now_iso()
+    gh_action = actions_by_type.get("create_github_pr")
     if not gh_action:
-        return _skipped_result("create_github_pr", "no github_pr action in plan", incident_id=incident_id)
+        return _skipped_result("create_github_pr", "no github_pr action in plan", created_at=created_at,
+                               incident_id=incident_id)
 
     action_id = uuid4().hex[:12]
-    created_at = _now_iso()
     collector_run_id = packet.get("collector_run_id", "")
 
     jira_key = jira_refs.get("jira_issue_key", "")
@@ -520,15 +818,17 @@ def _execute_github_pr(plan: dict, packet: dict, jira_refs: dict,
 
     try:
         if DRY_RUN:
-            client = DryRunGitHubClient(GITHUB_OWNER or "dry-run-owner")
+            from github_client import DryRunGitHubClient
+            client = _cached_client("github_dry_run", lambda: DryRunGitHubClient(GITHUB_OWNER or "dry-run-owner"))
         else:
-            client = _build_github_client()
+            client = _cached_client("github", _build_github_client)
             if client is None:
                 return _skipped_result("create_github_pr", "github_not_configured", action_id, created_at, incident_id)
     except Exception as e:
         return _skipped_result("create_github_pr", f"github_client_error: {e}", action_id, created_at, incident_id)
 
     # ── Deterministic repo resolution ─────────────────────────────
+    from repo_resolver import resolve_repo
     resolution = resolve_repo(
         packet=packet,
         checker=client,
@@ -629,7 +929,7 @@ def _execute_github_pr(plan: dict, packet: dict, jira_refs: dict,
 # ── Deterministic PR body template ───────────────────────────────
 
 def _build_deterministic_pr_body(packet: dict, jira_key: str, jira_url: str,
-                                 resolution: RepoResolution) -> str:
+                                 resolution: "RepoResolution") -> str:
     """Fixed backend-driven PR body template. No LLM-generated content."""
     incident_id = packet.get("incident_id", "N/A")
     service = packet.get("service", "N/A")
@@ -638,54 +938,59 @@ def _build_deterministic_pr_body(packet: dict, jira_key: str, jira_url: str,
     findings = packet.get("findings", [])
     erefs = packet.get("all_evidence_refs", [])
 
-    lines = [
-        "<!-- opsrunbook_copilot: true -->",
-        f"## Incident `{incident_id}`",
-        "",
-        f"| Field | Value |",
-        f"|-------|-------|",
-        f"| **Service** | {service} |",
-        f"| **Environment** | {environment} |",
-        f"| **Time Window** | {tw.get('start', 'N/A')} → {tw.get('end', 'N/A')} |",
-        f"| **Jira** | [{jira_key}]({jira_url}) |",
-        f"| **Repo Confidence** | {resolution.confidence:.0%} ({resolution.verification}) |",
-        "",
-    ]
-
+    findings_block = ""
     if findings:
-        lines.append(f"### {len(findings)} Finding(s)")
-        for f in findings[:5]:
-            conf = f.get("confidence", 0)
-            summary = f.get("summary", "")[:150]
-            refs_count = len(f.get("evidence_refs", []))
-            lines.append(f"- [{conf:.0%}] {summary} ({refs_count} evidence ref(s))")
-        lines.append("")
+        finding_lines = "\n".join(
+            f"- [{f.get('confidence', 0):.0%}] {f.get('summary', '')[:150]} "
+            f"({len(f.get('evidence_refs', []))} evidence ref(s))"
+            for f in findings[:5]
+        )
+        findings_block = f"### {len(findings)} Finding(s)\n{finding_lines}\n\n"
 
+    evidence_block = ""
     if erefs:
-        lines.append(f"### Evidence Summary")
-        lines.append(f"- **{len(erefs)}** evidence object(s) collected")
-        collector_types = sorted(set(e.get("collector_type", "?") for e in erefs))
-        lines.append(f"- Collector types: {', '.join(collector_types)}")
-        total_bytes = sum(e.get("byte_size", 0) for e in erefs)
-        lines.append(f"- Total evidence size: {total_bytes:,} bytes")
-        lines.append("")
-
-    lines.append("### Repo Resolution")
-    lines.append(f"- **Repo**: `{resolution.repo_full_name}`")
-    lines.append(f"- **Confidence**: {resolution.confidence:.0%}")
-    lines.append(f"- **Verification**: {resolution.verification}")
-    for reason in resolution.reasons:
-        lines.append(f"- {reason}")
-    if resolution.trace_frames:
-        lines.append(f"- **Trace frames**: {len(resolution.trace_frames)} app frame(s)")
-        for tf in resolution.trace_frames[:3]:
-            lines.append(f"  - `{tf.get('normalized_path', '')}:{tf.get('line', '?')}`")
-    lines.append("")
+        types: set[str] = set()
+        total_bytes = 0
+        for e in erefs:
+            types.add(e.get("collector_type", "?"))
+            total_bytes += e.get("byte_size", 0)
+        collector_types = sorted(types)
+        evidence_block = (
+            "### Evidence Summary\n"
+            f"- **{len(erefs)}** evidence object(s) collected\n"
+            f"- Collector types: {', '.join(collector_types)}\n"
+            f"- Total evidence size: {total_bytes:,} bytes\n\n"
+        )
 
-    lines.append("---")
-    lines.append("*Auto-generated by opsrunbook-copilot. Human review required before merge.*")
+    reasons_block = "".join(f"- {reason}\n" for reason in resolution.reasons)
+    trace_block = ""
+    if resolution.trace_frames:
+        trace_block = f"- **Trace frames**: {len(resolution.trace_frames)} app frame(s)\n" + "".join(
+            f"  - `{tf.get('normalized_path', '')}:{tf.get('line', '?')}`\n" for tf in resolution.trace_frames[:3]
+        )
 
-    return "\n".join(lines)
+    return (
+        "<!-- opsrunbook_copilot: true -->\n"
+        f"## Incident `{incident_id}`\n"
+        "\n"
+        "| Field | Value |\n"
+        "|-------|-------|\n"
+        f"| **Service** | {service} |\n"
+        f"| **Environment** | {environment} |\n"
+        f"| **Time Window** | {tw.get('start', 'N/A')} → {tw.get('end', 'N/A')} |\n"
+        f"| **Jira** | [{jira_key}]({jira_url}) |\n"
+        f"| **Repo Confidence** | {resolution.confidence:.0%} ({resolution.verification}) |\n"
+        "\n"
+        f"{findings_block}{evidence_block}"
+        "### Repo Resolution\n"
+        f"- **Repo**: `{resolution.repo_full_name}`\n"
+        f"- **Confidence**: {resolution.confidence:.0%}\n"
+        f"- **Verification**: {resolution.verification}\n"
+        f"{reasons_block}{trace_block}"
+        "\n"
+        "---\n"
+        "*Auto-generated by opsrunbook-copilot. Human review required before merge.*"
+    )
 
 
 def _skipped_result(action_type: str, error: str, action_id: str | None = None,
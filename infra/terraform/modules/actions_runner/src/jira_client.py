@@ -1,10 +1,27 @@
 """Jira Cloud REST API client for creating issues."""
 import json
 from typing import Any, Optional
-from urllib.request import Request, urlopen
-from urllib.error import URLError, HTTPError
 import base64
 
+import urllib3
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+# Module-level pool: keep-alive connections to Atlassian survive warm invocations.
+# POST is not in Retry's allowed methods, so only connect errors are retried
+# and an issue is never created twice.
+_POOL = urllib3.PoolManager(maxsize=4, retries=Retry(total=2, backoff_factor=0.2))
+
 
 class JiraClient:
     def __init__(self, base_url: str, email: str, api_token: str, project_key: str, issue_type: str = "Bug"):
@@ -12,6 +29,10 @@ class JiraClient:
         self._auth = base64.b64encode(f"{email}:{api_token}".encode()).decode()
         self._project_key = project_key
         self._issue_type = issue_type
+        self._headers = {
+            "Authorization": f"Basic {self._auth}",
+            "Content-Type": "application/json",
+        }
 
     def create_issue(
         self,
@@ -36,29 +57,23 @@ class JiraClient:
             payload["fields"]["labels"] = labels[:10]
 
         url = f"{self._base_url}/rest/api/2/issue"
-        body = json.dumps(payload).encode("utf-8")
-        req = Request(url, data=body, method="POST")
-        req.add_header("Authorization", f"Basic {self._auth}")
-        req.add_header("Content-Type", "application/json")
+        body = _dumps(payload)
 
         try:
-            with urlopen(req, timeout=15) as resp:
-                data = json.loads(resp.read().decode("utf-8"))
-                issue_key = data.get("key", "")
-                return {
-                    "issue_key": issue_key,
-                    "url": f"{self._base_url}/browse/{issue_key}",
-                    "id": data.get("id", ""),
-                }
-        except HTTPError as e:
-            error_body = ""
-            try:
-                error_body = e.read().decode("utf-8")[:500]
-            except Exception:
-                pass
-            raise RuntimeError(f"Jira API error {e.code}: {error_body}") from e
-        except URLError as e:
-            raise RuntimeError(f"Jira connection error: {e.reason}") from e
+            resp = _POOL.request("POST", url, body=body, headers=self._headers, timeout=15)
+        except urllib3.exceptions.HTTPError as e:
+            raise RuntimeError(f"Jira connection error: {e}") from e
+        if resp.status >= 400:
+            error_body = resp.data.decode("utf-8", errors="replace")[:500]
+            raise RuntimeError(f"Jira API error {resp.status}: {error_body}")
+
+        data = _loads(resp.data)
+        issue_key = data.get("key", "")
+        return {
+            "issue_key": issue_key,
+            "url": f"{self._base_url}/browse/{issue_key}",
+            "id": data.get("id", ""),
+        }
 
 
 class DryRunJiraClient:
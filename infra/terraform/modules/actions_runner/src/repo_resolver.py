@@ -11,19 +11,42 @@ and a verification status.
 """
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import os
 import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Protocol
+from typing import Protocol
 
-from trace_parser import extract_app_frames, TraceFrame
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+from trace_parser import MAX_APP_FRAMES, extract_app_frames, TraceFrame
 
 MAPPING_PATH = os.path.join(os.path.dirname(__file__), "repo_mapping.json")
 MAX_VERIFY_CALLS = 4
+# Probes in flight at once: the top candidate's paths. Later candidates'
+# probes only start as those finish, so a hit can still cancel them.
+VERIFY_WORKERS = 2
 
+_RE_LAMBDA_LG = re.compile(r'/aws/lambda/([\w-]+)')
+_RE_SIGNALS = re.compile(
+    r'/aws/lambda/(?P<lam>[\w-]+)|arn:aws:states:[^:]+:\d+:stateMachine:(?P<sm>[\w-]+)'
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class RepoResolution:
     repo_full_name: str
     confidence: float
@@ -41,46 +64,218 @@ class RepoResolution:
         }
 
 
-@dataclass
+_RULE_TYPES = ("prefix", "exact")
+
+
+def _never_matches(value: str) -> bool:
+    return False
+
+
+@dataclass(slots=True, frozen=True)
 class MappingRule:
     type: str       # "prefix" | "exact"
     signal: str     # "lambda_name" | "log_group" | "service_name" | "state_machine"
     pattern: str
     repo: str
+    _match: Callable[[str], bool] = field(init=False, repr=False, compare=False)
 
-    def matches(self, value: str) -> bool:
+    def __post_init__(self) -> None:
+        # Pick the comparison once so matches() is a single call
         if self.type == "exact":
-            return value == self.pattern
-        if self.type == "prefix":
-            return value.startswith(self.pattern)
-        return False
+            match = self.pattern.__eq__
+        elif self.type == "prefix":
+            match = lambda value, p=self.pattern: value.startswith(p)  # noqa: E731
+        else:
+            match = _never_matches
+        object.__setattr__(self, "_match", match)
+
+    def matches(self, value: str) -> bool:
+        return self._match(value)
+
+
+# Trie node key holding the index of the rule whose pattern ends there;
+# never a single character, so it cannot collide with a child key.
+_TERMINAL = ""
+
+
+@dataclass(slots=True, frozen=True)
+class CompiledRules:
+    """Mapping rules indexed per signal: a dict for exact patterns and a
+    character trie for prefix patterns. Both store the rule's position so
+    lookups keep first-match-wins ordering."""
+    rules: tuple[MappingRule, ...]
+    exact: dict[str, dict[str, int]]
+    prefix_trie: dict[str, dict]
+    first_prefix: int  # position of the first prefix rule; len(rules) if none
+
+    def first_match(self, signals: dict[str, list[str]]) -> MappingRule | None:
+        # Exact rules first: plain dict lookups. A hit that precedes every
+        # prefix rule cannot be beaten, so the trie walks are skipped.
+        best: int | None = None
+        for signal, values in signals.items():
+            exact = self.exact.get(signal)
+            if exact is None:
+                continue
+            for value in values:
+                idx = exact.get(value)
+                if idx is not None and (best is None or idx < best):
+                    best = idx
+        if best is not None and best < self.first_prefix:
+            return self.rules[best]
+
+        for signal, values in signals.items():
+            trie = self.prefix_trie.get(signal)
+            if trie is None:
+                continue
+            for value in values:
+                node = trie
+                pos = 0
+                while node is not None:
+                    idx = node.get(_TERMINAL)
+                    if idx is not None and (best is None or idx < best):
+                        best = idx
+                    if pos == len(value):
+                        break
+                    node = node.get(value[pos])
+                    pos += 1
+        return self.rules[best] if best is not None else None
+
+
+def compile_rules(rules: list[MappingRule] | tuple[MappingRule, ...]) -> CompiledRules:
+    exact: dict[str, dict[str, int]] = {}
+    prefix_trie: dict[str, dict] = {}
+    first_prefix = len(rules)
+    for idx, rule in enumerate(rules):
+        if rule.type == "exact":
+            exact.setdefault(rule.signal, {}).setdefault(rule.pattern, idx)
+        elif rule.type == "prefix":
+            first_prefix = min(first_prefix, idx)
+            node = prefix_trie.setdefault(rule.signal, {})
+            for ch in rule.pattern:
+                node = node.setdefault(ch, {})
+            node.setdefault(_TERMINAL, idx)
+    return CompiledRules(tuple(rules), exact, prefix_trie, first_prefix)
+
+
+# Compiled forms of rule tuples passed to resolve_repo, keyed by id. The
+# entry keeps the tuple alive, so its id cannot be reused while cached.
+# Lists are compiled per call since they may be mutated between calls.
+_COMPILED_CACHE: dict[int, tuple[tuple[MappingRule, ...], CompiledRules]] = {}
+_COMPILED_CACHE_MAX = 8
+
+
+def _compiled(rules: list[MappingRule] | tuple[MappingRule, ...] | CompiledRules) -> CompiledRules:
+    if isinstance(rules, CompiledRules):
+        return rules
+    if not isinstance(rules, tuple):
+        return compile_rules(rules)
+    hit = _COMPILED_CACHE.get(id(rules))
+    if hit is not None and hit[0] is rules:
+        return hit[1]
+    if len(_COMPILED_CACHE) >= _COMPILED_CACHE_MAX:
+        _COMPILED_CACHE.clear()
+    compiled = compile_rules(rules)
+    _COMPILED_CACHE[id(rules)] = (rules, compiled)
+    return compiled
 
 
 class FileChecker(Protocol):
     def file_exists(self, repo_full_name: str, path: str) -> bool: ...
 
 
-def load_mapping_rules(path: str | None = None) -> list[MappingRule]:
+class AsyncFileChecker(Protocol):
+    async def file_exists_async(self, repo_full_name: str, path: str) -> bool: ...
+
+
+class CachedFileChecker:
+    """LRU cache of file_exists answers (hits and misses) with a TTL, so a
+    repo reorganisation is picked up once entries expire."""
+
+    def __init__(self, inner: FileChecker, maxsize: int = 1024, ttl: float = 300.0):
+        self._inner = inner
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._cache: OrderedDict[tuple[str, str], tuple[float, bool]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def file_exists(self, repo_full_name: str, path: str) -> bool:
+        key = (repo_full_name, path)
+        now = time.monotonic()
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None and hit[0] > now:
+                self._cache.move_to_end(key)
+                return hit[1]
+        exists = self._inner.file_exists(repo_full_name, path)
+        with self._lock:
+            self._cache[key] = (now + self._ttl, exists)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._maxsize:
+                self._cache.popitem(last=False)
+        return exists
+
+
+# One CachedFileChecker per long-lived checker (e.g. the runner's cached
+# GitHub client). Entries keep the checker alive so ids stay unique.
+_CHECKER_CACHE: dict[int, tuple[FileChecker, CachedFileChecker]] = {}
+_CHECKER_CACHE_MAX = 8
+
+
+def _cached_checker(checker: FileChecker) -> CachedFileChecker:
+    if isinstance(checker, CachedFileChecker):
+        return checker
+    hit = _CHECKER_CACHE.get(id(checker))
+    if hit is not None and hit[0] is checker:
+        return hit[1]
+    if len(_CHECKER_CACHE) >= _CHECKER_CACHE_MAX:
+        _CHECKER_CACHE.clear()
+    cached = CachedFileChecker(checker)
+    _CHECKER_CACHE[id(checker)] = (checker, cached)
+    return cached
+
+
+def load_mapping_rules(path: str | None = None) -> tuple[MappingRule, ...]:
+    """Load mapping rules, reusing the parsed result while the file is unchanged.
+
+    The returned tuple is shared between callers and must not be mutated.
+    """
     path = path or MAPPING_PATH
-    if not os.path.exists(path):
-        return []
-    with open(path) as f:
-        data = json.load(f)
-    rules_raw = data.get("rules", [])
-    return [
-        MappingRule(
-            type=r.get("type", "prefix"),
-            signal=r.get("signal", ""),
-            pattern=r.get("pattern", ""),
-            repo=r.get("repo", ""),
-        )
-        for r in rules_raw
-        if r.get("repo")
-    ]
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return ()
+    return _load_mapping_rules_cached(path, mtime)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_mapping_rules_cached(path: str, mtime: float) -> tuple[MappingRule, ...]:
+    with open(path, "rb") as f:
+        data = _loads(f.read())
+    out: list[MappingRule] = []
+    for r in data.get("rules", []):
+        # Disabled (no repo) and unknown-type entries never become rules
+        repo = r.get("repo")
+        if not repo:
+            continue
+        rule_type = r.get("type", "prefix")
+        if rule_type not in _RULE_TYPES:
+            continue
+        out.append(MappingRule(
+            rule_type,
+            sys.intern(r.get("signal", "")),
+            sys.intern(r.get("pattern", "")),
+            sys.intern(repo),
+        ))
+    rules = tuple(out)
+    _compiled(rules)
+    return rules
 
 
 def _extract_signals(packet: dict) -> dict[str, list[str]]:
-    """Pull matchable signal values from a packet / evidence."""
+    """Pull matchable signal values from a packet / evidence.
+
+    Values are interned: the same names recur across findings and packets.
+    """
     signals: dict[str, list[str]] = {
         "service_name": [],
         "lambda_name": [],
@@ -90,7 +285,7 @@ def _extract_signals(packet: dict) -> dict[str, list[str]]:
 
     service = packet.get("service", "")
     if service:
-        signals["service_name"].append(service)
+        signals["service_name"].append(sys.intern(service))
 
     for eref in packet.get("all_evidence_refs", []):
         sk = eref.get("s3_key", "")
@@ -99,67 +294,101 @@ def _extract_signals(packet: dict) -> dict[str, list[str]]:
             parts = sk.split("/")
             for p in parts:
                 if p.startswith("opsrunbook") or p.startswith("billing") or p.startswith("spaces"):
-                    signals["lambda_name"].append(p)
-
-    # From findings text
-    for finding in packet.get("findings", []):
-        summary = finding.get("summary", "")
-        # Extract log group references
-        for m in re.finditer(r'/aws/lambda/([\w-]+)', summary):
-            signals["lambda_name"].append(m.group(1))
-            signals["log_group"].append(f"/aws/lambda/{m.group(1)}")
-        for m in re.finditer(r'arn:aws:states:[^:]+:\d+:stateMachine:([\w-]+)', summary):
-            signals["state_machine"].append(m.group(1))
+                    signals["lambda_name"].append(sys.intern(p))
+
+    # From findings text; one fused scan over all summaries
+    summaries = "\n".join(f.get("summary", "") for f in packet.get("findings", []))
+    for m in _RE_SIGNALS.finditer(summaries):
+        lam = m.group("lam")
+        if lam is not None:
+            signals["lambda_name"].append(sys.intern(lam))
+            signals["log_group"].append(sys.intern(f"/aws/lambda/{lam}"))
+        else:
+            signals["state_machine"].append(sys.intern(m.group("sm")))
 
     # From suspected_owners reasons
-    for owner in packet.get("suspected_owners", []):
-        for reason in owner.get("reasons", []):
-            for m in re.finditer(r'/aws/lambda/([\w-]+)', reason):
-                signals["log_group"].append(f"/aws/lambda/{m.group(1)}")
-                signals["lambda_name"].append(m.group(1))
+    reasons = "\n".join(
+        reason for owner in packet.get("suspected_owners", []) for reason in owner.get("reasons", [])
+    )
+    names = list(map(sys.intern, _RE_LAMBDA_LG.findall(reasons)))
+    signals["log_group"].extend(sys.intern(f"/aws/lambda/{n}") for n in names)
+    signals["lambda_name"].extend(names)
 
     return signals
 
 
 def _match_rules(
-    rules: list[MappingRule], signals: dict[str, list[str]],
+    rules: CompiledRules, signals: dict[str, list[str]],
 ) -> RepoResolution | None:
     """Check mapping rules against signals. First match wins."""
-    for rule in rules:
-        for value in signals.get(rule.signal, []):
-            if rule.matches(value):
-                return RepoResolution(
-                    repo_full_name=rule.repo,
-                    confidence=0.95,
-                    reasons=[f"mapping rule: {rule.type} {rule.signal}='{rule.pattern}' → {rule.repo}"],
-                    verification="mapping",
-                )
-    return None
+    rule = rules.first_match(signals)
+    if rule is None:
+        return None
+    return RepoResolution(
+        repo_full_name=rule.repo,
+        confidence=0.95,
+        reasons=[f"mapping rule: {rule.type} {rule.signal}='{rule.pattern}' → {rule.repo}"],
+        verification="mapping",
+    )
 
 
 def _verify_with_github(
     checker: FileChecker,
     candidates: list[str],
     trace_paths: list[str],
+    parallel: bool = True,
 ) -> tuple[str, list[str]] | None:
     """Try file_exists for top candidates × top paths (bounded).
 
+    With parallel, up to VERIFY_WORKERS probes run concurrently; the result
+    is still the first hit in candidate × path order, and probes that have
+    not started when it arrives are cancelled.
+
     Returns (repo_full_name, reasons) or None.
     """
-    calls = 0
-    for repo in candidates[:2]:
-        for path in trace_paths[:2]:
-            if calls >= MAX_VERIFY_CALLS:
-                return None
-            calls += 1
+    pairs = [(repo, path) for repo in candidates[:2] for path in trace_paths[:2]][:MAX_VERIFY_CALLS]
+    if not parallel or len(pairs) < 2:
+        for repo, path in pairs:
             if checker.file_exists(repo, path):
                 return repo, [f"verified: {path} exists in {repo}"]
-    return None
+        return None
+
+    pool = ThreadPoolExecutor(max_workers=min(VERIFY_WORKERS, len(pairs)))
+    try:
+        futures = [pool.submit(checker.file_exists, repo, path) for repo, path in pairs]
+        for (repo, path), future in zip(pairs, futures, strict=True):
+            if future.result():
+                return repo, [f"verified: {path} exists in {repo}"]
+        return None
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _verify_with_github_async(
+    checker: AsyncFileChecker,
+    candidates: list[str],
+    trace_paths: list[str],
+) -> tuple[str, list[str]] | None:
+    """_verify_with_github for callers inside an event loop.
+
+    All probes run concurrently as tasks; the first hit in candidate × path
+    order wins and the remaining probes are cancelled.
+    """
+    pairs = [(repo, path) for repo in candidates[:2] for path in trace_paths[:2]][:MAX_VERIFY_CALLS]
+    tasks = [asyncio.ensure_future(checker.file_exists_async(repo, path)) for repo, path in pairs]
+    try:
+        for (repo, path), task in zip(pairs, tasks, strict=True):
+            if await task:
+                return repo, [f"verified: {path} exists in {repo}"]
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
 def resolve_repo(
     packet: dict,
-    rules: list[MappingRule] | None = None,
+    rules: list[MappingRule] | tuple[MappingRule, ...] | CompiledRules | None = None,
     checker: FileChecker | None = None,
     owner: str = "",
     legacy_map: dict | None = None,
@@ -170,7 +399,7 @@ def resolve_repo(
     ----------
     packet : dict
         The IncidentPacket.
-    rules : list[MappingRule] | None
+    rules : list[MappingRule] | tuple[MappingRule, ...] | CompiledRules | None
         Loaded mapping rules. Will load from default file if None.
     checker : FileChecker | None
         GitHub file existence checker. Skips verification if None.
@@ -184,16 +413,26 @@ def resolve_repo(
 
     signals = _extract_signals(packet)
 
-    # Extract trace frames from findings
+    # Extract trace frames from findings: summaries first, and notes (often
+    # large log dumps) only while fewer than MAX_APP_FRAMES were found
     all_frames: list[TraceFrame] = []
-    for finding in packet.get("findings", []):
-        text = finding.get("summary", "") + "\n" + finding.get("notes", "")
-        all_frames.extend(extract_app_frames(text))
-
-    frame_dicts = [f.to_dict() for f in all_frames[:5]]
+    seen_frames: set[tuple[str, int | None]] = set()
+    findings = packet.get("findings", [])
+    for field_name in ("summary", "notes"):
+        for finding in findings:
+            if len(all_frames) >= MAX_APP_FRAMES:
+                break
+            for frame in extract_app_frames(finding.get(field_name, "")):
+                key = (frame.normalized_path, frame.line)
+                if key not in seen_frames:
+                    seen_frames.add(key)
+                    all_frames.append(frame)
+    del all_frames[MAX_APP_FRAMES:]
+
+    frame_dicts = [f.to_dict() for f in all_frames]
 
     # ── Priority 1: mapping rules ────────────────────────────────
-    mapping_result = _match_rules(rules, signals)
+    mapping_result = _match_rules(_compiled(rules), signals)
     if mapping_result:
         mapping_result.trace_frames = frame_dicts
         return mapping_result
@@ -202,12 +441,14 @@ def resolve_repo(
     trace_paths = [f.normalized_path for f in all_frames if f.normalized_path]
 
     heuristic_repos: list[str] = []
+    seen_repos: set[str] = set()
     # From suspected_owners
     for owner_entry in packet.get("suspected_owners", []):
         repo = owner_entry.get("repo", "")
         if repo and owner:
-            full = f"{owner}/{repo}" if "/" not in repo else repo
-            if full not in heuristic_repos:
+            full = sys.intern(f"{owner}/{repo}" if "/" not in repo else repo)
+            if full not in seen_repos:
+                seen_repos.add(full)
                 heuristic_repos.append(full)
 
     # From legacy map
@@ -215,12 +456,13 @@ def resolve_repo(
         service = packet.get("service", "")
         mapped = legacy_map.get(service, "")
         if mapped and owner:
-            full = f"{owner}/{mapped}" if "/" not in mapped else mapped
-            if full not in heuristic_repos:
+            full = sys.intern(f"{owner}/{mapped}" if "/" not in mapped else mapped)
+            if full not in seen_repos:
+                seen_repos.add(full)
                 heuristic_repos.insert(0, full)
 
     if checker and trace_paths and heuristic_repos:
-        verified = _verify_with_github(checker, heuristic_repos, trace_paths)
+        verified = _verify_with_github(_cached_checker(checker), heuristic_repos, trace_paths)
         if verified:
             repo_name, reasons = verified
             return RepoResolution(
@@ -1,19 +1,46 @@
 """MS Teams incoming webhook notifier."""
+import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
-from urllib.request import Request, urlopen
-from urllib.error import URLError, HTTPError
+from urllib.parse import urlsplit
+
+import urllib3
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+except ImportError:
+    _encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+    def _dumps(obj: Any) -> bytes:
+        return _encode(obj).encode("utf-8")
+
+_CARD_TEMPLATE = {
+    "@type": "MessageCard",
+    "@context": "http://schema.org/extensions",
+    "themeColor": "d63384",
+}
+_HEADERS = {"Content-Type": "application/json"}
 
 
 class TeamsNotifier:
     def __init__(self, webhook_url: str):
         self._webhook_url = webhook_url
+        parts = urlsplit(webhook_url)
+        self._path = parts.path + (f"?{parts.query}" if parts.query else "")
+        # One keep-alive pool per webhook host, so repeated sends reuse the
+        # TLS connection. POST is not retried on read errors, only on connect
+        # errors, so a message is never posted twice.
+        self._pool = urllib3.connection_from_url(
+            webhook_url, maxsize=4, retries=Retry(total=2, backoff_factor=0.2),
+        )
 
     def send_message(self, title: str, body_md: str, links: Optional[list[dict]] = None) -> dict[str, Any]:
         card = {
-            "@type": "MessageCard",
-            "@context": "http://schema.org/extensions",
-            "themeColor": "d63384",
+            **_CARD_TEMPLATE,
             "summary": title[:200],
             "sections": [{
                 "activityTitle": title,
@@ -27,18 +54,35 @@ class TeamsNotifier:
                 for lnk in links[:5]
             ]
 
-        payload = json.dumps(card).encode("utf-8")
-        req = Request(self._webhook_url, data=payload, method="POST")
-        req.add_header("Content-Type", "application/json")
-
+        payload = _dumps(card)
         try:
-            with urlopen(req, timeout=10) as resp:
-                resp_text = resp.read().decode("utf-8")[:200]
-                return {"status_code": resp.status, "response": resp_text}
-        except HTTPError as e:
-            raise RuntimeError(f"Teams webhook error {e.code}") from e
-        except URLError as e:
+            resp = self._pool.urlopen("POST", self._path, body=payload, headers=_HEADERS, timeout=10)
+        except urllib3.exceptions.MaxRetryError as e:
             raise RuntimeError(f"Teams connection error: {e.reason}") from e
+        except urllib3.exceptions.HTTPError as e:
+            raise RuntimeError(f"Teams connection error: {e}") from e
+        if resp.status >= 400:
+            raise RuntimeError(f"Teams webhook error {resp.status}")
+        return {"status_code": resp.status, "response": resp.data.decode("utf-8", "replace")[:200]}
+
+    async def send_message_async(
+        self, title: str, body_md: str, links: Optional[list[dict]] = None,
+    ) -> dict[str, Any]:
+        """send_message for callers inside an event loop; runs on a worker thread
+        over the same connection pool."""
+        return await asyncio.to_thread(self.send_message, title, body_md, links)
+
+    def send_many(
+        self, messages: list[tuple[str, str, Optional[list[dict]]]], max_workers: int = 4,
+    ) -> list[dict[str, Any]]:
+        """Send (title, body_md, links) messages concurrently over the shared pool.
+
+        Results are in input order; the first failure is raised.
+        """
+        if len(messages) < 2:
+            return [self.send_message(*m) for m in messages]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(messages))) as pool:
+            return list(pool.map(lambda m: self.send_message(*m), messages))
 
 
 class DryRunTeamsNotifier:
@@ -54,3 +98,13 @@ class DryRunTeamsNotifier:
             "response": "DRYRUN-OK",
             "message_id": f"dryrun-teams-{self._counter}",
         }
+
+    async def send_message_async(
+        self, title: str, body_md: str, links: Optional[list[dict]] = None,
+    ) -> dict[str, Any]:
+        return self.send_message(title, body_md, links)
+
+    def send_many(
+        self, messages: list[tuple[str, str, Optional[list[dict]]]], max_workers: int = 4,
+    ) -> list[dict[str, Any]]:
+        return [self.send_message(*m) for m in messages]
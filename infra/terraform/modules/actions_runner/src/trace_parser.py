@@ -9,37 +9,32 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
+from itertools import islice
+from typing import Iterator
 
 # ── Runtime path prefixes to strip ────────────────────────────────
-_STRIP_PREFIXES = [
+# Longest first: "/opt/python/" must win over "/opt/".
+_STR_PREFIXES = (
     "/var/task/",
     "/usr/src/app/",
     "/app/",
     "/opt/python/",
     "/opt/",
-    re.compile(r"/home/runner/work/[^/]+/[^/]+/"),
-    re.compile(r"/tmp/[a-f0-9-]+/"),
-]
+)
+# Only run when the cheap literal anchor matches
+_RE_RUNNER = re.compile(r"^/home/runner/work/[^/]+/[^/]+/")
+_RE_TMP = re.compile(r"^/tmp/[a-f0-9-]+/")
 
 # ── Noise path patterns to ignore ────────────────────────────────
-_NOISE_PATTERNS = [
-    re.compile(r"site-packages/"),
-    re.compile(r"node_modules/"),
-    re.compile(r"\.venv/"),
-    re.compile(r"dist-packages/"),
-    re.compile(r"<frozen "),
-    re.compile(r"<string>"),
-    re.compile(r"<module>"),
-    re.compile(r"importlib"),
-    re.compile(r"_bootstrap"),
-    re.compile(r"__pycache__"),
-    re.compile(r"lib/python\d"),
-]
+_NOISE_RE = re.compile(
+    r"(?:site-packages/|node_modules/|\.venv/|dist-packages/|<frozen |<string>"
+    r"|<module>|importlib|_bootstrap|__pycache__|lib/python\d)"
+)
 
 MAX_APP_FRAMES = 5
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TraceFrame:
     raw_path: str
     normalized_path: str
@@ -60,12 +55,12 @@ class TraceFrame:
 def normalize_path(raw: str) -> str:
     """Strip runtime prefixes from a file path."""
     result = raw.strip()
-    for prefix in _STRIP_PREFIXES:
-        if isinstance(prefix, str):
-            if result.startswith(prefix):
-                result = result[len(prefix):]
-        else:
-            result = prefix.sub("", result, count=1)
+    if result.startswith(_STR_PREFIXES):
+        result = result[len(next(p for p in _STR_PREFIXES if result.startswith(p))):]
+    if result.startswith("/home/runner/work/"):
+        result = _RE_RUNNER.sub("", result, count=1)
+    elif result.startswith("/tmp/"):
+        result = _RE_TMP.sub("", result, count=1)
     # Remove leading ./
     if result.startswith("./"):
         result = result[2:]
@@ -73,23 +68,16 @@ def normalize_path(raw: str) -> str:
 
 
 def _is_noise(path: str) -> bool:
-    for pattern in _NOISE_PATTERNS:
-        if pattern.search(path):
-            return True
-    return False
+    return _NOISE_RE.search(path) is not None
 
 
-# ── Python trace patterns ─────────────────────────────────────────
+# ── Python and Node.js trace patterns, fused into one scan ────────
 # File "/var/task/handler.py", line 42, in lambda_handler
-_PY_FRAME = re.compile(
-    r'File "([^"]+)",\s+line (\d+)(?:,\s+in (\S+))?'
-)
-
-# ── Node.js trace patterns ────────────────────────────────────────
 # at functionName (/path/to/file.js:10:5)
 # at /path/to/file.js:10:5
-_NODE_FRAME = re.compile(
-    r'at\s+(?:(\S+)\s+)?\(?([^():]+):(\d+):(\d+)\)?'
+_FRAME_RE = re.compile(
+    r'(?P<py>File "(?P<py_path>[^"]+)",\s+line (?P<py_line>\d+)(?:,\s+in (?P<py_fn>\S+))?)'
+    r'|(?P<node>at\s+(?:(?P<node_fn>\S+)\s+)?\(?(?P<node_path>[^():]+):(?P<node_line>\d+):(?P<node_col>\d+)\)?)'
 )
 
 # ── Generic path:line ─────────────────────────────────────────────
@@ -98,59 +86,55 @@ _GENERIC_PATHLINE = re.compile(
 )
 
 
-def parse_frames(text: str) -> list[TraceFrame]:
-    """Extract all trace frames from text containing stacktrace output."""
-    frames: list[TraceFrame] = []
-    seen_paths: set[str] = set()
+# (raw_path, normalized_path, line, column, function), in TraceFrame field order
+_FrameFields = tuple[str, str, int, int | None, str]
 
-    # Python frames
-    for m in _PY_FRAME.finditer(text):
-        raw = m.group(1)
-        norm = normalize_path(raw)
-        key = f"{norm}:{m.group(2)}"
-        if key not in seen_paths:
-            seen_paths.add(key)
-            frames.append(TraceFrame(
-                raw_path=raw,
-                normalized_path=norm,
-                line=int(m.group(2)),
-                function=m.group(3) or "",
-            ))
-
-    # Node frames
-    for m in _NODE_FRAME.finditer(text):
-        raw = m.group(2)
+
+def _iter_frames(text: str) -> Iterator[_FrameFields]:
+    """Yield deduplicated frame fields lazily, so callers can stop scanning
+    early and only build TraceFrame objects for the frames they keep."""
+    seen: set[tuple[str, str]] = set()
+    found = False
+
+    for m in _FRAME_RE.finditer(text):
+        found = True
+        if m.group("py") is not None:
+            raw, line = m.group("py_path"), m.group("py_line")
+            column, function = None, m.group("py_fn")
+        else:
+            raw, line = m.group("node_path"), m.group("node_line")
+            column, function = int(m.group("node_col")), m.group("node_fn")
         norm = normalize_path(raw)
-        key = f"{norm}:{m.group(3)}"
-        if key not in seen_paths:
-            seen_paths.add(key)
-            frames.append(TraceFrame(
-                raw_path=raw,
-                normalized_path=norm,
-                line=int(m.group(3)),
-                column=int(m.group(4)),
-                function=m.group(1) or "",
-            ))
+        key = (norm, line)
+        if key not in seen:
+            seen.add(key)
+            yield raw, norm, int(line), column, function or ""
 
     # Generic fallback for path:line patterns
-    if not frames:
+    if not found:
         for m in _GENERIC_PATHLINE.finditer(text):
-            raw = m.group(1)
+            raw, line = m.group(1), m.group(2)
             norm = normalize_path(raw)
-            key = f"{norm}:{m.group(2)}"
-            if key not in seen_paths:
-                seen_paths.add(key)
-                frames.append(TraceFrame(
-                    raw_path=raw,
-                    normalized_path=norm,
-                    line=int(m.group(2)),
-                ))
+            key = (norm, line)
+            if key not in seen:
+                seen.add(key)
+                yield raw, norm, int(line), None, ""
+
+
+def parse_frames(text: str, limit: int | None = None) -> list[TraceFrame]:
+    """Extract trace frames (at most limit) from text containing stacktrace output.
 
-    return frames
+    Python and Node frames are returned in the order they appear in text.
+    """
+    return [TraceFrame(*fields) for fields in islice(_iter_frames(text), limit)]
 
 
 def extract_app_frames(text: str) -> list[TraceFrame]:
-    """Parse frames, filter noise, return top N application frames."""
-    all_frames = parse_frames(text)
-    app_frames = [f for f in all_frames if not _is_noise(f.normalized_path)]
-    return app_frames[:MAX_APP_FRAMES]
+    """Parse frames, filter noise, return top N application frames.
+
+    Scanning stops as soon as N application frames are found, so a large
+    log dump is only read up to its Nth application frame. Noise frames
+    are dropped on the path string without building a TraceFrame.
+    """
+    app_fields = (f for f in _iter_frames(text) if not _is_noise(f[1]))
+    return [TraceFrame(*fields) for fields in islice(app_fields, MAX_APP_FRAMES)]
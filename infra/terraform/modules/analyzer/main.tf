@@ -102,6 +102,8 @@ resource "aws_iam_role_policy" "analyzer_policy" {
           "dynamodb:PutItem",
           "dynamodb:GetItem",
           "dynamodb:Query",
+          "dynamodb:DeleteItem",
+          "dynamodb:BatchWriteItem",
         ]
         Resource = var.packets_table_arn
       },
@@ -6,15 +6,26 @@ Loads evidence snapshot manifest + collector evidence objects from S3,
 runs analysis (LLM or stub), produces IncidentPacketV1, persists to S3 + DynamoDB,
 emits incident.analyzed event.
 """
+import gzip
 import hashlib
 import json
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from itertools import chain, islice
 from typing import Any, Optional
 
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 
-s3 = boto3.client("s3")
+MAX_EVIDENCE_WORKERS = 16
+
+# Pool sized for the concurrent evidence GETs; the default of 10 would
+# serialize a larger fan-out on connection checkout.
+s3 = boto3.client("s3", config=Config(max_pool_connections=MAX_EVIDENCE_WORKERS))
 dynamodb = boto3.resource("dynamodb")
 events_client = boto3.client("events")
 
@@ -24,6 +35,20 @@ PACKETS_TABLE = os.environ["PACKETS_TABLE"]
 EVENT_BUS_NAME = os.environ.get("EVENT_BUS_NAME", "")
 EVENT_SOURCE = "opsrunbook-copilot"
 MAX_EVIDENCE_CHARS = 80_000
+# A run claim lasts until the claiming invocation's deadline plus this
+# margin. A timed-out attempt never reaches _release_run, so the lease must
+# lapse before Lambda's first async retry (about a minute later).
+RUN_LEASE_MARGIN_SECONDS = 10
+# Deadline assumed when no Lambda context is available (the function timeout)
+RUN_LEASE_DEFAULT_SECONDS = 120
+
+# Built once per container rather than per invocation
+_TABLE = dynamodb.Table(PACKETS_TABLE)
+# Low-level client for the packet write, which skips the resource layer's
+# TypeSerializer pass over the item
+_DDB_CLIENT = dynamodb.meta.client
+_BATCH_WRITE_LIMIT = 25
+_BATCH_WRITE_ATTEMPTS = 4
 
 RESOURCE_REPO_MAP: dict[str, str] = {}
 try:
@@ -34,16 +59,104 @@ try:
 except Exception:
     pass
 
+# Prefixes lowered once at load rather than per resource name
+_RESOURCE_REPO_LOWER: tuple[tuple[str, str, str], ...] = tuple(
+    (prefix.lower(), prefix, repo) for prefix, repo in RESOURCE_REPO_MAP.items()
+)
+
+# pyahocorasick, when bundled, finds every matching prefix in one pass over a
+# name. An empty prefix matches everything and can't be added as a word, so
+# such a map stays on the linear scan.
+_AC = None
+try:
+    import ahocorasick
+
+    if _RESOURCE_REPO_LOWER and all(pl for pl, _, _ in _RESOURCE_REPO_LOWER):
+        _AC = ahocorasick.Automaton()
+        for _pl, _prefix, _repo in _RESOURCE_REPO_LOWER:
+            # Prefixes differing only in case share one word
+            if _pl in _AC:
+                _AC.get(_pl).append((_prefix, _repo))
+            else:
+                _AC.add_word(_pl, [(_prefix, _repo)])
+        _AC.make_automaton()
+except ImportError:
+    pass
+
+
+# orjson when bundled: C-level encoding straight to UTF-8 bytes. Both paths
+# produce the same compact, key-sorted output, so packet hashes don't depend
+# on which one is installed.
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _TO_BYTES_OPTS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+    def _to_bytes(payload: dict) -> bytes:
+        return orjson.dumps(payload, default=str, option=_TO_BYTES_OPTS)
+
+    def _dumps_str(obj: Any) -> str:
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:
+    _loads = json.loads
+    _ENCODER = json.JSONEncoder(
+        ensure_ascii=False, separators=(",", ":"), sort_keys=True, default=str
+    )
 
-def _to_bytes(payload: dict) -> bytes:
-    return json.dumps(
-        payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True, default=str
-    ).encode("utf-8")
+    def _to_bytes(payload: dict) -> bytes:
+        return _ENCODER.encode(payload).encode("utf-8")
+
+    def _dumps_str(obj: Any) -> str:
+        return json.dumps(obj, default=str)
 
 
 def _load_json(bucket: str, key: str) -> dict:
     resp = s3.get_object(Bucket=bucket, Key=key)
-    return json.loads(resp["Body"].read().decode("utf-8"))
+    body = resp["Body"].read()
+    # Collector evidence is stored gzipped; boto3 does not undo Content-Encoding
+    if resp.get("ContentEncoding") == "gzip":
+        body = gzip.decompress(body)
+    # Both decoders take the raw bytes, so no intermediate str copy
+    return _loads(body)
+
+
+def _to_av(value: Any) -> dict:
+    """DynamoDB wire-format AttributeValue for the scalar types we persist."""
+    if isinstance(value, str):
+        return {"S": value}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, (int, float)):
+        return {"N": str(value)}
+    if value is None:
+        return {"NULL": True}
+    raise TypeError(f"Unsupported attribute type: {type(value).__name__}")
+
+
+def _put_packet_items(items: list[dict]) -> None:
+    """Write packet-table rows: one PutItem for a single row, chunked BatchWriteItem for more."""
+    if len(items) == 1:
+        _DDB_CLIENT.put_item(
+            TableName=PACKETS_TABLE,
+            Item={k: _to_av(v) for k, v in items[0].items()},
+            ReturnValues="NONE",
+            ReturnConsumedCapacity="NONE",
+        )
+        return
+    for start in range(0, len(items), _BATCH_WRITE_LIMIT):
+        chunk = items[start:start + _BATCH_WRITE_LIMIT]
+        request = {PACKETS_TABLE: [
+            {"PutRequest": {"Item": {k: _to_av(v) for k, v in item.items()}}} for item in chunk
+        ]}
+        for attempt in range(_BATCH_WRITE_ATTEMPTS):
+            request = _DDB_CLIENT.batch_write_item(RequestItems=request).get("UnprocessedItems") or {}
+            if not request:
+                break
+            time.sleep(0.05 * 2 ** attempt)
+        if request:
+            unprocessed = sum(len(reqs) for reqs in request.values())
+            raise RuntimeError(f"batch_write_item left {unprocessed} unprocessed item(s)")
 
 
 def _now_iso() -> str:
@@ -54,20 +167,6 @@ def _now_iso() -> str:
 # Stub analyzer
 # ---------------------------------------------------------------------------
 
-def _make_evidence_ref(collector: dict) -> Optional[dict]:
-    ref = collector.get("evidence_ref")
-    if not ref or not isinstance(ref, dict) or not ref.get("s3_key"):
-        return None
-    return {
-        "collector_type": ref.get("collector_type", collector.get("collector_type", "unknown")),
-        "s3_bucket": ref.get("s3_bucket", ""),
-        "s3_key": ref.get("s3_key", ""),
-        "sha256": ref.get("sha256", ""),
-        "byte_size": ref.get("byte_size", 0),
-        "truncated": ref.get("truncated", False),
-    }
-
-
 def _analyze_logs(evidence: dict, eref: dict) -> tuple[list[dict], list[dict], list[dict], list[str]]:
     findings, hypotheses, actions, limits = [], [], [], []
     sections = evidence.get("sections", [])
@@ -109,16 +208,16 @@ def _analyze_logs(evidence: dict, eref: dict) -> tuple[list[dict], list[dict], l
 
 def _analyze_metrics(evidence: dict, eref: dict) -> tuple[list[dict], list[dict], list[dict], list[str]]:
     findings, hypotheses, actions, limits = [], [], [], []
-    series = evidence.get("series", [])
-    sections = evidence.get("sections", [])
-    if sections:
-        for sec in sections:
-            series.extend(sec.get("series", []))
+    # Counted in place; extending evidence["series"] would mutate the loaded
+    # evidence and double-count on a second pass
+    n_series = len(evidence.get("series", [])) + sum(
+        len(sec.get("series", [])) for sec in evidence.get("sections", [])
+    )
 
-    if series:
+    if n_series:
         findings.append({
             "id": "metrics-collected",
-            "summary": f"Collected {len(series)} metric series. Stub mode — no anomaly detection.",
+            "summary": f"Collected {n_series} metric series. Stub mode — no anomaly detection.",
             "confidence": 0.4,
             "evidence_refs": [eref],
         })
@@ -234,11 +333,12 @@ def _format_evidence_for_prompt(
 
     if "metrics" in evidence_objects:
         metrics = evidence_objects["metrics"]
-        all_series = metrics.get("series", [])
-        for sec in metrics.get("sections", []):
-            all_series.extend(sec.get("series", []))
+        all_series = chain(
+            metrics.get("series", []),
+            chain.from_iterable(sec.get("series", []) for sec in metrics.get("sections", [])),
+        )
         parts.append("## Metric Evidence")
-        for s in all_series[:15]:
+        for s in islice(all_series, 15):
             summary = s.get("summary", {})
             parts.append(
                 f"  {s.get('label', '?')} (stat={s.get('stat', '?')}, "
@@ -384,6 +484,19 @@ def _analyze_with_llm(
 # Repo candidates resolver
 # ---------------------------------------------------------------------------
 
+# Tail tokens pulled out in one match instead of split() chains:
+# /aws/lambda/<fn> (three or more segments), the last ARN field up to any
+# "/", and the last ARN field as is.
+_LG_TAIL = re.compile(r"\A/*[^/]+/.*/([^/]+)/*\Z", re.S)
+_ARN_TAIL = re.compile(r":([^:/]*)[^:]*\Z")
+_ARN_LAST = re.compile(r":([^:]*)\Z")
+
+
+def _tail(pattern: re.Pattern, value: str) -> Optional[str]:
+    m = pattern.search(value)
+    return m.group(1) if m else None
+
+
 def _resolve_repo_candidates(manifest: dict, evidence_objects: dict) -> list[dict]:
     resource_names: set[str] = set()
 
@@ -396,29 +509,33 @@ def _resolve_repo_candidates(manifest: dict, evidence_objects: dict) -> list[dic
     for _ctype, evidence in evidence_objects.items():
         for lg in evidence.get("log_groups", []):
             # /aws/lambda/<function_name>
-            parts = lg.strip("/").split("/")
-            if len(parts) >= 3:
-                resource_names.add(parts[-1])
+            name = _tail(_LG_TAIL, lg)
+            if name is not None:
+                resource_names.add(name)
         for sec in evidence.get("sections", []):
             for arn_field in ("state_machine_arn", "execution_arn"):
-                v = sec.get(arn_field, "")
-                if v and ":" in v:
-                    resource_names.add(v.split(":")[-1].split("/")[0])
+                name = _tail(_ARN_TAIL, sec.get(arn_field) or "")
+                if name is not None:
+                    resource_names.add(name)
             for sm in sec.get("state_machine_arns", []):
-                if sm and ":" in sm:
-                    resource_names.add(sm.split(":")[-1])
+                name = _tail(_ARN_LAST, sm or "")
+                if name is not None:
+                    resource_names.add(name)
             for ex in sec.get("executions", []):
                 for arn_field in ("execution_arn", "state_machine_arn"):
-                    v = ex.get(arn_field, "")
-                    if v and ":" in v:
-                        resource_names.add(v.split(":")[-1].split("/")[0])
+                    name = _tail(_ARN_TAIL, ex.get(arn_field) or "")
+                    if name is not None:
+                        resource_names.add(name)
 
     candidates: dict[str, set[str]] = {}
     for rname in resource_names:
         rname_lower = rname.lower()
-        for prefix, repo in RESOURCE_REPO_MAP.items():
-            if prefix.lower() in rname_lower:
-                candidates.setdefault(repo, set()).add(f"resource '{rname}' matches prefix '{prefix}'")
+        if _AC is not None:
+            hits = (hit for _end, entries in _AC.iter(rname_lower) for hit in entries)
+        else:
+            hits = ((prefix, repo) for pl, prefix, repo in _RESOURCE_REPO_LOWER if pl in rname_lower)
+        for prefix, repo in hits:
+            candidates.setdefault(repo, set()).add(f"resource '{rname}' matches prefix '{prefix}'")
 
     owners = []
     for repo, reasons in candidates.items():
@@ -440,10 +557,108 @@ def _resolve_repo_candidates(manifest: dict, evidence_objects: dict) -> list[dic
 # Lambda handler
 # ---------------------------------------------------------------------------
 
+def _emit_analyzed(detail: dict) -> None:
+    """Emit incident.analyzed; failures are logged, not raised."""
+    try:
+        events_client.put_events(Entries=[{
+            "Source": EVENT_SOURCE,
+            "DetailType": "incident.analyzed",
+            "Detail": _dumps_str(detail),
+            "EventBusName": EVENT_BUS_NAME,
+        }])
+    except Exception as e:
+        print(json.dumps({"msg": "eventbridge_emit_failed", "error": str(e)[:300]}))
+
+
+def _lease_seconds(context: Any) -> int:
+    """Seconds a claim must last: this invocation's remaining time plus a margin."""
+    if context is None:
+        return RUN_LEASE_DEFAULT_SECONDS + RUN_LEASE_MARGIN_SECONDS
+    return context.get_remaining_time_in_millis() // 1000 + 1 + RUN_LEASE_MARGIN_SECONDS
+
+
+def _claim_run(table: Any, incident_id: str, collector_run_id: str,
+               lease_seconds: int = RUN_LEASE_DEFAULT_SECONDS + RUN_LEASE_MARGIN_SECONDS) -> bool:
+    """Claim the run with a conditional put on its RUN# marker item.
+
+    Returns False if another invocation holds a live claim. The lease ends
+    shortly after the claiming invocation's deadline; an expired claim is
+    only taken over after checking that the earlier invocation did not
+    already write its packet.
+    """
+    now = int(time.time())
+    try:
+        resp = table.put_item(
+            Item={
+                "pk": f"INCIDENT#{incident_id}",
+                "sk": f"RUN#{collector_run_id}",
+                "collector_run_id": collector_run_id,
+                "lease_expires_at": now + lease_seconds,
+            },
+            ConditionExpression="attribute_not_exists(sk) OR lease_expires_at < :now",
+            ExpressionAttributeValues={":now": now},
+            ReturnValues="ALL_OLD",
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            return False
+        raise
+    if not resp.get("Attributes"):
+        return True
+
+    # Taking over an expired claim: FilterExpression applies after the page
+    # is read, so every page is checked rather than using Limit=1. Only the
+    # match count is needed, so no item attributes come back.
+    kwargs: dict[str, Any] = {
+        "KeyConditionExpression": "pk = :pk AND begins_with(sk, :prefix)",
+        "FilterExpression": "collector_run_id = :rid",
+        "Select": "COUNT",
+        "ExpressionAttributeValues": {
+            ":pk": f"INCIDENT#{incident_id}",
+            ":prefix": "PACKET#",
+            ":rid": collector_run_id,
+        },
+    }
+    while True:
+        page = table.query(**kwargs)
+        if page.get("Count"):
+            return False
+        if "LastEvaluatedKey" not in page:
+            return True
+        kwargs["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+
+
+def _release_run(table: Any, incident_id: str, collector_run_id: str) -> None:
+    """Drop the RUN# marker after a failed attempt so a retry can claim it."""
+    try:
+        table.delete_item(Key={"pk": f"INCIDENT#{incident_id}", "sk": f"RUN#{collector_run_id}"})
+    except Exception as e:
+        print(json.dumps({"msg": "run_release_failed", "incident_id": incident_id, "error": str(e)[:300]}))
+
+
 def lambda_handler(event: dict, context: Any) -> dict:
     detail = event.get("detail", event)
     incident_id = detail["incident_id"]
     collector_run_id = detail["collector_run_id"]
+
+    print(json.dumps({"msg": "analyzer_start", "incident_id": incident_id, "collector_run_id": collector_run_id}))
+
+    # Idempotency: one conditional write claims the run before any work
+    table = _TABLE
+    if not _claim_run(table, incident_id, collector_run_id, _lease_seconds(context)):
+        print(json.dumps({"msg": "analyzer_idempotent_skip", "incident_id": incident_id}))
+        return {"ok": True, "skipped": True, "incident_id": incident_id}
+
+    try:
+        return _analyze_run(detail)
+    except Exception:
+        _release_run(table, incident_id, collector_run_id)
+        raise
+
+
+def _analyze_run(detail: dict) -> dict:
+    incident_id = detail["incident_id"]
+    collector_run_id = detail["collector_run_id"]
     evidence_bucket = detail["evidence_bucket"]
     evidence_key = detail["evidence_key"]
     evidence_sha256 = detail.get("evidence_sha256", "")
@@ -451,42 +666,43 @@ def lambda_handler(event: dict, context: Any) -> dict:
     environment = detail.get("environment", "dev")
     time_window = detail.get("time_window", {})
 
-    print(json.dumps({"msg": "analyzer_start", "incident_id": incident_id, "collector_run_id": collector_run_id}))
-
-    # Idempotency: check if packet already exists
-    table = dynamodb.Table(PACKETS_TABLE)
-    existing = table.query(
-        KeyConditionExpression="pk = :pk AND begins_with(sk, :prefix)",
-        FilterExpression="collector_run_id = :rid",
-        ExpressionAttributeValues={
-            ":pk": f"INCIDENT#{incident_id}",
-            ":prefix": "PACKET#",
-            ":rid": collector_run_id,
-        },
-        Limit=1,
-    )
-    if existing.get("Items"):
-        print(json.dumps({"msg": "analyzer_idempotent_skip", "incident_id": incident_id}))
-        return {"ok": True, "skipped": True, "incident_id": incident_id}
-
     # Load manifest
     manifest = _load_json(evidence_bucket, evidence_key)
 
-    # Load each collector evidence
+    # Load each collector evidence; the GETs are independent, so fan them out
     collectors = manifest.get("collectors", [])
     evidence_objects: dict[str, dict] = {}
     all_evidence_refs: list[dict] = []
+    # First ref per collector type, as the old per-branch scans returned
+    eref_by_type: dict[str, dict] = {}
+    to_load: list[tuple[str, str, str]] = []
     for c in collectors:
-        eref = _make_evidence_ref(c)
-        if eref:
-            all_evidence_refs.append(eref)
-        ref = c.get("evidence_ref") or {}
+        ref = c.get("evidence_ref")
+        if not ref or not ref.get("s3_key"):
+            continue
         ctype = c.get("collector_type", "unknown")
-        if ref.get("s3_key") and not c.get("skipped"):
-            try:
-                evidence_objects[ctype] = _load_json(ref["s3_bucket"], ref["s3_key"])
-            except Exception as e:
-                print(json.dumps({"msg": "evidence_load_error", "collector_type": ctype, "error": str(e)[:300]}))
+        eref = {
+            "collector_type": ref.get("collector_type", ctype),
+            "s3_bucket": ref.get("s3_bucket", ""),
+            "s3_key": ref["s3_key"],
+            "sha256": ref.get("sha256", ""),
+            "byte_size": ref.get("byte_size", 0),
+            "truncated": ref.get("truncated", False),
+        }
+        all_evidence_refs.append(eref)
+        eref_by_type.setdefault(eref["collector_type"], eref)
+        if not c.get("skipped"):
+            to_load.append((ctype, ref["s3_bucket"], ref["s3_key"]))
+
+    if to_load:
+        with ThreadPoolExecutor(max_workers=min(MAX_EVIDENCE_WORKERS, len(to_load))) as ex:
+            futures = [(ctype, ex.submit(_load_json, b, k)) for ctype, b, k in to_load]
+            # Collected in manifest order so evidence_objects is deterministic
+            for ctype, fut in futures:
+                try:
+                    evidence_objects[ctype] = fut.result()
+                except Exception as e:
+                    print(json.dumps({"msg": "evidence_load_error", "collector_type": ctype, "error": str(e)[:300]}))
 
     # Run analysis — LLM or stub fallback
     findings, hypotheses, next_actions, limits = [], [], [], []
@@ -508,7 +724,7 @@ def lambda_handler(event: dict, context: Any) -> dict:
 
     if not used_llm:
         if "logs" in evidence_objects:
-            logs_eref = next((r for r in all_evidence_refs if r.get("collector_type") == "logs"), None)
+            logs_eref = eref_by_type.get("logs")
             if logs_eref:
                 f, h, a, l = _analyze_logs(evidence_objects["logs"], logs_eref)
                 findings.extend(f); hypotheses.extend(h); next_actions.extend(a); limits.extend(l)
@@ -516,7 +732,7 @@ def lambda_handler(event: dict, context: Any) -> dict:
             limits.append("Logs collector evidence not available or skipped.")
 
         if "metrics" in evidence_objects:
-            met_eref = next((r for r in all_evidence_refs if r.get("collector_type") == "metrics"), None)
+            met_eref = eref_by_type.get("metrics")
             if met_eref:
                 f, h, a, l = _analyze_metrics(evidence_objects["metrics"], met_eref)
                 findings.extend(f); hypotheses.extend(h); next_actions.extend(a); limits.extend(l)
@@ -524,7 +740,7 @@ def lambda_handler(event: dict, context: Any) -> dict:
             limits.append("Metrics collector evidence not available or skipped.")
 
         if "stepfn" in evidence_objects:
-            sfn_eref = next((r for r in all_evidence_refs if r.get("collector_type") == "stepfn"), None)
+            sfn_eref = eref_by_type.get("stepfn")
             if sfn_eref:
                 f, h, a, l = _analyze_stepfn(evidence_objects["stepfn"], sfn_eref)
                 findings.extend(f); hypotheses.extend(h); next_actions.extend(a); limits.extend(l)
@@ -561,70 +777,76 @@ def lambda_handler(event: dict, context: Any) -> dict:
         "all_evidence_refs": all_evidence_refs,
     }
 
+    # One serialize, one hash: sha256 covers the canonical packet without
+    # packet_hashes, and the field is spliced onto the end of the object.
+    # Verify by dropping packet_hashes and re-serializing with _to_bytes.
+    # It stays SHA-256 rather than a faster non-cryptographic hash: the digest
+    # is the PacketHashes.sha256 contract field and is handed to downstream
+    # consumers in packet_ref to check the object they fetch.
     body = _to_bytes(packet)
     sha256 = hashlib.sha256(body).hexdigest()
-    packet["packet_hashes"] = {"sha256": sha256}
-    body = _to_bytes(packet)
-    sha256 = hashlib.sha256(body).hexdigest()
-    packet["packet_hashes"]["sha256"] = sha256
-    body = _to_bytes(packet)
+    body = body[:-1] + b',"packet_hashes":{"sha256":"' + sha256.encode() + b'"}}'
 
     packet_key = f"packets/{incident_id}/{collector_run_id}.json"
-    s3.put_object(Bucket=evidence_bucket, Key=packet_key, Body=body, ContentType="application/json")
+    # Stored gzipped: packet JSON shrinks several-fold and level 1 is cheap.
+    # sha256 and byte_size keep describing the uncompressed JSON readers get.
+    # mtime=0 keeps the compressed bytes reproducible.
+    s3.put_object(
+        Bucket=evidence_bucket,
+        Key=packet_key,
+        Body=gzip.compress(body, compresslevel=1, mtime=0),
+        ContentType="application/json",
+        ContentEncoding="gzip",
+        Metadata={"sha256": sha256},
+    )
 
     # Persist metadata to DynamoDB
     sk = f"PACKET#{created_at}#{collector_run_id}"
-    table.put_item(
-        Item={
-            "pk": f"INCIDENT#{incident_id}",
-            "sk": sk,
+    item = {
+        "pk": f"INCIDENT#{incident_id}",
+        "sk": sk,
+        "incident_id": incident_id,
+        "collector_run_id": collector_run_id,
+        "created_at": created_at,
+        "packet_bucket": evidence_bucket,
+        "packet_key": packet_key,
+        "packet_sha256": sha256,
+        "packet_byte_size": len(body),
+        "service": service,
+        "environment": environment,
+    }
+    # S3 went first: the packet row and the event both point at the object
+    # and their readers fetch it straight away. The event only goes out once
+    # the row is stored: a failed row write releases the run for a retry,
+    # which would otherwise emit a second event for a different packet.
+    _put_packet_items([item])
+    if EVENT_BUS_NAME:
+        event_detail = {
             "incident_id": incident_id,
             "collector_run_id": collector_run_id,
+            "packet_hash": sha256,
+            "packet_ref": {
+                "s3_bucket": evidence_bucket,
+                "s3_key": packet_key,
+                "sha256": sha256,
+                "byte_size": len(body),
+            },
+            "snapshot_ref": {
+                "s3_bucket": evidence_bucket,
+                "s3_key": evidence_key,
+                "sha256": evidence_sha256,
+            },
+            "suspected_owners": suspected_owners,
+            "top_findings": [
+                {"id": f.get("id", ""), "summary": f.get("summary", "")[:200], "confidence": f.get("confidence", 0)}
+                for f in findings[:5]
+            ],
+            "emitted_at": created_at,
             "created_at": created_at,
-            "packet_bucket": evidence_bucket,
-            "packet_key": packet_key,
-            "packet_sha256": sha256,
-            "packet_byte_size": len(body),
             "service": service,
             "environment": environment,
         }
-    )
-
-    # Emit incident.analyzed event
-    if EVENT_BUS_NAME:
-        try:
-            events_client.put_events(Entries=[{
-                "Source": EVENT_SOURCE,
-                "DetailType": "incident.analyzed",
-                "Detail": json.dumps({
-                    "incident_id": incident_id,
-                    "collector_run_id": collector_run_id,
-                    "packet_hash": sha256,
-                    "packet_ref": {
-                        "s3_bucket": evidence_bucket,
-                        "s3_key": packet_key,
-                        "sha256": sha256,
-                        "byte_size": len(body),
-                    },
-                    "snapshot_ref": {
-                        "s3_bucket": evidence_bucket,
-                        "s3_key": evidence_key,
-                        "sha256": evidence_sha256,
-                    },
-                    "suspected_owners": suspected_owners,
-                    "top_findings": [
-                        {"id": f.get("id", ""), "summary": f.get("summary", "")[:200], "confidence": f.get("confidence", 0)}
-                        for f in findings[:5]
-                    ],
-                    "emitted_at": created_at,
-                    "created_at": created_at,
-                    "service": service,
-                    "environment": environment,
-                }, default=str),
-                "EventBusName": EVENT_BUS_NAME,
-            }])
-        except Exception as e:
-            print(json.dumps({"msg": "eventbridge_emit_failed", "error": str(e)[:300]}))
+        _emit_analyzed(event_detail)
 
     print(json.dumps({"msg": "analyzer_done", "incident_id": incident_id, "packet_key": packet_key}))
 
@@ -15,6 +15,7 @@ Environment variables:
     EVENT_BUS_NAME       — EventBridge bus for emitting events
     AUTOMATION_ENABLED   — Kill switch
 """
+import gzip
 import json
 import os
 import time
@@ -67,7 +68,11 @@ def _read_ssm(path: str) -> str:
 
 def _load_packet(bucket: str, key: str) -> dict:
     resp = s3.get_object(Bucket=bucket, Key=key)
-    return json.loads(resp["Body"].read().decode("utf-8"))
+    body = resp["Body"].read()
+    # The analyzer stores packets gzipped; boto3 does not undo Content-Encoding
+    if resp.get("ContentEncoding") == "gzip":
+        body = gzip.decompress(body)
+    return json.loads(body)
 
 
 def _get_llm():
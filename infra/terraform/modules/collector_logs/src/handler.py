@@ -13,11 +13,14 @@ Input from Step Functions:
 
 Returns evidence_ref dict or {"skipped": true}.
 """
+import functools
+import gzip
 import hashlib
 import json
 import os
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 import boto3
@@ -25,11 +28,23 @@ import boto3
 MAX_ROWS = 100
 MAX_BYTES = 200_000
 MAX_POLL_SECONDS = 30
+# Insights queries over short windows often finish in a few hundred ms, so
+# poll early and back off instead of a flat 1s sleep.
+POLL_FIRST_DELAY = 0.05
+POLL_INITIAL_DELAY = 0.1
+POLL_MAX_DELAY = 1.0
+POLL_BACKOFF = 1.5
 EVENT_SOURCE = "opsrunbook-copilot"
 
 logs_client = boto3.client("logs")
 s3_client = boto3.client("s3")
-events_client = boto3.client("events")
+
+
+# Only needed when an event bus is configured, so its service model is
+# loaded on first use instead of at cold start.
+@functools.lru_cache(maxsize=None)
+def _events_client():
+    return boto3.client("events")
 
 RECENT_ERRORS_QUERY = (
     "fields @timestamp, @message, @logStream\n"
@@ -45,6 +60,13 @@ TOP_ERRORS_QUERY = (
     "| limit 20"
 )
 
+# RE2 when bundled: the fused prefilter regex then runs in linear time, with
+# no backtracking blowup on long token-like runs.
+try:
+    import re2 as _redact_re
+except ImportError:
+    _redact_re = re
+
 # Redaction patterns
 _REDACT_PATTERNS = [
     (re.compile(r"(?i)\bAuthorization:\s*Bearer\s+[A-Za-z0-9\-\._~\+/]+=*\b"), "Authorization: Bearer [REDACTED]"),
@@ -57,21 +79,60 @@ _REDACT_PATTERNS = [
 ]
 
 
+def _build_fused(patterns):
+    """Fuse the redaction patterns into one alternation used as a prefilter.
+
+    Inline (?i) becomes a scoped (?i:...) so case-sensitive patterns stay
+    case-sensitive. The fused regex matches exactly when some pattern does;
+    it does not replace, because a leftmost match can swallow the start of
+    an overlapping secret that the ordered patterns would each redact.
+    """
+    parts = []
+    for pat, _ in patterns:
+        src = pat.pattern
+        if src.startswith("(?i)"):
+            src = f"(?i:{src[4:]})"
+        parts.append(f"(?:{src})")
+    return _redact_re.compile("|".join(parts))
+
+
+_FUSED = _build_fused(_REDACT_PATTERNS)
+
+
 def _redact(text):
+    # Most log lines hold no secret: one scan clears them. Lines that hit
+    # go through the patterns in order, as before.
+    if not _FUSED.search(text):
+        return text
     for pat, repl in _REDACT_PATTERNS:
         text = pat.sub(repl, text)
     return text
 
 
+# Shortest text any redaction pattern can match ("Bearer x")
+_MIN_REDACT_LEN = 8
+
+
 def _redact_obj(obj):
-    if obj is None:
-        return None
+    """Redact strings in a JSON-like tree in place; returns obj.
+
+    Containers are only written to where a value actually changed, and
+    strings too short to hold a secret skip the regex entirely.
+    """
     if isinstance(obj, str):
-        return _redact(obj)
+        return _redact(obj) if len(obj) >= _MIN_REDACT_LEN else obj
     if isinstance(obj, list):
-        return [_redact_obj(x) for x in obj]
-    if isinstance(obj, dict):
-        return {k: _redact_obj(v) for k, v in obj.items()}
+        for i, x in enumerate(obj):
+            if isinstance(x, (str, list, dict)):
+                new = _redact_obj(x)
+                if new is not x:
+                    obj[i] = new
+    elif isinstance(obj, dict):
+        for k, v in obj.items():
+            if isinstance(v, (str, list, dict)):
+                new = _redact_obj(v)
+                if new is not v:
+                    obj[k] = new
     return obj
 
 
@@ -85,6 +146,8 @@ def _run_query(log_groups, query, start_epoch, end_epoch, limit):
     )
     qid = resp["queryId"]
     deadline = time.time() + MAX_POLL_SECONDS
+    time.sleep(POLL_FIRST_DELAY)
+    delay = POLL_INITIAL_DELAY
     while time.time() < deadline:
         r = logs_client.get_query_results(queryId=qid)
         status = r.get("status", "Unknown")
@@ -98,12 +161,74 @@ def _run_query(log_groups, query, start_epoch, end_epoch, limit):
                         item[f] = cell.get("value")
                 rows.append(item)
             return {"status": status, "rows": rows, "stats": r.get("statistics", {})}
-        time.sleep(1)
+        time.sleep(delay)
+        delay = min(delay * POLL_BACKOFF, POLL_MAX_DELAY)
     return {"status": "ClientTimeout", "rows": [], "stats": {}}
 
 
-def _to_bytes(payload):
-    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+# orjson when bundled; it writes compact UTF-8 bytes directly, matching the
+# stdlib fallback's output.
+try:
+    import orjson
+
+    def _to_bytes(payload):
+        return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+    def _dumps_str(obj):
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:
+    _ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+
+    def _to_bytes(payload):
+        return _ENCODER.encode(payload).encode("utf-8")
+
+    def _dumps_str(obj):
+        return json.dumps(obj, default=str)
+
+
+def _encode_within_budget(payload):
+    """Serialize payload, keeping as many section rows as fit in MAX_BYTES.
+
+    Each row is encoded once and spliced into the encoded envelope, so the
+    exact size is known while rows are chosen and nothing is serialized
+    twice. A section's "rows" key ends up last in its object. Returns
+    (body, truncated), or (None, True) if even the row-less payload is over.
+    """
+    sections = payload.pop("sections")
+    head = _to_bytes(payload)[:-1] + b',"sections":['
+    payload["sections"] = sections
+
+    sec_heads, sec_rows = [], []
+    for sec in sections:
+        rows = sec.pop("rows", [])
+        sec_heads.append(_to_bytes(sec)[:-1] + b',"rows":[')
+        sec_rows.append([_to_bytes(r) for r in rows])
+        sec["rows"] = rows
+
+    # Closing "]}" per section and for the envelope, plus separating commas
+    size = len(head) + 2 + sum(len(h) + 2 for h in sec_heads) + max(len(sections) - 1, 0)
+    if size > MAX_BYTES:
+        return None, True
+
+    truncated = False
+    parts = [head]
+    for i, (sec_head, rows) in enumerate(zip(sec_heads, sec_rows, strict=True)):
+        keep = 0
+        if not truncated:
+            for rb in rows:
+                add = len(rb) + (1 if keep else 0)
+                if size + add > MAX_BYTES:
+                    truncated = True
+                    break
+                size += add
+                keep += 1
+        if keep < len(sections[i]["rows"]):
+            sections[i]["rows"] = sections[i]["rows"][:keep]
+        if i:
+            parts.append(b",")
+        parts += [sec_head, b",".join(rows[:keep]), b"]}"]
+    parts.append(b"]}")
+    return b"".join(parts), truncated
 
 
 def lambda_handler(event, context):
@@ -125,15 +250,19 @@ def lambda_handler(event, context):
             "cause": None,
         }
 
-    start_dt = datetime.fromisoformat(tw["start"].replace("Z", "+00:00"))
-    end_dt = datetime.fromisoformat(tw["end"].replace("Z", "+00:00"))
+    start_dt = datetime.fromisoformat(tw["start"])
+    end_dt = datetime.fromisoformat(tw["end"])
     start_epoch = int(start_dt.timestamp())
     end_epoch = int(end_dt.timestamp())
 
+    # The two Insights queries are independent; run them side by side so the
+    # wait is the slower query, not the sum of both.
     sections = []
-    r1 = _run_query(log_groups, RECENT_ERRORS_QUERY, start_epoch, end_epoch, 50)
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        f1 = ex.submit(_run_query, log_groups, RECENT_ERRORS_QUERY, start_epoch, end_epoch, 50)
+        f2 = ex.submit(_run_query, log_groups, TOP_ERRORS_QUERY, start_epoch, end_epoch, 20)
+        r1, r2 = f1.result(), f2.result()
     sections.append({"name": "recent_errors", **r1})
-    r2 = _run_query(log_groups, TOP_ERRORS_QUERY, start_epoch, end_epoch, 20)
     sections.append({"name": "top_errors", **r2})
 
     payload = {
@@ -158,8 +287,11 @@ def lambda_handler(event, context):
             sec["rows"] = rows[:MAX_ROWS]
             truncated = True
 
-    body = _to_bytes(redacted)
-    if len(body) > MAX_BYTES:
+    body, over = _encode_within_budget(redacted)
+    truncated = truncated or over
+    # Safety net; the estimate above is exact, so this only fires when even
+    # the row-less payload is over budget.
+    if body is None or len(body) > MAX_BYTES:
         redacted["sections"] = [{"name": s.get("name", "?"), "note": "Dropped due to size budget"} for s in redacted.get("sections", [])]
         truncated = True
         body = _to_bytes(redacted)
@@ -167,7 +299,11 @@ def lambda_handler(event, context):
     sha = hashlib.sha256(body).hexdigest()
     key = f"evidence/{incident_id}/{collector_run_id}/logs.json"
 
-    s3_client.put_object(Bucket=evidence_bucket, Key=key, Body=body, ContentType="application/json")
+    # Stored gzipped; MAX_BYTES and sha256 still apply to the raw JSON
+    stored = gzip.compress(body, compresslevel=1, mtime=0)
+    s3_client.put_object(
+        Bucket=evidence_bucket, Key=key, Body=stored, ContentType="application/json", ContentEncoding="gzip"
+    )
 
     evidence_ref = {
         "collector_type": "logs",
@@ -175,6 +311,7 @@ def lambda_handler(event, context):
         "s3_key": key,
         "sha256": sha,
         "byte_size": len(body),
+        "compressed_size": len(stored),
         "truncated": truncated,
     }
 
@@ -194,10 +331,10 @@ def lambda_handler(event, context):
 
 def _emit_event(bus, incident_id, run_id, collector_type, evidence_ref, tw, service):
     try:
-        events_client.put_events(Entries=[{
+        _events_client().put_events(Entries=[{
             "Source": EVENT_SOURCE,
             "DetailType": "evidence.collected",
-            "Detail": json.dumps({
+            "Detail": _dumps_str({
                 "incident_id": incident_id,
                 "collector_run_id": run_id,
                 "collector_type": collector_type,
@@ -205,7 +342,7 @@ def _emit_event(bus, incident_id, run_id, collector_type, evidence_ref, tw, serv
                 "time_window": tw,
                 "service": service,
                 "emitted_at": datetime.now(timezone.utc).isoformat(),
-            }, default=str),
+            }),
             "EventBusName": bus,
         }])
     except Exception as e:
@@ -12,6 +12,8 @@ Input from Step Functions:
   "service": "..."
 }
 """
+import functools
+import gzip
 import hashlib
 import json
 import os
@@ -19,14 +21,28 @@ from datetime import datetime, timezone
 
 import boto3
 
+# numpy when bundled: one vectorized pass per reduction on longer series
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 MAX_DATA_POINTS = 500
 MAX_QUERIES = 20
 MAX_BYTES = 200_000
 EVENT_SOURCE = "opsrunbook-copilot"
+# Below this, array conversion costs more than the builtin reductions save
+_NUMPY_MIN_POINTS = 16
 
 cw_client = boto3.client("cloudwatch")
 s3_client = boto3.client("s3")
-events_client = boto3.client("events")
+
+
+# Only needed when an event bus is configured, so its service model is
+# loaded on first use instead of at cold start.
+@functools.lru_cache(maxsize=None)
+def _events_client():
+    return boto3.client("events")
 
 
 def _auto_period(start_dt, end_dt, desired_points=300):
@@ -41,8 +57,16 @@ def _auto_period(start_dt, end_dt, desired_points=300):
 
 
 def _compute_summary(values):
-    if not values:
+    if not len(values):
         return {"min": None, "max": None, "avg": None, "count": 0}
+    if np is not None and len(values) >= _NUMPY_MIN_POINTS:
+        arr = np.asarray(values, dtype=np.float64)
+        return {
+            "min": round(float(arr.min()), 6),
+            "max": round(float(arr.max()), 6),
+            "avg": round(float(arr.mean()), 6),
+            "count": int(arr.size),
+        }
     return {
         "min": round(min(values), 6),
         "max": round(max(values), 6),
@@ -51,8 +75,32 @@ def _compute_summary(values):
     }
 
 
-def _to_bytes(payload):
-    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+# orjson when bundled; it writes compact UTF-8 bytes directly and formats
+# datetimes itself, the same way the stdlib fallback's isoformat() does.
+# Series values may be numpy arrays, which orjson writes from the buffer.
+try:
+    import orjson
+
+    def _to_bytes(payload):
+        return orjson.dumps(payload, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    def _dumps_str(obj):
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:
+    def _json_default(obj):
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        if np is not None and isinstance(obj, np.ndarray):
+            return obj.tolist()
+        return str(obj)
+
+    _ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_json_default)
+
+    def _to_bytes(payload):
+        return _ENCODER.encode(payload).encode("utf-8")
+
+    def _dumps_str(obj):
+        return json.dumps(obj, default=_json_default)
 
 
 def lambda_handler(event, context):
@@ -75,8 +123,8 @@ def lambda_handler(event, context):
             "cause": None,
         }
 
-    start_dt = datetime.fromisoformat(tw["start"].replace("Z", "+00:00"))
-    end_dt = datetime.fromisoformat(tw["end"].replace("Z", "+00:00"))
+    start_dt = datetime.fromisoformat(tw["start"])
+    end_dt = datetime.fromisoformat(tw["end"])
 
     bounded = metric_queries[:MAX_QUERIES]
     truncated_queries = len(metric_queries) > MAX_QUERIES
@@ -121,8 +169,12 @@ def lambda_handler(event, context):
     overall_truncated = truncated_queries
     series_list = []
     for r in all_results:
-        timestamps = [t.isoformat() if isinstance(t, datetime) else str(t) for t in r.get("Timestamps", [])]
-        values = list(r.get("Values", []))
+        # Left as datetimes; _to_bytes renders them as ISO strings
+        timestamps = list(r.get("Timestamps", []))
+        # A float64 array when numpy is bundled: no per-point boxing here,
+        # and the summary and encoder work on the buffer directly
+        raw_values = r.get("Values", [])
+        values = np.asarray(raw_values, dtype=np.float64) if np is not None else list(raw_values)
         series_trunc = len(values) > MAX_DATA_POINTS
         if series_trunc:
             timestamps = timestamps[:MAX_DATA_POINTS]
@@ -171,7 +223,11 @@ def lambda_handler(event, context):
 
     sha = hashlib.sha256(body).hexdigest()
     key = f"evidence/{incident_id}/{collector_run_id}/metrics.json"
-    s3_client.put_object(Bucket=evidence_bucket, Key=key, Body=body, ContentType="application/json")
+    # Stored gzipped; MAX_BYTES and sha256 still apply to the raw JSON
+    stored = gzip.compress(body, compresslevel=1, mtime=0)
+    s3_client.put_object(
+        Bucket=evidence_bucket, Key=key, Body=stored, ContentType="application/json", ContentEncoding="gzip"
+    )
 
     evidence_ref = {
         "collector_type": "metrics",
@@ -179,6 +235,7 @@ def lambda_handler(event, context):
         "s3_key": key,
         "sha256": sha,
         "byte_size": len(body),
+        "compressed_size": len(stored),
         "truncated": overall_truncated,
     }
 
@@ -198,10 +255,10 @@ def lambda_handler(event, context):
 
 def _emit_event(bus, incident_id, run_id, collector_type, evidence_ref, tw, service):
     try:
-        events_client.put_events(Entries=[{
+        _events_client().put_events(Entries=[{
             "Source": EVENT_SOURCE,
             "DetailType": "evidence.collected",
-            "Detail": json.dumps({
+            "Detail": _dumps_str({
                 "incident_id": incident_id,
                 "collector_run_id": run_id,
                 "collector_type": collector_type,
@@ -209,7 +266,7 @@ def _emit_event(bus, incident_id, run_id, collector_type, evidence_ref, tw, serv
                 "time_window": tw,
                 "service": service,
                 "emitted_at": datetime.now(timezone.utc).isoformat(),
-            }, default=str),
+            }),
             "EventBusName": bus,
         }])
     except Exception as e:
@@ -8,8 +8,11 @@ Input from Step Functions:
 - orchestrator_state_machine_arn ($$.StateMachine.Id)
 - state_machine_arns (from hints) – optional, collect recent failed executions in window
 """
+import functools
+import gzip
 import hashlib
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any, Optional
 
@@ -22,10 +25,18 @@ MAX_INPUT_OUTPUT_BYTES = 2000
 MAX_BYTES = 200_000
 FAILED_STATUSES = ["FAILED", "TIMED_OUT", "ABORTED"]
 EVENT_SOURCE = "opsrunbook-copilot"
+# Matches botocore's default connection pool, so fan-out never queues on it
+MAX_SFN_WORKERS = 10
 
 sfn_client = boto3.client("stepfunctions")
 s3_client = boto3.client("s3")
-events_client = boto3.client("events")
+
+
+# Only needed when an event bus is configured, so its service model is
+# loaded on first use instead of at cold start.
+@functools.lru_cache(maxsize=None)
+def _events_client():
+    return boto3.client("events")
 
 
 # ---------------------------------------------------------------------------
@@ -40,8 +51,24 @@ def _truncate(s: Optional[str], max_len: int) -> Optional[str]:
     return s[:max_len] + "...[truncated]"
 
 
-def _to_bytes(payload: dict) -> bytes:
-    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+# orjson when bundled; it writes compact UTF-8 bytes directly, matching the
+# stdlib fallback's output.
+try:
+    import orjson
+
+    def _to_bytes(payload: dict) -> bytes:
+        return orjson.dumps(payload, default=str)
+
+    def _dumps_str(obj: Any) -> str:
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:
+    _ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+
+    def _to_bytes(payload: dict) -> bytes:
+        return _ENCODER.encode(payload).encode("utf-8")
+
+    def _dumps_str(obj: Any) -> str:
+        return json.dumps(obj, default=str)
 
 
 def _ts(v: Any) -> Optional[str]:
@@ -52,28 +79,36 @@ def _ts(v: Any) -> Optional[str]:
     return str(v)
 
 
+_FAILURE_MARKERS = ("Failed", "TimedOut", "Aborted")
+
+
 def _infer_last_failed_state(events: list[dict]) -> Optional[str]:
-    """Walk history events (newest-first) and return the name of the last failed state."""
+    """Walk history events (newest-first) and return the name of the last failed state.
+
+    One pass: the newest TaskStateEntered name is remembered wherever it sits
+    in the list, as the fallback when the failure event carries no name.
+    """
+    failed_type: Optional[str] = None
+    entered_name: Optional[str] = None
     for evt in events:
         etype = evt.get("type", "")
-        if "Failed" not in etype and "TimedOut" not in etype and "Aborted" not in etype:
-            continue
-        details = (
-            evt.get("taskFailedEventDetails")
-            or evt.get("executionFailedEventDetails")
-            or evt.get("lambdaFunctionFailedEventDetails")
-            or {}
-        )
-        if details.get("name"):
-            return details["name"]
-        # Fall back: scan for preceding TaskStateEntered
-        for prev in events:
-            if prev.get("type") == "TaskStateEntered":
-                sd = prev.get("stateEnteredEventDetails", {})
-                if sd.get("name"):
-                    return sd["name"]
-        return etype
-    return None
+        if entered_name is None and etype == "TaskStateEntered":
+            entered_name = evt.get("stateEnteredEventDetails", {}).get("name") or None
+        if failed_type is None and any(m in etype for m in _FAILURE_MARKERS):
+            details = (
+                evt.get("taskFailedEventDetails")
+                or evt.get("executionFailedEventDetails")
+                or evt.get("lambdaFunctionFailedEventDetails")
+                or {}
+            )
+            if details.get("name"):
+                return details["name"]
+            failed_type = etype
+        if failed_type is not None and entered_name is not None:
+            break
+    if failed_type is None:
+        return None
+    return entered_name or failed_type
 
 
 # ---------------------------------------------------------------------------
@@ -207,41 +242,63 @@ def _enrich_failed(ex: dict) -> dict:
 # MAX_BYTES enforcement (staged)
 # ---------------------------------------------------------------------------
 
+_ABSENT = object()
+
+
+def _member_size(key: str, value: Any) -> int:
+    """Bytes that `"key":value` plus its separating comma add to a non-empty object."""
+    return len(_to_bytes({key: value})) - 1
+
+
+def _rewrite_saving(obj: dict, key: str, new: Any = _ABSENT) -> int:
+    """Bytes saved by setting obj[key] to new, or by dropping the key if new is omitted."""
+    old_size = _member_size(key, obj[key]) if key in obj else 0
+    return old_size - (0 if new is _ABSENT else _member_size(key, new))
+
+
 def _enforce_budget(payload: dict, sections: list[dict]) -> tuple[bytes, bool]:
-    """Serialize; if over budget, first drop history_tail, then truncate error/cause."""
+    """Serialize; if over budget, first drop history_tail, then truncate error/cause.
+
+    Each stage's saving is measured on only the fields it rewrites (the JSON
+    is compact, so sizes add up exactly), and the payload is re-serialized
+    once at the first stage that fits rather than after every stage.
+    """
     body = _to_bytes(payload)
-    if len(body) <= MAX_BYTES:
+    size = len(body)
+    if size <= MAX_BYTES:
         return body, False
 
-    # Stage 1: drop history_tail from orchestrator section
-    for sec in sections:
-        if sec.get("name") == "orchestrator_execution":
-            sec["history_tail"] = sec.get("history_tail", [])[:5]
-            sec.pop("input", None)
-            sec.pop("output", None)
-    body = _to_bytes(payload)
-    if len(body) <= MAX_BYTES:
-        return body, True
+    orchestrators = [sec for sec in sections if sec.get("name") == "orchestrator_execution"]
+    executions = [
+        ex for sec in sections if sec.get("name") == "failed_executions" for ex in sec.get("executions", [])
+    ]
+
+    # Stage 1: trim history_tail from orchestrator section, drop input/output
+    size -= sum(
+        _rewrite_saving(sec, "history_tail", sec.get("history_tail", [])[:5])
+        + _rewrite_saving(sec, "input")
+        + _rewrite_saving(sec, "output")
+        for sec in orchestrators
+    )
+    for sec in orchestrators:
+        sec["history_tail"] = sec.get("history_tail", [])[:5]
+        sec.pop("input", None)
+        sec.pop("output", None)
+    if size <= MAX_BYTES:
+        return _to_bytes(payload), True
 
     # Stage 2: drop history_tail entirely
-    for sec in sections:
-        if sec.get("name") == "orchestrator_execution":
-            sec["history_tail"] = []
-    body = _to_bytes(payload)
-    if len(body) <= MAX_BYTES:
-        return body, True
+    size -= sum(_rewrite_saving(sec, "history_tail", []) for sec in orchestrators)
+    for sec in orchestrators:
+        sec["history_tail"] = []
+    if size <= MAX_BYTES:
+        return _to_bytes(payload), True
 
     # Stage 3: truncate error/cause everywhere
-    for sec in sections:
-        if sec.get("name") == "orchestrator_execution":
-            sec["error"] = _truncate(sec.get("error"), 200)
-            sec["cause"] = _truncate(sec.get("cause"), 200)
-        if sec.get("name") == "failed_executions":
-            for ex in sec.get("executions", []):
-                ex["error"] = _truncate(ex.get("error"), 200)
-                ex["cause"] = _truncate(ex.get("cause"), 200)
-    body = _to_bytes(payload)
-    return body, True
+    for obj in orchestrators + executions:
+        obj["error"] = _truncate(obj.get("error"), 200)
+        obj["cause"] = _truncate(obj.get("cause"), 200)
+    return _to_bytes(payload), True
 
 
 # ---------------------------------------------------------------------------
@@ -270,12 +327,15 @@ def lambda_handler(event: dict, context: Any) -> dict:
 
     # 2. Optionally collect recent failed executions for configured state machines
     if state_machine_arns:
-        start_dt = datetime.fromisoformat(tw["start"].replace("Z", "+00:00"))
-        end_dt = datetime.fromisoformat(tw["end"].replace("Z", "+00:00"))
-        all_failed = []
-        for arn in state_machine_arns:
-            for status in FAILED_STATUSES:
-                all_failed.extend(_list_failed(arn, status, start_dt, end_dt))
+        start_dt = datetime.fromisoformat(tw["start"])
+        end_dt = datetime.fromisoformat(tw["end"])
+        # ListExecutions per (state machine, status) and the per-execution
+        # describe/history calls are independent round trips, so fan them
+        # out. Results are read in submission order to keep output stable.
+        pairs = [(arn, status) for arn in state_machine_arns for status in FAILED_STATUSES]
+        with ThreadPoolExecutor(max_workers=min(MAX_SFN_WORKERS, len(pairs))) as pool:
+            listed = [pool.submit(_list_failed, arn, status, start_dt, end_dt) for arn, status in pairs]
+            all_failed = [ex for fut in listed for ex in fut.result()]
 
         # De-dup: remove orchestrator execution from the failed list
         if orchestrator_execution_arn:
@@ -286,7 +346,11 @@ def lambda_handler(event: dict, context: Any) -> dict:
         if total_found > MAX_EXECUTIONS:
             truncated = True
         all_failed = all_failed[:MAX_EXECUTIONS]
-        enriched = [_enrich_failed(ex) for ex in all_failed]
+        if all_failed:
+            with ThreadPoolExecutor(max_workers=min(MAX_SFN_WORKERS, len(all_failed))) as pool:
+                enriched = list(pool.map(_enrich_failed, all_failed))
+        else:
+            enriched = []
         sections.append({
             "name": "failed_executions",
             "state_machine_arns": state_machine_arns,
@@ -323,7 +387,11 @@ def lambda_handler(event: dict, context: Any) -> dict:
 
     sha = hashlib.sha256(body).hexdigest()
     key = f"evidence/{incident_id}/{collector_run_id}/stepfn.json"
-    s3_client.put_object(Bucket=evidence_bucket, Key=key, Body=body, ContentType="application/json")
+    # Stored gzipped; MAX_BYTES and sha256 still apply to the raw JSON
+    stored = gzip.compress(body, compresslevel=1, mtime=0)
+    s3_client.put_object(
+        Bucket=evidence_bucket, Key=key, Body=stored, ContentType="application/json", ContentEncoding="gzip"
+    )
 
     evidence_ref = {
         "collector_type": "stepfn",
@@ -331,6 +399,7 @@ def lambda_handler(event: dict, context: Any) -> dict:
         "s3_key": key,
         "sha256": sha,
         "byte_size": len(body),
+        "compressed_size": len(stored),
         "truncated": truncated,
     }
 
@@ -350,10 +419,10 @@ def lambda_handler(event: dict, context: Any) -> dict:
 
 def _emit_event(bus: str, incident_id: str, run_id: str, collector_type: str, evidence_ref: dict, tw: dict, service: str) -> None:
     try:
-        events_client.put_events(Entries=[{
+        _events_client().put_events(Entries=[{
             "Source": EVENT_SOURCE,
             "DetailType": "evidence.collected",
-            "Detail": json.dumps({
+            "Detail": _dumps_str({
                 "incident_id": incident_id,
                 "collector_run_id": run_id,
                 "collector_type": collector_type,
@@ -361,7 +430,7 @@ def _emit_event(bus: str, incident_id: str, run_id: str, collector_type: str, ev
                 "time_window": tw,
                 "service": service,
                 "emitted_at": datetime.now(timezone.utc).isoformat(),
-            }, default=str),
+            }),
             "EventBusName": bus,
         }])
     except Exception as e:
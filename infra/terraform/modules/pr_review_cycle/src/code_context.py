@@ -6,12 +6,18 @@ and extracts a windowed snippet with numbered lines for LLM consumption.
 """
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from github_ops import GitHubOps
 
+# "src/main.py:42" or "config/app.json line 10". The line part is optional,
+# so one scan yields both line refs and the bare paths used as a fallback.
+_PATH_REF_RE = re.compile(r'([\w./_-]+\.\w+)(?::(\d+)|\s+line\s+(\d+))?')
+_MAX_PATH_REFS = 5
+
 
 @dataclass
 class CodeContext:
@@ -149,18 +155,16 @@ def extract_file_line_from_event(event: dict) -> list[tuple[str, int]]:
         results.append((inline_path, int(inline_line)))
         return results
 
-    # Fallback: parse "path:line" patterns from comment body
-    import re
-    comment = event.get("comment_body", "")
-    # Match patterns like "src/main.py:42" or "config/app.json line 10"
-    for m in re.finditer(r'([\w./_-]+\.\w+)(?::(\d+)|\s+line\s+(\d+))', comment):
-        fpath = m.group(1)
-        line_num = int(m.group(2) or m.group(3))
-        results.append((fpath, line_num))
-
-    # If no line-specific refs, look for bare file paths (line defaults to 1)
-    if not results:
-        for m in re.finditer(r'([\w./_-]+\.\w+)', comment):
-            results.append((m.group(1), 1))
-
-    return results[:5]
+    # Fallback: parse "path:line" patterns from comment body; if there are
+    # no line-specific refs, use bare file paths (line defaults to 1)
+    bare: list[tuple[str, int]] = []
+    for m in _PATH_REF_RE.finditer(event.get("comment_body", "")):
+        line = m.group(2) or m.group(3)
+        if line:
+            results.append((m.group(1), int(line)))
+            if len(results) == _MAX_PATH_REFS:
+                break
+        elif not results and len(bare) < _MAX_PATH_REFS:
+            bare.append((m.group(1), 1))
+
+    return results or bare
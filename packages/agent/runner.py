@@ -16,6 +16,7 @@ Environment variables:
 from __future__ import annotations
 
 import argparse
+import gzip
 import json
 import os
 import sys
@@ -34,7 +35,11 @@ def _load_packet_from_s3(bucket: str, key: str) -> dict:
     import boto3
     s3 = boto3.client("s3")
     resp = s3.get_object(Bucket=bucket, Key=key)
-    return json.loads(resp["Body"].read().decode("utf-8"))
+    body = resp["Body"].read()
+    # The analyzer stores packets gzipped; boto3 does not undo Content-Encoding
+    if resp.get("ContentEncoding") == "gzip":
+        body = gzip.decompress(body)
+    return json.loads(body)
 
 
 def _get_llm():
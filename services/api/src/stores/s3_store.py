@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import gzip
 import hashlib
 import json
 from dataclasses import dataclass
@@ -39,5 +40,8 @@ class S3EvidenceStore:
 
     def get_json(self, bucket: str, key: str) -> dict[str, Any]:
         resp = self._client.get_object(Bucket=bucket, Key=key)
-        body = resp["Body"].read().decode("utf-8")
+        body = resp["Body"].read()
+        # Incident packets are stored gzipped; boto3 does not undo Content-Encoding
+        if resp.get("ContentEncoding") == "gzip":
+            body = gzip.decompress(body)
         return json.loads(body)
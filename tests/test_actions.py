@@ -12,6 +12,10 @@ _boto3_stub = types.ModuleType("boto3")
 _boto3_stub.client = MagicMock()
 _boto3_stub.resource = MagicMock()
 sys.modules.setdefault("boto3", _boto3_stub)
+_boto3_types_stub = types.ModuleType("boto3.dynamodb.types")
+_boto3_types_stub.TypeSerializer = MagicMock
+sys.modules.setdefault("boto3.dynamodb", types.ModuleType("boto3.dynamodb"))
+sys.modules.setdefault("boto3.dynamodb.types", _boto3_types_stub)
 
 FIXTURES = Path(__file__).resolve().parent / "fixtures"
 HANDLER_DIR = Path(__file__).resolve().parent.parent / "infra" / "terraform" / "modules" / "actions_runner" / "src"
@@ -145,6 +149,26 @@ class TestJiraClient:
         r2 = client.create_issue("s2", "d2")
         assert r1["issue_key"] != r2["issue_key"]
 
+    def test_create_issue_uses_shared_pool(self):
+        import jira_client
+        resp = MagicMock(status=201, data=b'{"key": "KAN-7", "id": "10007"}')
+        with patch.object(jira_client._POOL, "request", return_value=resp) as req:
+            client = jira_client.JiraClient("https://x.atlassian.net/", "a@b.c", "tok", "KAN")
+            out = client.create_issue("summary", "desc", priority="P1")
+        assert out == {"issue_key": "KAN-7", "url": "https://x.atlassian.net/browse/KAN-7", "id": "10007"}
+        method, url = req.call_args.args
+        assert (method, url) == ("POST", "https://x.atlassian.net/rest/api/2/issue")
+        assert req.call_args.kwargs["headers"]["Authorization"].startswith("Basic ")
+        assert json.loads(req.call_args.kwargs["body"])["fields"]["priority"] == {"name": "High"}
+
+    def test_create_issue_error_status_raises(self):
+        import jira_client
+        resp = MagicMock(status=400, data=b'{"errors": {"summary": "required"}}')
+        with patch.object(jira_client._POOL, "request", return_value=resp):
+            client = jira_client.JiraClient("https://x.atlassian.net", "a@b.c", "tok", "KAN")
+            with pytest.raises(RuntimeError, match="Jira API error 400"):
+                client.create_issue("summary", "desc")
+
 
 # ── Teams notifier tests ──────────────────────────────────────────
 
@@ -163,21 +187,76 @@ class TestTeamsNotifier:
         r2 = notifier.send_message("t2", "b2")
         assert r1["message_id"] != r2["message_id"]
 
+    def test_send_message_posts_compact_card(self):
+        import teams_notifier
+        notifier = teams_notifier.TeamsNotifier("https://example.webhook.office.com/hook?sig=abc")
+        resp = MagicMock(status=200, data=b"1")
+        with patch.object(notifier._pool, "urlopen", return_value=resp) as urlopen:
+            out = notifier.send_message("Incident – db", "body", links=[{"name": "Jira", "url": "https://j/1"}])
+            notifier.send_message("again", "body")
+        assert out == {"status_code": 200, "response": "1"}
+        assert urlopen.call_count == 2
+        method, path = urlopen.call_args_list[0].args
+        assert (method, path) == ("POST", "/hook?sig=abc")
+        kwargs = urlopen.call_args_list[0].kwargs
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+        body = kwargs["body"]
+        assert b", " not in body and "–".encode() in body
+        card = json.loads(body)
+        assert card["@type"] == "MessageCard" and card["summary"] == "Incident – db"
+        assert card["potentialAction"][0]["targets"][0]["uri"] == "https://j/1"
+
+    def test_send_many_preserves_order(self):
+        import threading
+        import teams_notifier
+        notifier = teams_notifier.TeamsNotifier("https://example.webhook.office.com/hook")
+        barrier = threading.Barrier(3, timeout=5)
+
+        def urlopen(method, path, body, headers, timeout):
+            barrier.wait()  # all three sends are in flight together
+            return MagicMock(status=200, data=json.loads(body)["summary"].encode())
+
+        with patch.object(notifier._pool, "urlopen", side_effect=urlopen):
+            out = notifier.send_many([("a", "x", None), ("b", "y", None), ("c", "z", None)])
+        assert [r["response"] for r in out] == ["a", "b", "c"]
+
+    def test_send_message_async_uses_pool(self):
+        import asyncio
+        import teams_notifier
+        notifier = teams_notifier.TeamsNotifier("https://example.webhook.office.com/hook")
+        with patch.object(notifier._pool, "urlopen", return_value=MagicMock(status=200, data=b"1")) as urlopen:
+            out = asyncio.run(notifier.send_message_async("t", "b"))
+        assert out == {"status_code": 200, "response": "1"}
+        assert urlopen.call_count == 1
+
+    def test_dry_run_send_many(self):
+        from teams_notifier import DryRunTeamsNotifier
+        out = DryRunTeamsNotifier().send_many([("t1", "b1", None), ("t2", "b2", None)])
+        assert [r["message_id"] for r in out] == ["dryrun-teams-1", "dryrun-teams-2"]
+
+    def test_send_message_error_status_raises(self):
+        import teams_notifier
+        notifier = teams_notifier.TeamsNotifier("https://example.webhook.office.com/hook")
+        with patch.object(notifier._pool, "urlopen", return_value=MagicMock(status=400, data=b"bad")):
+            with pytest.raises(RuntimeError, match="Teams webhook error 400"):
+                notifier.send_message("t", "b")
+
 
 # ── Handler DRY_RUN test ──────────────────────────────────────────
 
 class TestHandlerDryRun:
     def test_dry_run_produces_success_results(self):
-        from handler import _execute_jira, _execute_teams
+        from handler import _execute_jira, _execute_teams, _actions_by_type
         from plan_generator import generate_action_plan, build_teams_body
         packet = _load_fixture("sample_packet.json")
         plan = generate_action_plan(packet, dry_run=True)
+        actions = _actions_by_type(plan)
 
-        jira_result = _execute_jira(plan, packet, "inc-test", "corr-1")
+        jira_result = _execute_jira(actions, packet, "inc-test", "corr-1")
         assert jira_result["status"] == "success"
         assert "DRYRUN" in jira_result["external_refs"]["jira_issue_key"]
 
-        teams_result = _execute_teams(plan, packet, jira_result.get("external_refs", {}), "inc-test", "corr-1")
+        teams_result = _execute_teams(actions, packet, jira_result.get("external_refs", {}), "inc-test", "corr-1")
         assert teams_result["status"] == "success"
 
 
@@ -225,13 +304,13 @@ class TestGitHubClient:
 
 class TestGitHubPRExecution:
     def test_dry_run_github_pr_success(self):
-        from handler import _execute_github_pr
+        from handler import _execute_github_pr, _actions_by_type
         from plan_generator import generate_action_plan
         packet = _load_fixture("sample_packet.json")
         plan = generate_action_plan(packet, dry_run=True)
 
         jira_refs = {"jira_issue_key": "KAN-42", "jira_url": "https://jira.example.com/browse/KAN-42"}
-        result = _execute_github_pr(plan, packet, jira_refs, "inc-test456", "corr-1")
+        result = _execute_github_pr(_actions_by_type(plan), packet, jira_refs, "inc-test456", "corr-1")
         assert result["status"] == "success"
         assert result["action_type"] == "create_github_pr"
         assert "github.com" in result["external_refs"]["pr_url"]
@@ -239,18 +318,18 @@ class TestGitHubPRExecution:
         assert "repo_resolution" in result["external_refs"]
 
     def test_missing_jira_key_fails(self):
-        from handler import _execute_github_pr
+        from handler import _execute_github_pr, _actions_by_type
         from plan_generator import generate_action_plan
         packet = _load_fixture("sample_packet.json")
         plan = generate_action_plan(packet, dry_run=True)
 
-        result = _execute_github_pr(plan, packet, {}, "inc-test456", "corr-1")
+        result = _execute_github_pr(_actions_by_type(plan), packet, {}, "inc-test456", "corr-1")
         assert result["status"] == "failed"
         assert "missing jira_issue_key" in result["error"]
 
     def test_repo_from_suspected_owners_below_threshold_skips(self):
         """Heuristic-only repos (0.5 confidence) are below the 0.7 gate and get skipped."""
-        from handler import _execute_github_pr
+        from handler import _execute_github_pr, _actions_by_type
         from plan_generator import generate_action_plan
         packet = _load_fixture("sample_packet.json")
         packet["service"] = "unknown-svc"
@@ -261,7 +340,7 @@ class TestGitHubPRExecution:
         plan = generate_action_plan(packet, dry_run=True)
 
         jira_refs = {"jira_issue_key": "KAN-99", "jira_url": "https://jira.example.com/browse/KAN-99"}
-        result = _execute_github_pr(plan, packet, jira_refs, "inc-test", "corr-1")
+        result = _execute_github_pr(_actions_by_type(plan), packet, jira_refs, "inc-test", "corr-1")
         assert result["status"] == "skipped"
         assert "confidence" in result["error"]
 
@@ -371,56 +450,124 @@ class TestSanitizer:
 class TestIdempotency:
     """Test that actions are skipped when already executed for an incident."""
 
-    def test_find_existing_action_returns_stored_result(self):
-        from handler import _find_existing_action
+    @staticmethod
+    def _conditional_failure():
+        from botocore.exceptions import ClientError
+        return ClientError({"Error": {"Code": "ConditionalCheckFailedException", "Message": "x"}}, "PutItem")
+
+    def test_fresh_claim_runs_action_without_reading(self):
+        from handler import _claim_action
         mock_table = MagicMock()
-        mock_table.query.return_value = {
-            "Items": [{
-                "action_type": "create_jira_ticket",
-                "status": "success",
-                "external_refs": json.dumps({"jira_issue_key": "KAN-1"}),
-                "evidence_refs": json.dumps([]),
-            }]
-        }
-        result = _find_existing_action(mock_table, "inc-123", "create_jira_ticket")
-        assert result is not None
+        assert _claim_action(mock_table, "inc-123", "create_jira_ticket", 60) is None
+        kwargs = mock_table.put_item.call_args.kwargs
+        assert kwargs["Item"]["sk"] == "ACTIONCLAIM#create_jira_ticket"
+        assert kwargs["Item"]["status"] == "claimed"
+        assert "attribute_not_exists(sk)" in kwargs["ConditionExpression"]
+        mock_table.get_item.assert_not_called()
+        mock_table.query.assert_not_called()
+
+    def test_claimed_success_returns_stored_result(self):
+        from handler import _claim_action
+        mock_table = MagicMock()
+        mock_table.put_item.side_effect = self._conditional_failure()
+        mock_table.get_item.return_value = {"Item": {
+            "pk": "INCIDENT#inc-123", "sk": "ACTIONCLAIM#create_jira_ticket", "action_type": "create_jira_ticket",
+            "status": "success", "external_refs": {"jira_issue_key": "KAN-1"}, "evidence_refs": [],
+            "lease_expires_at": 0,
+        }}
+        result = _claim_action(mock_table, "inc-123", "create_jira_ticket", 60)
         assert result["status"] == "success"
         assert result["external_refs"]["jira_issue_key"] == "KAN-1"
+        assert "lease_expires_at" not in result
+        assert mock_table.get_item.call_args.kwargs["ConsistentRead"] is True
 
-    def test_find_existing_action_returns_none_when_not_found(self):
-        from handler import _find_existing_action
+    def test_live_claim_elsewhere_skips(self):
+        from handler import _claim_action
         mock_table = MagicMock()
-        mock_table.query.return_value = {"Items": []}
-        result = _find_existing_action(mock_table, "inc-123", "create_jira_ticket")
-        assert result is None
-
-    def test_find_existing_action_ignores_failed(self):
-        from handler import _find_existing_action
-        mock_table = MagicMock()
-        mock_table.query.return_value = {
-            "Items": [{
-                "action_type": "create_jira_ticket",
-                "status": "failed",
-                "external_refs": "{}",
-                "evidence_refs": "[]",
-            }]
-        }
-        result = _find_existing_action(mock_table, "inc-123", "create_jira_ticket")
-        assert result is None
+        mock_table.put_item.side_effect = self._conditional_failure()
+        mock_table.get_item.return_value = {"Item": {"status": "claimed", "lease_expires_at": 2**40}}
+        result = _claim_action(mock_table, "inc-123", "notify_teams", 60)
+        assert result["status"] == "skipped"
+        assert result["error"] == "claimed_by_concurrent_invocation"
 
-    def test_find_existing_action_ignores_other_types(self):
-        from handler import _find_existing_action
+    def test_other_claim_errors_propagate(self):
+        from botocore.exceptions import ClientError
+        from handler import _claim_action
         mock_table = MagicMock()
-        mock_table.query.return_value = {
-            "Items": [{
-                "action_type": "notify_teams",
-                "status": "success",
-                "external_refs": "{}",
-                "evidence_refs": "[]",
-            }]
-        }
-        result = _find_existing_action(mock_table, "inc-123", "create_jira_ticket")
-        assert result is None
+        mock_table.put_item.side_effect = ClientError({"Error": {"Code": "ThrottlingException", "Message": "x"}},
+                                                      "PutItem")
+        with pytest.raises(ClientError):
+            _claim_action(mock_table, "inc-123", "notify_teams", 60)
+
+    def test_lease_follows_remaining_time(self):
+        from handler import ACTION_LEASE_MARGIN_SECONDS, _lease_seconds
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 59_500
+        assert _lease_seconds(context) == 60 + ACTION_LEASE_MARGIN_SECONDS
+
+    def test_duplicate_delivery_reuses_claimed_success(self):
+        import handler
+        packet = _load_fixture("sample_packet.json")
+        event = {"detail": {"incident_id": "inc-dup", "packet_ref": {"s3_bucket": "b", "s3_key": "k"}}}
+        stored = {"create_jira_ticket": {"action_type": "create_jira_ticket", "status": "success",
+                                         "external_refs": {"jira_issue_key": "KAN-9"}, "evidence_refs": []}}
+
+        def put_item(Item, **kwargs):
+            if Item["action_type"] in stored:
+                raise self._conditional_failure()
+
+        with patch.object(handler, "_load_json", return_value=packet), \
+             patch.object(handler, "_TABLE") as table, \
+             patch.object(handler, "_DDB") as ddb, \
+             patch.object(handler, "_SER", MagicMock(serialize=lambda v: {"S": v})), \
+             patch.object(handler, "_execute_jira") as jira:
+            table.put_item.side_effect = put_item
+            table.get_item.side_effect = lambda Key, **kw: {"Item": stored[Key["sk"].split("#", 1)[1]]}
+            ddb.batch_write_item.return_value = {"UnprocessedItems": {}}
+            result = handler.lambda_handler(event, None)
+        jira.assert_not_called()
+        assert result["results"][0] == "success"
+        puts = ddb.batch_write_item.call_args.kwargs["RequestItems"]["test-incidents"]
+        sks = [p["PutRequest"]["Item"]["sk"]["S"] for p in puts]
+        # The reused Jira success is neither recorded again nor its claim rewritten
+        assert "ACTIONCLAIM#create_jira_ticket" not in sks
+        assert "ACTIONCLAIM#notify_teams" in sks
+
+    def test_concurrent_jira_claim_skips_remaining_actions(self):
+        import handler
+        packet = _load_fixture("sample_packet.json")
+        event = {"detail": {"incident_id": "inc-race", "packet_ref": {"s3_bucket": "b", "s3_key": "k"}}}
+        with patch.object(handler, "_load_json", return_value=packet), \
+             patch.object(handler, "_TABLE") as table, \
+             patch.object(handler, "_DDB") as ddb, \
+             patch.object(handler, "_SER", MagicMock(serialize=lambda v: {"S": v})), \
+             patch.object(handler, "_execute_teams") as teams, \
+             patch.object(handler, "_execute_github_pr") as pr:
+            table.put_item.side_effect = self._conditional_failure()
+            table.get_item.return_value = {"Item": {"status": "claimed"}}
+            ddb.batch_write_item.return_value = {"UnprocessedItems": {}}
+            result = handler.lambda_handler(event, None)
+        assert table.put_item.call_count == 1
+        teams.assert_not_called()
+        pr.assert_not_called()
+        assert result["results"] == ["skipped", "skipped", "skipped"]
+
+    def test_claim_of_raising_executor_is_released(self):
+        import handler
+        packet = _load_fixture("sample_packet.json")
+        event = {"detail": {"incident_id": "inc-boom", "packet_ref": {"s3_bucket": "b", "s3_key": "k"}}}
+        with patch.object(handler, "_load_json", return_value=packet), \
+             patch.object(handler, "_TABLE"), \
+             patch.object(handler, "_DDB") as ddb, \
+             patch.object(handler, "_SER", MagicMock(serialize=lambda v: {"S": v})), \
+             patch.object(handler, "_execute_jira", side_effect=RuntimeError("jira down")):
+            ddb.batch_write_item.return_value = {"UnprocessedItems": {}}
+            with pytest.raises(RuntimeError, match="jira down"):
+                handler.lambda_handler(event, None)
+        puts = ddb.batch_write_item.call_args.kwargs["RequestItems"]["test-incidents"]
+        released = [p["PutRequest"]["Item"] for p in puts if p["PutRequest"]["Item"]["sk"]["S"].startswith("ACTIONCLAIM#")]
+        assert [(it["sk"]["S"], it["status"]["S"]) for it in released] == [
+            ("ACTIONCLAIM#create_jira_ticket", "interrupted")]
 
     def test_idempotency_key_deterministic(self):
         from handler import _idempotency_key
@@ -430,6 +577,12 @@ class TestIdempotency:
         assert k1 == k2
         assert k1 != k3
 
+    def test_idempotency_key_is_24_hex_chars(self):
+        from handler import _idempotency_key
+        key = _idempotency_key("inc-1", "create_jira_ticket")
+        assert len(key) == 24
+        int(key, 16)
+
     def test_idempotency_key_differs_by_action_type(self):
         from handler import _idempotency_key
         k1 = _idempotency_key("inc-1", "create_jira_ticket", "PROJ")
@@ -437,11 +590,277 @@ class TestIdempotency:
         assert k1 != k2
 
 
+class TestSsmCache:
+    """SSM parameters are fetched once per TTL window across invocations."""
+
+    def test_param_fetched_once_while_fresh(self):
+        import handler
+        with patch.object(handler, "ssm") as ssm:
+            ssm.get_parameter.return_value = {"Parameter": {"Value": '"secret"'}}
+            assert handler._get_ssm_param("/p", decrypt=True) == "secret"
+            assert handler._get_ssm_param("/p", decrypt=True) == "secret"
+        assert ssm.get_parameter.call_count == 1
+
+    def test_param_refetched_after_ttl(self, monkeypatch):
+        import handler
+        monkeypatch.setattr(handler, "_SSM_TTL", 0)
+        with patch.object(handler, "ssm") as ssm:
+            ssm.get_parameter.return_value = {"Parameter": {"Value": "v"}}
+            handler._get_ssm_param("/p")
+            handler._get_ssm_param("/p")
+        assert ssm.get_parameter.call_count == 2
+
+    def test_known_params_fetched_in_batches(self):
+        import handler
+        with patch.object(handler, "ssm") as ssm:
+            ssm.get_parameters.side_effect = lambda Names, WithDecryption: {
+                "Parameters": [{"Name": n, "Value": f"v:{n}"} for n in Names if n != handler.SSM_JIRA_ISSUE_TYPE],
+                "InvalidParameters": [n for n in Names if n == handler.SSM_JIRA_ISSUE_TYPE],
+            }
+            assert handler._get_ssm_param(handler.SSM_JIRA_API_TOKEN, decrypt=True) == f"v:{handler.SSM_JIRA_API_TOKEN}"
+            assert handler._get_ssm_param(handler.SSM_JIRA_BASE_URL) == f"v:{handler.SSM_JIRA_BASE_URL}"
+            assert handler._get_ssm_param(handler.SSM_JIRA_ISSUE_TYPE) is None
+        assert ssm.get_parameters.call_count == 2
+        assert {c.kwargs["WithDecryption"] for c in ssm.get_parameters.call_args_list} == {True, False}
+        ssm.get_parameter.assert_not_called()
+
+    def test_failures_not_cached(self):
+        import handler
+        with patch.object(handler, "ssm") as ssm:
+            ssm.get_parameter.side_effect = [RuntimeError("throttled"), {"Parameter": {"Value": "v"}}]
+            assert handler._get_ssm_param("/p") is None
+            assert handler._get_ssm_param("/p") == "v"
+
+
+class TestClientReuse:
+    """Clients are built once per container; unconfigured results are retried."""
+
+    def test_client_built_once(self):
+        import handler
+        build = MagicMock(return_value=object())
+        first = handler._cached_client("x", build)
+        assert handler._cached_client("x", build) is first
+        assert build.call_count == 1
+
+    def test_none_result_not_cached(self):
+        import handler
+        build = MagicMock(side_effect=[None, "client"])
+        assert handler._cached_client("x", build) is None
+        assert handler._cached_client("x", build) == "client"
+
+
+class TestBatchedPersistence:
+    """Plan, action results and the latest pointer are written in one DynamoDB request."""
+
+    def test_handler_writes_all_items_in_one_request(self):
+        import handler
+        packet = _load_fixture("sample_packet.json")
+        event = {"detail": {"incident_id": "inc-batch", "packet_ref": {"s3_bucket": "b", "s3_key": "k"}}}
+        with patch.object(handler, "_load_json", return_value=packet), \
+             patch.object(handler, "_TABLE") as table, \
+             patch.object(handler, "_DDB") as ddb, \
+             patch.object(handler, "_SER", MagicMock(serialize=lambda v: {"S": v})):
+            ddb.batch_write_item.return_value = {"UnprocessedItems": {}}
+            result = handler.lambda_handler(event, None)
+        assert result["ok"] is True
+        assert ddb.batch_write_item.call_count == 1
+        # The only other writes are the three claims, taken before each action runs
+        assert table.put_item.call_count == 3
+        table.query.assert_not_called()
+        puts = ddb.batch_write_item.call_args.kwargs["RequestItems"]["test-incidents"]
+        sks = [p["PutRequest"]["Item"]["sk"]["S"] for p in puts]
+        # Action records and the latest pointer share the invocation's timestamp
+        items = [p["PutRequest"]["Item"] for p in puts[1:] if "created_at" in p["PutRequest"]["Item"]
+                 or "updated_at" in p["PutRequest"]["Item"]]
+        assert len({(it.get("created_at") or it.get("updated_at"))["S"] for it in items}) == 1
+        assert sks[0].startswith("ACTIONPLAN#")
+        assert sks[-1] == "ACTIONS#LATEST"
+        action_sks = [sk for sk in sks if sk.startswith("ACTION#")]
+        assert len(action_sks) == 3
+        # Each action's claim is rewritten with its result and released
+        claims = [p["PutRequest"]["Item"] for p in puts if p["PutRequest"]["Item"]["sk"]["S"].startswith("ACTIONCLAIM#")]
+        assert [c["action_sk"]["S"] for c in claims] == action_sks
+        assert all(c["lease_expires_at"]["S"] == 0 for c in claims)
+
+    def test_write_failure_does_not_mask_executor_error(self):
+        import handler
+        packet = _load_fixture("sample_packet.json")
+        event = {"detail": {"incident_id": "inc-mask", "packet_ref": {"s3_bucket": "b", "s3_key": "k"}}}
+        with patch.object(handler, "_load_json", return_value=packet), \
+             patch.object(handler, "_TABLE"), \
+             patch.object(handler, "_DDB") as ddb, \
+             patch.object(handler, "_SER", MagicMock(serialize=lambda v: {"S": v})), \
+             patch.object(handler, "_execute_teams", side_effect=RuntimeError("teams down")):
+            ddb.batch_write_item.side_effect = RuntimeError("ddb down")
+            with pytest.raises(RuntimeError, match="teams down"):
+                handler.lambda_handler(event, None)
+        assert ddb.batch_write_item.call_count == 1
+
+    def test_action_events_sent_only_after_records_are_stored(self, monkeypatch):
+        import handler
+        monkeypatch.setattr(handler, "EVENT_BUS_NAME", "bus")
+        packet = _load_fixture("sample_packet.json")
+        event = {"detail": {"incident_id": "inc-ev", "packet_ref": {"s3_bucket": "b", "s3_key": "k"}}}
+        order = []
+        with patch.object(handler, "_load_json", return_value=packet), \
+             patch.object(handler, "_TABLE"), \
+             patch.object(handler, "_DDB") as ddb, \
+             patch.object(handler, "_SER", MagicMock(serialize=lambda v: {"S": v})), \
+             patch.object(handler, "events_client") as events:
+            ddb.batch_write_item.side_effect = lambda **kw: order.append("write") or {"UnprocessedItems": {}}
+            events.put_events.side_effect = lambda **kw: order.append(kw["Entries"][0]["DetailType"])
+            handler.lambda_handler(event, None)
+        assert order[0] == "write"
+        assert order[1:] == ["action.completed"] * 3 + ["actions_runner.completed"]
+
+        # A failed write sends no action.completed at all
+        with patch.object(handler, "_load_json", return_value=packet), \
+             patch.object(handler, "_TABLE"), \
+             patch.object(handler, "_DDB") as ddb, \
+             patch.object(handler, "_SER", MagicMock(serialize=lambda v: {"S": v})), \
+             patch.object(handler, "events_client") as events:
+            ddb.batch_write_item.side_effect = RuntimeError("ddb down")
+            with pytest.raises(RuntimeError, match="ddb down"):
+                handler.lambda_handler(event, None)
+        events.put_events.assert_not_called()
+
+    def test_claim_item_keeps_result_and_record_stays_chronological(self):
+        import handler
+        ok = handler._action_result_item("inc-1", {"action_type": "create_jira_ticket", "status": "success",
+                                                   "action_id": "abc", "created_at": "t",
+                                                   "external_refs": {"jira_issue_key": "KAN-1"}})
+        claim = handler._claim_item("inc-1", ok)
+        assert ok["sk"] == "ACTION#t#abc"
+        assert claim["sk"] == "ACTIONCLAIM#create_jira_ticket"
+        assert claim["action_sk"] == ok["sk"]
+        assert claim["status"] == "success"
+        assert claim["external_refs"] == {"jira_issue_key": "KAN-1"}
+
+    def test_teams_and_pr_run_concurrently_after_jira(self):
+        import threading
+        import handler
+        packet = _load_fixture("sample_packet.json")
+        event = {"detail": {"incident_id": "inc-par", "packet_ref": {"s3_bucket": "b", "s3_key": "k"}}}
+        barrier = threading.Barrier(2, timeout=5)
+        real_teams, real_pr = handler._execute_teams, handler._execute_github_pr
+
+        def teams(*args):
+            barrier.wait()
+            return real_teams(*args)
+
+        def pr(*args):
+            barrier.wait()
+            return real_pr(*args)
+
+        with patch.object(handler, "_load_json", return_value=packet), \
+             patch.object(handler, "_TABLE") as table, \
+             patch.object(handler, "_DDB") as ddb, \
+             patch.object(handler, "_execute_teams", side_effect=teams), \
+             patch.object(handler, "_execute_github_pr", side_effect=pr):
+            table.query.return_value = {"Items": []}
+            ddb.batch_write_item.return_value = {"UnprocessedItems": {}}
+            result = handler.lambda_handler(event, None)
+        # Both executors reached the barrier together, so neither waited on the other
+        assert result["results"] == ["success", "success", "success"]
+
+    def test_load_json_parses_streaming_body(self):
+        import io
+        import handler
+        with patch.object(handler, "s3") as s3:
+            s3.get_object.return_value = {"Body": io.BytesIO(b'{"incident_id": "inc-1", "n": [1, 2]}')}
+            assert handler._load_json("b", "k") == {"incident_id": "inc-1", "n": [1, 2]}
+
+    def test_load_json_decompresses_gzip_packet(self):
+        import gzip
+        import io
+        import handler
+        with patch.object(handler, "s3") as s3:
+            s3.get_object.return_value = {
+                "Body": io.BytesIO(gzip.compress(b'{"incident_id": "inc-1"}')),
+                "ContentEncoding": "gzip",
+            }
+            assert handler._load_json("b", "k") == {"incident_id": "inc-1"}
+
+    def test_refs_stored_as_native_ddb_values(self):
+        from decimal import Decimal
+        import handler
+        item = handler._action_result_item("inc-1", {
+            "action_type": "create_github_pr", "status": "success",
+            "external_refs": {"pr_number": 3, "repo_resolution": {"confidence": 0.95, "reasons": ["m"]}},
+            "evidence_refs": [{"s3_key": "k", "byte_size": 10}],
+        })
+        assert item["external_refs"] == {"pr_number": 3, "repo_resolution": {"confidence": Decimal("0.95"), "reasons": ["m"]}}
+        assert item["evidence_refs"] == [{"s3_key": "k", "byte_size": 10}]
+
+    def test_non_finite_floats_are_stored_as_strings(self):
+        from decimal import Decimal
+        from handler import _ddb_value
+        value = _ddb_value({"a": float("nan"), "b": [float("inf"), -float("inf")], "c": 0.5})
+        assert value == {"a": "nan", "b": ["inf", "-inf"], "c": Decimal("0.5")}
+
+    def test_event_detail_is_json_string(self, monkeypatch):
+        import handler
+        monkeypatch.setattr(handler, "EVENT_BUS_NAME", "bus")
+        with patch.object(handler, "events_client") as events:
+            handler._emit_event("notify_teams", "success", "inc-1", {"teams_message_id": "m1"}, "corr-1")
+        detail = events.put_events.call_args.kwargs["Entries"][0]["Detail"]
+        assert isinstance(detail, str)
+        assert json.loads(detail)["external_refs"] == {"teams_message_id": "m1"}
+
+    def test_lone_teams_action_runs_without_thread_pool(self, monkeypatch):
+        import handler
+        monkeypatch.setattr(handler, "ENABLE_GITHUB_PR", False)
+        packet = _load_fixture("sample_packet.json")
+        event = {"detail": {"incident_id": "inc-solo", "packet_ref": {"s3_bucket": "b", "s3_key": "k"}}}
+        with patch.object(handler, "_load_json", return_value=packet), \
+             patch.object(handler, "_TABLE") as table, \
+             patch.object(handler, "_DDB") as ddb, \
+             patch.object(handler, "ThreadPoolExecutor") as pool:
+            table.query.return_value = {"Items": []}
+            ddb.batch_write_item.return_value = {"UnprocessedItems": {}}
+            result = handler.lambda_handler(event, None)
+        assert result["results"] == ["success", "success"]
+        pool.assert_not_called()
+
+    def test_unprocessed_items_are_retried(self):
+        import handler
+        item = {"pk": "p", "sk": "s"}
+        with patch.object(handler, "_DDB") as ddb, patch.object(handler.time, "sleep"):
+            ddb.batch_write_item.side_effect = [
+                {"UnprocessedItems": {"test-incidents": [{"PutRequest": {"Item": item}}]}},
+                {"UnprocessedItems": {}},
+            ]
+            handler._write_items([item])
+        assert ddb.batch_write_item.call_count == 2
+
+    def test_unprocessed_items_give_up_after_bounded_attempts(self):
+        import handler
+        item = {"pk": "p", "sk": "s"}
+        with patch.object(handler, "_DDB") as ddb, patch.object(handler.time, "sleep"):
+            ddb.batch_write_item.return_value = {"UnprocessedItems": {"test-incidents": [{"PutRequest": {"Item": item}}]}}
+            with pytest.raises(RuntimeError):
+                handler._write_items([item])
+        assert ddb.batch_write_item.call_count == handler._BATCH_WRITE_ATTEMPTS
+
+    def test_iam_policy_allows_every_dynamodb_call(self):
+        import re
+        main_tf = (HANDLER_DIR.parent / "main.tf").read_text()
+        block = re.search(r'Sid\s*=\s*"DynamoDB".*?Action\s*=\s*\[(.*?)\]', main_tf, re.S).group(1)
+        allowed = set(re.findall(r'"(dynamodb:\w+)"', block))
+        source = (HANDLER_DIR / "handler.py").read_text()
+        calls = set(re.findall(r"\b(?:_DDB|_TABLE|table|dynamodb)\.([a-z_]+)\(", source))
+        assert {"batch_write_item", "put_item", "get_item"} <= calls
+        # TransactWriteItems has no IAM action of its own: each Put inside it needs PutItem
+        required = {"dynamodb:" + ("PutItem" if c == "transact_write_items" else c.title().replace("_", ""))
+                    for c in calls}
+        assert required <= allowed, sorted(required - allowed)
+
+
 class TestConfidenceGate:
     """Test that PRs are skipped when repo confidence is below threshold."""
 
     def test_low_confidence_skips_pr(self):
-        from handler import _execute_github_pr
+        from handler import _execute_github_pr, _actions_by_type
         from plan_generator import generate_action_plan
         packet = _load_fixture("sample_packet.json")
         packet["service"] = "unknown-service-xyz"
@@ -451,22 +870,22 @@ class TestConfidenceGate:
         plan = generate_action_plan(packet, dry_run=True)
         jira_refs = {"jira_issue_key": "KAN-1", "jira_url": "https://jira.example.com/browse/KAN-1"}
 
-        result = _execute_github_pr(plan, packet, jira_refs, "inc-test", "corr-1")
+        result = _execute_github_pr(_actions_by_type(plan), packet, jira_refs, "inc-test", "corr-1")
         assert result["status"] == "skipped"
         assert "confidence" in result["error"]
 
     def test_high_confidence_mapping_creates_pr(self):
-        from handler import _execute_github_pr
+        from handler import _execute_github_pr, _actions_by_type
         from plan_generator import generate_action_plan
         packet = _load_fixture("sample_packet.json")
         plan = generate_action_plan(packet, dry_run=True)
         jira_refs = {"jira_issue_key": "KAN-99", "jira_url": "https://jira.example.com/browse/KAN-99"}
 
-        result = _execute_github_pr(plan, packet, jira_refs, "inc-test", "corr-1")
+        result = _execute_github_pr(_actions_by_type(plan), packet, jira_refs, "inc-test", "corr-1")
         assert result["status"] == "success"
 
     def test_unverified_no_repo_skips_pr(self):
-        from handler import _execute_github_pr
+        from handler import _execute_github_pr, _actions_by_type
         from plan_generator import generate_action_plan
         packet = _load_fixture("sample_packet.json")
         packet["service"] = ""
@@ -475,7 +894,7 @@ class TestConfidenceGate:
         plan = generate_action_plan(packet, dry_run=True)
         jira_refs = {"jira_issue_key": "KAN-1", "jira_url": "https://jira.example.com/browse/KAN-1"}
 
-        result = _execute_github_pr(plan, packet, jira_refs, "inc-test", "corr-1")
+        result = _execute_github_pr(_actions_by_type(plan), packet, jira_refs, "inc-test", "corr-1")
         assert result["status"] == "skipped"
 
 
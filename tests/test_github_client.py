@@ -0,0 +1,412 @@
+"""Tests for the actions_runner GitHub REST client: auth caching and
+request shaping (no network — HTTP helpers are patched)."""
+
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+_ACTIONS_SRC = os.path.join(
+    os.path.dirname(__file__), "..",
+    "infra", "terraform", "modules", "actions_runner", "src",
+)
+if _ACTIONS_SRC not in sys.path:
+    sys.path.insert(0, _ACTIONS_SRC)
+
+import github_client  # noqa: E402
+
+
+class _Resp:
+    def __init__(self, status: int, data: bytes = b"", headers: dict | None = None):
+        self.status = status
+        self.data = data
+        self.headers = headers or {}
+
+
+class _FakeGitHub:
+    """Stand-in for `_gh`/`_gh_raw` that routes on (method, path prefix) and records calls."""
+
+    def __init__(self, routes: dict):
+        self.routes = routes
+        self.calls: list[tuple[str, str]] = []
+        self.bodies: dict[tuple[str, str], object] = {}
+
+    def __call__(self, method, path, token, body=None):
+        self.calls.append((method, path))
+        self.bodies[(method, path)] = body
+        for (m, prefix), result in self.routes.items():
+            if m == method and path.startswith(prefix):
+                if isinstance(result, Exception):
+                    raise result
+                return result
+        raise RuntimeError(f"GitHub API {method} {path} => 404: not routed")
+
+    def raw(self, method, path, token, body=None, headers=None):
+        return 200, {}, self(method, path, token, body)
+
+    def patched(self):
+        """Patch both `_gh` and `_gh_raw` so no request reaches the network."""
+        return patch.multiple(github_client, _gh=self, _gh_raw=self.raw)
+
+
+def _client() -> "github_client.GitHubClient":
+    return github_client.GitHubClient("org", pat="ghp_test")
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    github_client._TOKEN_CACHE.clear()
+    github_client._JWT_CACHE.clear()
+    github_client._PEM_KEY_CACHE.clear()
+    github_client._BRANCH_ETAG_CACHE.clear()
+    yield
+    github_client._TOKEN_CACHE.clear()
+    github_client._JWT_CACHE.clear()
+    github_client._PEM_KEY_CACHE.clear()
+    github_client._BRANCH_ETAG_CACHE.clear()
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 1. Installation token cache
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+
+class TestInstallationTokenCache:
+    def test_token_reused_across_clients(self):
+        with patch.object(github_client, "_build_jwt", return_value="jwt") as build, \
+             patch.object(github_client, "_get_installation_token",
+                          return_value=("tok-1", time.time() + 3600)) as fetch:
+            c1 = github_client.GitHubClient("org", app_id="1", installation_id="2", pem="pem")
+            c2 = github_client.GitHubClient("org", app_id="1", installation_id="2", pem="pem")
+        assert c1._token == c2._token == "tok-1"
+        assert fetch.call_count == 1
+        assert build.call_count == 1
+
+    def test_token_refreshed_near_expiry(self):
+        tokens = iter([("tok-old", time.time() + 30), ("tok-new", time.time() + 3600)])
+        with patch.object(github_client, "_build_jwt", return_value="jwt"), \
+             patch.object(github_client, "_get_installation_token", side_effect=lambda *_: next(tokens)):
+            first = github_client._make_token(app_id="1", installation_id="2", pem="pem")
+            second = github_client._make_token(app_id="1", installation_id="2", pem="pem")
+        assert first == "tok-old"
+        assert second == "tok-new"
+
+    def test_rotated_pem_fetches_new_token(self):
+        tokens = iter([("tok-a", time.time() + 3600), ("tok-b", time.time() + 3600)])
+        with patch.object(github_client, "_build_jwt", return_value="jwt"), \
+             patch.object(github_client, "_get_installation_token", side_effect=lambda *_: next(tokens)):
+            first = github_client._make_token(app_id="1", installation_id="2", pem="pem-old")
+            second = github_client._make_token(app_id="1", installation_id="2", pem="pem-new")
+            again = github_client._make_token(app_id="1", installation_id="2", pem="pem-old")
+        assert (first, second, again) == ("tok-a", "tok-b", "tok-a")
+
+    def test_pat_bypasses_cache(self):
+        assert github_client._make_token(pat="ghp_x") == "ghp_x"
+        assert github_client._TOKEN_CACHE == {}
+
+    def test_parse_expires_at(self):
+        assert github_client._parse_expires_at("2030-01-01T00:00:00Z") == 1893456000.0
+        assert github_client._parse_expires_at(None) > time.time()
+
+
+class TestJWTCache:
+    def test_jwt_signed_once_while_fresh(self):
+        with patch.object(github_client, "_sign_jwt", return_value="signed") as sign:
+            assert github_client._build_jwt("1", "pem") == "signed"
+            assert github_client._build_jwt("1", "pem") == "signed"
+        assert sign.call_count == 1
+        claims = sign.call_args[0][0]
+        assert claims["iss"] == "1"
+        assert claims["exp"] - claims["iat"] == github_client.JWT_TTL + 60
+
+    def test_jwt_rebuilt_when_close_to_expiry(self):
+        github_client._JWT_CACHE[("1", github_client._pem_id("pem"))] = ("stale", int(time.time()) + 30)
+        with patch.object(github_client, "_sign_jwt", return_value="fresh") as sign:
+            assert github_client._build_jwt("1", "pem") == "fresh"
+        assert sign.call_count == 1
+
+    def test_rotated_pem_signs_new_jwt(self):
+        with patch.object(github_client, "_sign_jwt", side_effect=["jwt-old", "jwt-new"]) as sign:
+            assert github_client._build_jwt("1", "pem-old") == "jwt-old"
+            assert github_client._build_jwt("1", "pem-new") == "jwt-new"
+        assert sign.call_count == 2
+        assert sign.call_args[0][1] == "pem-new"
+
+    def test_header_constant_matches_rs256_header(self):
+        assert github_client._JWT_HEADER_B64 == github_client._base64url(b'{"alg":"RS256","typ":"JWT"}')
+
+    def test_fallback_signature_verifies(self):
+        pytest.importorskip("cryptography")
+        import base64
+
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        pem = key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+        ).decode()
+        with patch.dict(sys.modules, {"jwt": None}):
+            token = github_client._sign_jwt({"iat": 1, "exp": 2, "iss": "9"}, pem)
+            with patch.object(serialization, "load_pem_private_key") as load:
+                github_client._sign_jwt({"iat": 3, "exp": 4, "iss": "9"}, pem)
+        load.assert_not_called()  # parsed key reused from _PEM_KEY_CACHE
+        header, payload, sig = token.split(".")
+        assert header == github_client._JWT_HEADER_B64
+        key.public_key().verify(
+            base64.urlsafe_b64decode(sig + "=" * (-len(sig) % 4)),
+            f"{header}.{payload}".encode(), padding.PKCS1v15(), hashes.SHA256(),
+        )
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 2. HTTP helper
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+
+class TestGhHelper:
+    def test_uses_shared_pool(self):
+        with patch.object(github_client._POOL, "request", return_value=_Resp(200, b'{"a": 1}')) as req:
+            assert github_client._gh("GET", "/repos/o/r", "tok") == {"a": 1}
+        method, url = req.call_args[0]
+        assert (method, url) == ("GET", "https://api.github.com/repos/o/r")
+        assert req.call_args.kwargs["headers"]["Authorization"] == "Bearer tok"
+        assert req.call_args.kwargs["headers"]["Accept-Encoding"] == "gzip"
+
+    def test_error_status_raises_runtime_error(self):
+        with patch.object(github_client._POOL, "request", return_value=_Resp(404, b'{"message":"Not Found"}')):
+            with pytest.raises(RuntimeError, match="404"):
+                github_client._gh("GET", "/repos/o/r", "tok")
+
+    def test_error_carries_status_and_parsed_body(self):
+        with patch.object(github_client._POOL, "request",
+                          return_value=_Resp(422, b'{"message":"Validation Failed","errors":[]}')):
+            with pytest.raises(github_client.GitHubAPIError) as exc:
+                github_client._gh("POST", "/repos/o/r/git/refs", "tok", {"ref": "x"})
+        assert exc.value.status == 422
+        assert exc.value.body["message"] == "Validation Failed"
+
+    def test_non_json_error_body(self):
+        with patch.object(github_client._POOL, "request", return_value=_Resp(502, b"<html>bad gateway</html>")):
+            with pytest.raises(github_client.GitHubAPIError) as exc:
+                github_client._gh("GET", "/x", "tok")
+        assert exc.value.status == 502
+        assert exc.value.body == {}
+
+    def test_preformatted_bodies_are_valid_json(self):
+        import json
+
+        seen = {}
+
+        def capture(method, path, token, body=None):
+            seen[path] = json.loads(body)
+            return {}
+
+        with patch.object(github_client, "_gh", side_effect=capture):
+            client = _client()
+            client._create_branch("svc", 'fix/"quoted"\\slash', "abc123")
+            client._create_pr("svc", "KAN-1 – ünïcode \"title\"", "line1\nline2\t<tab>", "head", "main")
+        assert seen["/repos/org/svc/git/refs"] == {"ref": 'refs/heads/fix/"quoted"\\slash', "sha": "abc123"}
+        assert seen["/repos/org/svc/pulls"]["title"] == "KAN-1 – ünïcode \"title\""
+        assert seen["/repos/org/svc/pulls"]["body"] == "line1\nline2\t<tab>"
+
+    def test_empty_body_returns_empty_dict(self):
+        with patch.object(github_client._POOL, "request", return_value=_Resp(204)):
+            assert github_client._gh("DELETE", "/x", "tok") == {}
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 3. create_pr_with_notes flow
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+
+def _pr_kwargs(**overrides) -> dict:
+    kwargs = dict(
+        repo="svc", branch_name="opsrunbook/KAN-1", pr_title="t", pr_body="b",
+        file_path=".opsrunbook/analysis/KAN-1.md", file_content="# notes", commit_message="m",
+    )
+    kwargs.update(overrides)
+    return kwargs
+
+
+class TestCreatePRWithNotes:
+    def test_new_branch_creates_pr(self):
+        fake = _FakeGitHub({
+            ("GET", "/repos/org/svc/git/ref/heads/main"): {"object": {"sha": "base"}},
+            ("GET", "/repos/org/svc"): {"default_branch": "main"},
+            ("POST", "/repos/org/svc/git/refs"): {},
+            ("PUT", "/repos/org/svc/contents/"): {"commit": {"sha": "c1"}},
+            ("POST", "/repos/org/svc/pulls"): {"html_url": "https://github.com/org/svc/pull/7", "number": 7},
+        })
+        with fake.patched():
+            refs = _client().create_pr_with_notes(**_pr_kwargs())
+        assert refs["pr_number"] == 7
+        assert refs["commit_sha"] == "c1"
+        assert refs["default_branch"] == "main"
+        assert "reused_pr" not in refs
+        # Fresh branch: no contents GET, and the PUT is sent blind
+        assert not any(m == "GET" and "/contents/" in p for m, p in fake.calls)
+        assert "sha" not in fake.bodies[("PUT", "/repos/org/svc/contents/.opsrunbook/analysis/KAN-1.md")]
+
+    def test_existing_branch_updates_file_and_reuses_pr(self):
+        fake = _FakeGitHub({
+            ("GET", "/repos/org/svc/git/ref/heads/main"): {"object": {"sha": "base"}},
+            ("GET", "/repos/org/svc/contents/"): {"sha": "old-blob"},
+            ("GET", "/repos/org/svc/pulls"): [{"html_url": "https://github.com/org/svc/pull/3", "number": 3}],
+            ("GET", "/repos/org/svc"): {"default_branch": "main"},
+            ("POST", "/repos/org/svc/git/refs"): github_client.GitHubAPIError("GitHub API POST => 422", 422, {"message": "Reference already exists"}),
+            ("PUT", "/repos/org/svc/contents/"): {"commit": {"sha": "c2"}},
+            ("POST", "/repos/org/svc/pulls"): github_client.GitHubAPIError(
+                "GitHub API POST => 422", 422,
+                {"message": "Validation Failed",
+                 "errors": [{"message": "A pull request already exists for org:opsrunbook/KAN-1."}]},
+            ),
+        })
+        with fake.patched():
+            refs = _client().create_pr_with_notes(**_pr_kwargs())
+        assert refs["reused_pr"] is True
+        assert refs["pr_number"] == 3
+        assert refs["commit_sha"] == "c2"
+        # Existing branch: the sha is probed once, after the 422, and sent with the PUT
+        probe = ("GET", "/repos/org/svc/contents/.opsrunbook/analysis/KAN-1.md?ref=opsrunbook%2FKAN-1")
+        assert fake.calls.count(probe) == 1
+        assert fake.bodies[("PUT", "/repos/org/svc/contents/.opsrunbook/analysis/KAN-1.md")]["sha"] == "old-blob"
+
+    def test_branch_and_path_are_url_quoted(self):
+        fake = _FakeGitHub({
+            ("GET", "/repos/org/svc/git/ref/heads/main"): {"object": {"sha": "base"}},
+            ("GET", "/repos/org/svc"): {"default_branch": "main"},
+            ("POST", "/repos/org/svc/git/refs"): {},
+            ("PUT", "/repos/org/svc/contents/"): {"commit": {"sha": "c5"}},
+            ("POST", "/repos/org/svc/pulls"): {"html_url": "https://github.com/org/svc/pull/8", "number": 8},
+        })
+        with fake.patched():
+            _client().create_pr_with_notes(**_pr_kwargs(branch_name="fix/issue#1", file_path="notes/a b#1.md"))
+        assert ("PUT", "/repos/org/svc/contents/notes/a%20b%231.md") in fake.calls
+
+    def test_existing_branch_without_open_pr_creates_one(self):
+        fake = _FakeGitHub({
+            ("GET", "/repos/org/svc/git/ref/heads/main"): {"object": {"sha": "base"}},
+            ("GET", "/repos/org/svc/contents/"): {"sha": "old-blob"},
+            ("GET", "/repos/org/svc"): {"default_branch": "main"},
+            ("POST", "/repos/org/svc/git/refs"): github_client.GitHubAPIError("GitHub API POST => 422", 422),
+            ("PUT", "/repos/org/svc/contents/"): {"commit": {"sha": "c4"}},
+            ("POST", "/repos/org/svc/pulls"): {"html_url": "https://github.com/org/svc/pull/9", "number": 9},
+        })
+        with fake.patched():
+            refs = _client().create_pr_with_notes(**_pr_kwargs())
+        assert refs["pr_number"] == 9
+        assert "reused_pr" not in refs
+        assert not any(p.startswith("/repos/org/svc/pulls?") for _, p in fake.calls)
+
+    def test_other_pr_validation_errors_propagate(self):
+        fake = _FakeGitHub({
+            ("GET", "/repos/org/svc/git/ref/heads/main"): {"object": {"sha": "base"}},
+            ("GET", "/repos/org/svc"): {"default_branch": "main"},
+            ("POST", "/repos/org/svc/git/refs"): {},
+            ("PUT", "/repos/org/svc/contents/"): {"commit": {"sha": "c5"}},
+            ("POST", "/repos/org/svc/pulls"): github_client.GitHubAPIError(
+                "GitHub API POST => 422", 422, {"errors": [{"message": "No commits between main and b"}]},
+            ),
+        })
+        with fake.patched(), pytest.raises(github_client.GitHubAPIError):
+            _client().create_pr_with_notes(**_pr_kwargs())
+
+    def test_blind_put_falls_back_to_probe_on_422(self):
+        puts = iter([github_client.GitHubAPIError("GitHub API PUT => 422", 422, {"message": "sha wasn't supplied"}), {"commit": {"sha": "c3"}}])
+
+        def route(method, path, token, body=None):
+            if method == "PUT":
+                result = next(puts)
+                if isinstance(result, Exception):
+                    raise result
+                assert body["sha"] == "blob"
+                return result
+            return {"sha": "blob"}
+
+        with patch.object(github_client, "_gh", side_effect=route):
+            resp = _client()._create_or_update_file("svc", "b", "f.md", "x", "m", probe_existing=False)
+        assert resp["commit"]["sha"] == "c3"
+
+    def test_large_file_uses_git_data_api(self):
+        fake = _FakeGitHub({
+            ("POST", "/repos/org/svc/git/blobs"): {"sha": "blob-1"},
+            ("GET", "/repos/org/svc/git/ref/heads/b"): {"object": {"sha": "head"}},
+            ("GET", "/repos/org/svc/git/commits/head"): {"tree": {"sha": "tree-0"}},
+            ("POST", "/repos/org/svc/git/trees"): {"sha": "tree-1"},
+            ("POST", "/repos/org/svc/git/commits"): {"sha": "commit-1"},
+            ("PATCH", "/repos/org/svc/git/refs/heads/b"): {},
+        })
+        content = "x" * (github_client.LARGE_FILE_THRESHOLD + 1)
+        with fake.patched():
+            resp = _client()._create_or_update_file("svc", "b", "big.json", content, "m")
+        assert resp["commit"]["sha"] == "commit-1"
+        assert not any(m == "PUT" for m, _ in fake.calls)
+        assert fake.calls[-1] == ("PATCH", "/repos/org/svc/git/refs/heads/b")
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 4. Batched file existence
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+
+class TestFilesExist:
+    def test_single_graphql_request(self):
+        fake = _FakeGitHub({
+            ("POST", "/graphql"): {
+                "data": {"r0": {"object": {"__typename": "Blob"}}, "r1": {"object": None}, "r2": None},
+                "errors": [{"type": "NOT_FOUND"}],
+            },
+        })
+        pairs = [("org/svc", "handler.py"), ("org/svc", "missing.py"), ("other/gone", "x.py")]
+        with fake.patched():
+            result = _client().files_exist(pairs)
+        assert result == {pairs[0]: True, pairs[1]: False, pairs[2]: False}
+        assert fake.calls == [("POST", "/graphql")]
+
+    def test_falls_back_to_rest_when_graphql_fails(self):
+        fake = _FakeGitHub({
+            ("POST", "/graphql"): RuntimeError("GitHub API POST /graphql => 502: bad gateway"),
+            ("GET", "/repos/org/svc/contents/handler.py"): {"sha": "x"},
+            ("GET", "/repos/org/svc/contents/"): RuntimeError("GitHub API GET => 404: Not Found"),
+            ("GET", "/repos/org/svc"): {"default_branch": "main"},
+        })
+        with fake.patched():
+            result = _client().files_exist([("org/svc", "handler.py"), ("svc", "nope.py")])
+        assert result == {("org/svc", "handler.py"): True, ("svc", "nope.py"): False}
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 5. Default branch lookup
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+
+class TestDefaultBranch:
+    def test_etag_revalidation_uses_cached_branch_on_304(self):
+        responses = iter([
+            _Resp(200, b'{"default_branch": "develop"}', {"ETag": '"abc"'}),
+            _Resp(304, b"", {"ETag": '"abc"'}),
+        ])
+        with patch.object(github_client._POOL, "request", side_effect=lambda *a, **kw: next(responses)) as req:
+            assert _client().get_default_branch("svc") == "develop"
+            assert _client().get_default_branch("svc") == "develop"
+        assert req.call_args.kwargs["headers"]["If-None-Match"] == '"abc"'
+
+    def test_answer_cached_per_client(self):
+        client = _client()
+        with patch.object(github_client._POOL, "request",
+                          return_value=_Resp(200, b'{"default_branch": "develop"}')) as req:
+            assert client.get_default_branch("svc") == "develop"
+            assert client.get_default_branch("svc") == "develop"
+        assert req.call_count == 1
+
+    def test_error_falls_back(self):
+        with patch.object(github_client._POOL, "request", return_value=_Resp(500, b"boom")):
+            assert _client().get_default_branch("svc") == "main"
+
+    def test_unexpected_errors_propagate(self):
+        with patch.object(github_client._POOL, "request", side_effect=ValueError("bug")):
+            with pytest.raises(ValueError):
+                _client().get_default_branch("svc")
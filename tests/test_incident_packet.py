@@ -1,4 +1,6 @@
 """Unit tests for IncidentPacketV1 schema validation and stub analyzer."""
+import gzip
+import hashlib
 import json
 import os
 import sys
@@ -142,6 +144,15 @@ class TestStubAnalyzer:
         assert len(findings) >= 1
         assert findings[0]["id"] == "metrics-collected"
 
+    def test_analyze_metrics_does_not_mutate_evidence(self):
+        from handler import _analyze_metrics
+        evidence = {"series": [{"label": "a"}], "sections": [{"series": [{"label": "b"}, {"label": "c"}]}]}
+        eref = {"collector_type": "metrics", "s3_bucket": "b", "s3_key": "k", "sha256": "h", "byte_size": 1}
+        for _ in range(2):
+            findings, _h, _a, _l = _analyze_metrics(evidence, eref)
+            assert findings[0]["summary"].startswith("Collected 3 metric series.")
+        assert len(evidence["series"]) == 1
+
     def test_analyze_stepfn_running_not_flagged(self):
         from handler import _analyze_stepfn
         evidence = {"sections": [{"name": "orchestrator_execution", "status": "RUNNING"}]}
@@ -157,6 +168,172 @@ class TestStubAnalyzer:
         assert any(f["id"] == "stepfn-orchestrator-failed" for f in findings)
         assert any("CollectLogs" in h["summary"] for h in hypos)
 
+    def test_handler_loads_evidence_concurrently(self):
+        import threading
+        from unittest.mock import patch
+        import handler
+
+        manifest = {"collectors": [
+            {"collector_type": t, "evidence_ref": {"collector_type": t, "s3_bucket": "b", "s3_key": f"{t}.json"}}
+            for t in ("logs", "metrics", "stepfn")
+        ] + [{"collector_type": "skipped", "skipped": True, "evidence_ref": None}]}
+        barrier = threading.Barrier(3, timeout=5)
+
+        def load_json(bucket, key):
+            if key == "manifest.json":
+                return manifest
+            barrier.wait()  # all three evidence GETs are in flight together
+            if key == "metrics.json":
+                raise RuntimeError("boom")
+            return {"sections": []}
+
+        event = {"detail": {"incident_id": "inc-1", "collector_run_id": "run-1",
+                            "evidence_bucket": "b", "evidence_key": "manifest.json"}}
+        with patch.object(handler, "_load_json", side_effect=load_json), \
+             patch.object(handler, "_TABLE") as table, patch.object(handler, "s3") as s3, \
+             patch.object(handler, "_DDB_CLIENT") as ddb:
+            table.put_item.return_value = {}
+            result = handler.lambda_handler(event, None)
+        assert result["ok"] is True
+        put = s3.put_object.call_args.kwargs
+        assert put["ContentEncoding"] == "gzip"
+        body = gzip.decompress(put["Body"])
+        item = ddb.put_item.call_args.kwargs["Item"]
+        assert item["packet_byte_size"] == {"N": str(len(body))}
+        assert item["packet_sha256"] == {"S": result["packet_sha256"]}
+        packet = json.loads(body)
+        assert "Metrics collector evidence not available or skipped." in packet["limits"]
+        assert "Logs collector evidence not available or skipped." not in packet["limits"]
+        # The embedded hash covers the canonical packet without packet_hashes
+        embedded = packet.pop("packet_hashes")["sha256"]
+        assert embedded == result["packet_sha256"]
+        assert hashlib.sha256(handler._to_bytes(packet)).hexdigest() == embedded
+
+    _EVENT = {"detail": {"incident_id": "inc-1", "collector_run_id": "run-1",
+                         "evidence_bucket": "b", "evidence_key": "manifest.json"}}
+
+    def test_event_follows_packet_row_and_s3_put(self):
+        from unittest.mock import patch
+        import handler
+
+        order = []
+        with patch.object(handler, "EVENT_BUS_NAME", "bus"), \
+             patch.object(handler, "_load_json", return_value={"collectors": []}), \
+             patch.object(handler, "_TABLE") as table, patch.object(handler, "s3") as s3, \
+             patch.object(handler, "_DDB_CLIENT") as ddb, patch.object(handler, "events_client") as events:
+            table.put_item.return_value = {}
+            s3.put_object.side_effect = lambda **kw: order.append("s3")
+            ddb.put_item.side_effect = lambda **kw: order.append("ddb")
+            events.put_events.side_effect = lambda **kw: order.append("events")
+            result = handler.lambda_handler(self._EVENT, None)
+        assert order == ["s3", "ddb", "events"]
+        detail = json.loads(events.put_events.call_args.kwargs["Entries"][0]["Detail"])
+        assert detail["packet_ref"]["sha256"] == result["packet_sha256"]
+
+    def test_failed_packet_row_sends_no_event(self):
+        from unittest.mock import patch
+        import handler
+
+        with patch.object(handler, "EVENT_BUS_NAME", "bus"), \
+             patch.object(handler, "_load_json", return_value={"collectors": []}), \
+             patch.object(handler, "_TABLE") as table, patch.object(handler, "s3"), \
+             patch.object(handler, "_DDB_CLIENT") as ddb, patch.object(handler, "events_client") as events:
+            table.put_item.return_value = {}
+            ddb.put_item.side_effect = RuntimeError("ddb down")
+            with pytest.raises(RuntimeError, match="ddb down"):
+                handler.lambda_handler(self._EVENT, None)
+        events.put_events.assert_not_called()
+        table.delete_item.assert_called_once()
+
+    def test_claimed_run_is_skipped(self):
+        from unittest.mock import patch
+        from botocore.exceptions import ClientError
+        import handler
+
+        taken = ClientError({"Error": {"Code": "ConditionalCheckFailedException", "Message": "x"}}, "PutItem")
+        with patch.object(handler, "_TABLE") as table, patch.object(handler, "_load_json") as load:
+            table.put_item.side_effect = taken
+            result = handler.lambda_handler(self._EVENT, None)
+        assert result["skipped"] is True
+        load.assert_not_called()
+        table.query.assert_not_called()
+
+    def test_expired_claim_with_packet_is_skipped(self):
+        from unittest.mock import patch
+        import handler
+
+        with patch.object(handler, "_TABLE") as table, patch.object(handler, "_load_json") as load:
+            table.put_item.return_value = {"Attributes": {"sk": "RUN#run-1"}}
+            table.query.side_effect = [{"Count": 0, "LastEvaluatedKey": {"sk": "x"}},
+                                       {"Count": 1}]
+            result = handler.lambda_handler(self._EVENT, None)
+        assert result["skipped"] is True
+        assert table.query.call_count == 2
+        assert "Limit" not in table.query.call_args.kwargs
+        assert table.query.call_args.kwargs["Select"] == "COUNT"
+        load.assert_not_called()
+
+    def test_failed_run_releases_claim(self):
+        from unittest.mock import patch
+        import handler
+
+        with patch.object(handler, "_TABLE") as table, \
+             patch.object(handler, "_load_json", side_effect=RuntimeError("s3 down")):
+            table.put_item.return_value = {}
+            with pytest.raises(RuntimeError, match="s3 down"):
+                handler.lambda_handler(self._EVENT, None)
+        table.delete_item.assert_called_once_with(Key={"pk": "INCIDENT#inc-1", "sk": "RUN#run-1"})
+
+    def test_retry_after_timed_out_attempt_reclaims_run(self):
+        from unittest.mock import patch
+        from botocore.exceptions import ClientError
+        import handler
+
+        class _Timeout(BaseException):
+            """Stands in for the runtime killing the invocation: no except block runs."""
+
+        claims: dict = {}
+
+        def put_item(Item, ExpressionAttributeValues, **kwargs):
+            old = claims.get(Item["sk"])
+            if old and old["lease_expires_at"] >= ExpressionAttributeValues[":now"]:
+                raise ClientError({"Error": {"Code": "ConditionalCheckFailedException", "Message": "x"}}, "PutItem")
+            claims[Item["sk"]] = Item
+            return {"Attributes": old} if old else {}
+
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 120_000
+        t0 = 1_700_000_000
+        with patch.object(handler, "_TABLE") as table, \
+             patch.object(handler, "_analyze_run", side_effect=[_Timeout(), {"ok": True}]), \
+             patch.object(handler.time, "time") as clock:
+            table.put_item.side_effect = put_item
+            table.query.return_value = {"Count": 0}
+            clock.return_value = t0
+            with pytest.raises(_Timeout):
+                handler.lambda_handler(self._EVENT, context)
+            table.delete_item.assert_not_called()
+            # A duplicate delivery while the first attempt could still be running is skipped
+            clock.return_value = t0 + 30
+            assert handler.lambda_handler(self._EVENT, context)["skipped"] is True
+            # Lambda's first async retry comes ~1 minute after the 120s timeout
+            clock.return_value = t0 + 120 + 60
+            assert handler.lambda_handler(self._EVENT, context) == {"ok": True}
+
+    def test_put_packet_items_batches_extra_rows(self):
+        from unittest.mock import patch
+        import handler
+
+        items = [{"pk": "INCIDENT#inc-1", "sk": f"FINDING#{i}"} for i in range(30)]
+        leftover = {"test-packets": [{"PutRequest": {"Item": {"pk": {"S": "x"}, "sk": {"S": "y"}}}}]}
+        with patch.object(handler, "_DDB_CLIENT") as ddb, patch.object(handler.time, "sleep"):
+            ddb.batch_write_item.side_effect = [{"UnprocessedItems": leftover}, {}, {}]
+            handler._put_packet_items(items)
+        ddb.put_item.assert_not_called()
+        calls = ddb.batch_write_item.call_args_list
+        assert [len(c.kwargs["RequestItems"]["test-packets"]) for c in calls] == [25, 1, 5]
+        assert calls[1].kwargs["RequestItems"] == leftover
+
     def test_resolve_repo_candidates(self):
         from handler import _resolve_repo_candidates, RESOURCE_REPO_MAP
         manifest = {"service": "loggen"}
@@ -164,3 +341,22 @@ class TestStubAnalyzer:
         owners = _resolve_repo_candidates(manifest, evidence)
         repo_names = [o["repo"] for o in owners]
         assert "opsrunbook-copilot" in repo_names or "opsrunbook-copilot-test" in repo_names or "unknown" in repo_names
+
+    def test_resolve_repo_candidates_from_arns(self, monkeypatch):
+        import handler
+        monkeypatch.setattr(handler, "_AC", None)
+        monkeypatch.setattr(handler, "_RESOURCE_REPO_LOWER", (("orders", "orders", "org/orders"),))
+        evidence = {"stepfn": {"sections": [{
+            "state_machine_arns": ["arn:aws:states:us-east-1:1:stateMachine:billing"],
+            "executions": [{"execution_arn": "arn:aws:states:us-east-1:1:execution:sm:orders-run/1"}],
+        }]}}
+        owners = handler._resolve_repo_candidates({}, evidence)
+        assert owners[0]["reasons"] == ["resource 'orders-run' matches prefix 'orders'"]
+
+    def test_resolve_repo_candidates_case_insensitive_prefix(self, monkeypatch):
+        import handler
+        monkeypatch.setattr(handler, "_AC", None)
+        monkeypatch.setattr(handler, "_RESOURCE_REPO_LOWER", (("payments", "Payments", "org/payments"),))
+        owners = handler._resolve_repo_candidates({"service": "prod-PAYMENTS-api"}, {})
+        assert owners[0]["repo"] == "org/payments"
+        assert owners[0]["reasons"] == ["resource 'prod-PAYMENTS-api' matches prefix 'Payments'"]
@@ -54,6 +54,19 @@ class TestTraceParser:
         assert frames[0].function == "processEvent"
         assert frames[1].normalized_path == "lib/router.js"
 
+    def test_mixed_traceback_keeps_source_order(self):
+        from trace_parser import parse_frames
+
+        text = '''    at main (/usr/src/app/index.js:3:1)
+  File "/var/task/handler.py", line 42, in lambda_handler
+    at /usr/src/app/lib/router.js:42:12'''
+
+        frames = parse_frames(text)
+        assert [f.normalized_path for f in frames] == ["index.js", "handler.py", "lib/router.js"]
+        assert frames[0].column == 1
+        assert frames[1].column is None
+        assert frames[1].function == "lambda_handler"
+
     def test_noise_filtered(self):
         from trace_parser import extract_app_frames
 
@@ -81,6 +94,23 @@ class TestTraceParser:
         frames = extract_app_frames(text)
         assert len(frames) <= 5
 
+    def test_app_frames_stop_scanning_early(self):
+        from trace_parser import extract_app_frames, parse_frames
+
+        head = "\n".join(f'  File "/var/task/mod{i}.py", line {i+1}, in f' for i in range(5))
+        tail = "\n".join(f'  File "/var/task/late{i}.py", line 1, in f' for i in range(50000))
+        frames = extract_app_frames(head + "\n" + tail)
+        assert [f.normalized_path for f in frames] == [f"mod{i}.py" for i in range(5)]
+        assert len(parse_frames(head + "\n" + tail, limit=7)) == 7
+
+    def test_app_frames_skip_leading_noise(self):
+        from trace_parser import extract_app_frames
+
+        noise = "\n".join(f'  File "/var/task/.venv/lib/python3.12/site-packages/x{i}.py", line 1, in f'
+                          for i in range(30))
+        text = noise + '\n  File "/var/task/handler.py", line 3, in main'
+        assert [f.normalized_path for f in extract_app_frames(text)] == ["handler.py"]
+
     def test_path_normalization(self):
         from trace_parser import normalize_path
 
@@ -89,6 +119,17 @@ class TestTraceParser:
         assert normalize_path("/home/runner/work/repo/repo/src/main.py") == "src/main.py"
         assert normalize_path("./relative/path.py") == "relative/path.py"
         assert normalize_path("/app/lib/util.py") == "lib/util.py"
+        assert normalize_path("/opt/python/lib/util.py") == "lib/util.py"
+        assert normalize_path("/tmp/3f2a-9b/src/main.py") == "src/main.py"
+        assert normalize_path("src/tmp/3f2a/main.py") == "src/tmp/3f2a/main.py"
+
+    def test_noise_patterns(self):
+        from trace_parser import _is_noise
+
+        assert _is_noise("lib/python3.12/json/decoder.py")
+        assert _is_noise("<frozen importlib._bootstrap>")
+        assert _is_noise("node_modules/express/lib/router.js")
+        assert not _is_noise("services/core.py")
 
     def test_generic_path_line(self):
         from trace_parser import parse_frames
@@ -128,6 +169,33 @@ class TestMappingRules:
         assert rule.matches("billing-api") is True
         assert rule.matches("payments-api") is False
 
+    def test_rules_are_immutable(self):
+        from dataclasses import FrozenInstanceError
+        from repo_resolver import MappingRule
+
+        rule = MappingRule(type="exact", signal="service_name", pattern="loggen", repo="org/loggen-repo")
+        with pytest.raises(FrozenInstanceError):
+            rule.repo = "org/other"
+        assert not hasattr(rule, "__dict__")
+
+    def test_exact_hit_before_prefix_rules_skips_trie(self):
+        from repo_resolver import MappingRule, compile_rules
+
+        rules = compile_rules([
+            MappingRule(type="exact", signal="service_name", pattern="loggen", repo="org/loggen"),
+            MappingRule(type="prefix", signal="lambda_name", pattern="log", repo="org/prefix"),
+        ])
+        assert rules.first_prefix == 1
+        class _NoWalk(dict):
+            def get(self, *args):
+                raise AssertionError("prefix trie walked")
+
+        trie = rules.prefix_trie["lambda_name"]
+        rules.prefix_trie["lambda_name"] = _NoWalk()
+        assert rules.first_match({"service_name": ["loggen"], "lambda_name": ["loggen"]}).repo == "org/loggen"
+        rules.prefix_trie["lambda_name"] = trie
+        assert rules.first_match({"service_name": ["other"], "lambda_name": ["loggen"]}).repo == "org/prefix"
+
     def test_load_mapping_file(self):
         from repo_resolver import load_mapping_rules
 
@@ -135,6 +203,68 @@ class TestMappingRules:
         assert len(rules) >= 2
         assert any(r.signal == "service_name" and r.pattern == "loggen" for r in rules)
 
+    def test_unknown_rule_type(self, tmp_path):
+        from repo_resolver import MappingRule, load_mapping_rules
+
+        assert MappingRule(type="regex", signal="service_name", pattern="x", repo="org/x").matches("x") is False
+        path = tmp_path / "mapping.json"
+        path.write_text(json.dumps({"rules": [
+            {"type": "regex", "signal": "service_name", "pattern": "x.*", "repo": "org/x"},
+            {"type": "exact", "signal": "service_name", "pattern": "y", "repo": "org/y"},
+        ]}))
+        assert [r.repo for r in load_mapping_rules(str(path))] == ["org/y"]
+
+    def test_load_mapping_file_cached_until_modified(self, tmp_path):
+        from repo_resolver import load_mapping_rules
+
+        path = tmp_path / "mapping.json"
+        path.write_text(json.dumps({"rules": [{"type": "exact", "signal": "service_name",
+                                               "pattern": "a", "repo": "org/a"}]}))
+        first = load_mapping_rules(str(path))
+        assert isinstance(first, tuple)
+        assert load_mapping_rules(str(path)) is first
+
+        path.write_text(json.dumps({"rules": [{"type": "exact", "signal": "service_name",
+                                               "pattern": "b", "repo": "org/b"}]}))
+        os.utime(path, (os.path.getmtime(path) + 5,) * 2)
+        assert [r.repo for r in load_mapping_rules(str(path))] == ["org/b"]
+
+    def test_missing_mapping_file(self, tmp_path):
+        from repo_resolver import load_mapping_rules
+
+        assert load_mapping_rules(str(tmp_path / "missing.json")) == ()
+
+
+    def test_extract_signals_from_findings_and_reasons(self):
+        from repo_resolver import _extract_signals
+
+        packet = {
+            "service": "svc",
+            "findings": [
+                {"summary": "errors in /aws/lambda/billing-api and /aws/lambda/billing-worker"},
+                {"summary": "arn:aws:states:us-east-1:123456789012:stateMachine:orders-flow failed"},
+            ],
+            "suspected_owners": [{"reasons": ["log group /aws/lambda/orders-fn"]}],
+        }
+        signals = _extract_signals(packet)
+        assert signals["lambda_name"] == ["billing-api", "billing-worker", "orders-fn"]
+        assert signals["log_group"] == ["/aws/lambda/billing-api", "/aws/lambda/billing-worker",
+                                        "/aws/lambda/orders-fn"]
+        assert signals["state_machine"] == ["orders-flow"]
+
+    def test_compiled_rules_keep_first_match_order(self):
+        from repo_resolver import MappingRule, compile_rules
+
+        rules = compile_rules([
+            MappingRule(type="prefix", signal="lambda_name", pattern="billing-", repo="org/billing"),
+            MappingRule(type="prefix", signal="lambda_name", pattern="billing-api", repo="org/billing-api"),
+            MappingRule(type="exact", signal="service_name", pattern="loggen", repo="org/loggen"),
+        ])
+        assert rules.first_match({"lambda_name": ["billing-api-prod"]}).repo == "org/billing"
+        assert rules.first_match({"service_name": ["loggen"], "lambda_name": ["billing-x"]}).repo == "org/billing"
+        assert rules.first_match({"service_name": ["loggen"]}).repo == "org/loggen"
+        assert rules.first_match({"service_name": ["loggen-extra"], "lambda_name": ["bill"]}) is None
+
 
 class TestRepoResolver:
     def test_mapping_match_selects_correct_repo(self):
@@ -204,6 +334,99 @@ class TestRepoResolver:
         resolve_repo(packet, rules=[], checker=checker, owner="org")
         assert checker.file_exists.call_count <= 4
 
+    def test_parallel_verification_keeps_priority_order(self):
+        import threading
+        import time
+        from repo_resolver import _verify_with_github
+
+        barrier = threading.Barrier(2, timeout=5)
+        lock = threading.Lock()
+        in_flight = [0, 0]  # current, peak
+
+        def file_exists(repo, path):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            if repo == "org/r1":
+                barrier.wait()  # the top candidate's probes run together
+                time.sleep(0.05 if path == "b.py" else 0)
+            with lock:
+                in_flight[0] -= 1
+            return path == "b.py"
+
+        checker = MagicMock()
+        checker.file_exists.side_effect = file_exists
+        result = _verify_with_github(checker, ["org/r1", "org/r2"], ["a.py", "b.py"])
+        assert result == ("org/r1", ["verified: b.py exists in org/r1"])
+        # Bounded: the remaining probes wait for a free worker instead of all starting at once
+        assert in_flight[1] == 2
+
+    def test_async_verification_keeps_priority_order(self):
+        import asyncio
+        from repo_resolver import _verify_with_github_async
+
+        started = []
+        cancelled = []
+
+        class Checker:
+            async def file_exists_async(self, repo, path):
+                started.append((repo, path))
+                try:
+                    await asyncio.sleep(0.05 if repo == "org/r1" else 0)
+                    if repo == "org/r2" and path == "b.py":
+                        await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    cancelled.append((repo, path))
+                    raise
+                return path == "b.py"
+
+        result = asyncio.run(_verify_with_github_async(Checker(), ["org/r1", "org/r2"], ["a.py", "b.py"]))
+        assert result == ("org/r1", ["verified: b.py exists in org/r1"])
+        assert len(started) == 4
+        assert cancelled == [("org/r2", "b.py")]
+
+    def test_sequential_verification_stops_at_first_hit(self):
+        from repo_resolver import _verify_with_github
+
+        checker = MagicMock()
+        checker.file_exists.return_value = True
+        result = _verify_with_github(checker, ["org/r1", "org/r2"], ["a.py", "b.py"], parallel=False)
+        assert result[0] == "org/r1"
+        assert checker.file_exists.call_count == 1
+
+    def test_file_exists_answers_reused_across_resolutions(self):
+        from repo_resolver import resolve_repo
+
+        checker = MagicMock()
+        checker.file_exists.return_value = False
+        packet = {
+            "service": "svc",
+            "findings": [{"summary": 'File "/var/task/handler.py", line 10, in main'}],
+            "suspected_owners": [{"repo": "my-repo", "confidence": 0.5}],
+            "all_evidence_refs": [],
+        }
+        resolve_repo(packet, rules=[], checker=checker, owner="org")
+        resolve_repo(packet, rules=[], checker=checker, owner="org")
+        assert checker.file_exists.call_count == 1
+
+    def test_cached_file_checker_expires_and_evicts(self):
+        from repo_resolver import CachedFileChecker
+
+        inner = MagicMock()
+        inner.file_exists.return_value = True
+        cached = CachedFileChecker(inner, maxsize=1, ttl=60)
+        with patch("repo_resolver.time.monotonic", return_value=0.0):
+            assert cached.file_exists("org/r", "a.py") is True
+            assert cached.file_exists("org/r", "a.py") is True
+        assert inner.file_exists.call_count == 1
+        with patch("repo_resolver.time.monotonic", return_value=61.0):
+            cached.file_exists("org/r", "a.py")
+        assert inner.file_exists.call_count == 2
+        with patch("repo_resolver.time.monotonic", return_value=62.0):
+            cached.file_exists("org/r", "b.py")
+            cached.file_exists("org/r", "a.py")
+        assert inner.file_exists.call_count == 4
+
     def test_no_repo_returns_empty(self):
         from repo_resolver import resolve_repo
 
@@ -245,6 +468,27 @@ class TestRepoResolver:
         assert result.trace_frames[0]["normalized_path"] == "handler.py"
         assert result.trace_frames[0]["line"] == 42
 
+    def test_notes_scanned_only_when_summaries_fall_short(self):
+        import trace_parser
+        from repo_resolver import resolve_repo
+
+        summary = "\n".join(f'File "/var/task/s{i}.py", line 1, in f' for i in range(5))
+        packet = {
+            "service": "svc",
+            "findings": [{"summary": summary, "notes": 'File "/var/task/n.py", line 1, in f'}],
+            "suspected_owners": [],
+            "all_evidence_refs": [],
+        }
+        with patch("repo_resolver.extract_app_frames", wraps=trace_parser.extract_app_frames) as spy:
+            result = resolve_repo(packet, rules=[])
+        assert spy.call_count == 1
+        assert [f["normalized_path"] for f in result.trace_frames] == [f"s{i}.py" for i in range(5)]
+
+        packet["findings"] = [{"summary": 'File "/var/task/s.py", line 1, in f',
+                               "notes": 'File "/var/task/s.py", line 1, in f\nFile "/var/task/n.py", line 2, in g'}]
+        result = resolve_repo(packet, rules=[])
+        assert [f["normalized_path"] for f in result.trace_frames] == ["s.py", "n.py"]
+
     def test_legacy_map_compat(self):
         from repo_resolver import resolve_repo
 